@@ -0,0 +1,226 @@
+"""
+Adnotare offline (în paralel) a înregistrărilor din `captures/`.
+
+    python annotate.py captures/record_20250101_120000.mp4
+    python annotate.py rec.mp4 --workers 8 --chunk 20 --overlap 1 --render rec_annotated.mp4
+
+Video-ul e împărțit în bucăți de `--chunk` secunde procesate într-un pool de
+procese, fiecare worker cu propriul `Perception`. Fiecare bucată începe cu
+`--overlap` secunde mai devreme, ca tracker-ele MediaPipe și filtrul de gaze
+să se „încălzească”; cadrele de warm-up nu intră în rezultat. La final:
+    <video>.features.npz / .csv  – seriile de timp (format `FeatureStore`)
+    <video>.events.csv           – timeline de evenimente (start, end, durată, eveniment)
+    --render out.mp4             – video adnotat (fiecare worker își randează bucata)
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import cv2
+import numpy as np
+
+from feature_store import FLAGS, FeatureStore
+from gestures import Perception
+
+EVENT_FLAGS = ("smiling", "eyebrow_raise", "ok", "thumbs_up")
+
+
+def _annotate_chunk(job: Dict) -> Dict:
+    """Worker: procesează cadrele [start, end) (+ warm-up) dintr-un video."""
+    cv2.setNumThreads(1)  # paralelismul e între procese, nu în OpenCV
+    t0 = time.perf_counter()
+    cap = cv2.VideoCapture(job["path"])
+    fps = job["fps"]
+    start, end = job["start"], job["end"]
+    first = max(0, start - job["warmup"])
+    cap.set(cv2.CAP_PROP_POS_FRAMES, first)
+
+    perc = Perception(profile=job["profile"], motion_gate=False)
+    perc.set_lod(job["lod"])
+    store = FeatureStore(seconds=end - start + 1, fps=1.0)
+    writer = None
+    decoded = 0
+    for idx in range(first, end):
+        ok, frame = cap.read()
+        if not ok:
+            break
+        decoded += 1
+        ts = idx / fps  # timp media
+        hand_pts, face_pts = perc.infer(frame)
+        hand_state, face_state = perc.analyze(hand_pts, face_pts, ts, delay=0.0)
+        if idx < start:
+            continue  # warm-up
+        store.append(ts, hand_state, face_state)
+        if job["render"]:
+            if writer is None:
+                h, w = frame.shape[:2]
+                writer = cv2.VideoWriter(job["render"], cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
+            perc.draw_landmarks(frame)
+            perc.draw_assistant_reactions(frame, hand_state, face_state)
+            writer.write(frame)
+    cap.release()
+    if writer is not None:
+        writer.release()
+    perc.set_profile("off")  # închide modelele
+    return {
+        "chunk": job["chunk"],
+        "columns": store.window(),
+        "gestures": store.gesture_names,
+        "frames": len(store),
+        "decoded": decoded,
+        "seconds": time.perf_counter() - t0,
+        "render": job["render"] if writer is not None else None,
+    }
+
+
+def plan_chunks(total: int, fps: float, chunk_s: float, overlap_s: float) -> List[Dict]:
+    step = max(1, int(round(chunk_s * fps)))
+    warm = int(round(overlap_s * fps))
+    return [
+        {"chunk": k, "start": s, "end": min(s + step, total), "warmup": warm if s else 0}
+        for k, s in enumerate(range(0, total, step))
+    ]
+
+
+def merge(results: List[Dict]) -> FeatureStore:
+    """Concatenează bucățile în ordine; indicii gesturilor sunt remapați pe un tabel global."""
+    results = sorted(results, key=lambda r: r["chunk"])
+    names: List[str] = []
+    parts = []
+    for r in results:
+        remap = []
+        for g in r["gestures"]:
+            if g not in names:
+                names.append(g)
+            remap.append(names.index(g))
+        remap = np.array(remap + [-1], dtype=np.int16)
+        cols = dict(r["columns"])
+        cols["gesture"] = remap[cols["gesture"]]  # -1 -> ultimul element (-1)
+        parts.append(cols)
+    merged = {k: np.concatenate([p[k] for p in parts]) for k in parts[0]} if parts else {}
+    if not merged:
+        return FeatureStore(seconds=1, fps=1.0)
+    return FeatureStore.from_columns(merged, names)
+
+
+def _runs(on: np.ndarray):
+    """Intervalele [i0, i1) în care `on` e adevărat."""
+    d = np.diff(on.astype(np.int8), prepend=0, append=0)
+    return zip(np.flatnonzero(d == 1), np.flatnonzero(d == -1))
+
+
+def timeline(store: FeatureStore, min_len: float = 0.2) -> List[tuple]:
+    """Evenimente (start, end, eveniment) din flag-uri și gesturi; ignoră pâlpâiri < `min_len`."""
+    w = store.window()
+    ts = w["ts"]
+    if not len(ts):
+        return []
+    frame_dt = float(np.median(np.diff(ts))) if len(ts) > 1 else 0.0
+    events = []
+
+    def add(i0, i1, name):
+        t0, t1 = float(ts[i0]), float(ts[i1 - 1]) + frame_dt
+        if t1 - t0 >= min_len:
+            events.append((t0, t1, name))
+
+    for flag in EVENT_FLAGS:
+        for i0, i1 in _runs((w["flags"] & FLAGS[flag]) != 0):
+            add(i0, i1, flag)
+    for gid, name in enumerate(store.gesture_names):
+        if name in ("ok", "thumbs_up"):
+            continue  # deja acoperite de flag-urile rule-based
+        for i0, i1 in _runs(w["gesture"] == gid):
+            add(i0, i1, f"gesture:{name}")
+    events.sort()
+    return events
+
+
+def concat_videos(parts: List[str], out_path: str, fps: float):
+    writer = None
+    for p in parts:
+        cap = cv2.VideoCapture(p)
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            if writer is None:
+                h, w = frame.shape[:2]
+                writer = cv2.VideoWriter(out_path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
+            writer.write(frame)
+        cap.release()
+        os.remove(p)
+    if writer is not None:
+        writer.release()
+
+
+def annotate(path: str, workers: int = 0, chunk: float = 20.0, overlap: float = 1.0,
+             profile: str = "full", render: str = "", lod: str = "contours", log=print) -> FeatureStore:
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise FileNotFoundError(path)
+    fps = float(cap.get(cv2.CAP_PROP_FPS) or 30.0)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    workers = workers or os.cpu_count() or 1
+
+    tmp = tempfile.mkdtemp(prefix="annotate_") if render else ""
+    jobs = plan_chunks(total, fps, chunk, overlap)
+    for j in jobs:
+        j.update(path=path, fps=fps, profile=profile, lod=lod,
+                 render=os.path.join(tmp, f"chunk_{j['chunk']:05d}.mp4") if render else "")
+    log(f"{path}: {total} frames @ {fps:.1f} fps, {len(jobs)} chunks x {chunk:.0f}s "
+        f"(+{overlap:.1f}s warm-up), {workers} workers")
+
+    t0 = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for r in pool.map(_annotate_chunk, jobs):
+            results.append(r)
+            log(f"  chunk {r['chunk']}: {r['frames']} frames in {r['seconds']:.1f}s")
+    wall = time.perf_counter() - t0
+
+    store = merge(results)
+    frames = sum(r["frames"] for r in results)
+    decoded = sum(r["decoded"] for r in results)
+    busy = sum(r["seconds"] for r in results)
+    log(f"processed {frames} frames in {wall:.1f}s: {frames / max(wall, 1e-9):.1f} frames/s "
+        f"({decoded / max(busy, 1e-9):.1f} frames/s per worker, warm-up overhead "
+        f"{(decoded - frames) / max(frames, 1) * 100:.0f}%)")
+
+    if render:
+        concat_videos([r["render"] for r in sorted(results, key=lambda r: r["chunk"]) if r["render"]],
+                      render, fps)
+        os.rmdir(tmp)
+        log(f"annotated video -> {render}")
+    return store
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Parallel offline annotation of recorded videos")
+    ap.add_argument("video")
+    ap.add_argument("--workers", type=int, default=0, help="procese (implicit: nr. de nuclee)")
+    ap.add_argument("--chunk", type=float, default=20.0, help="secunde per bucată")
+    ap.add_argument("--overlap", type=float, default=1.0, help="secunde de warm-up per bucată")
+    ap.add_argument("--profile", default="full", help="profil de percepție (full, gaze-only, ...)")
+    ap.add_argument("--render", default="", help="scrie și video-ul adnotat aici (.mp4)")
+    ap.add_argument("--min-event", type=float, default=0.2, help="durata minimă a unui eveniment (s)")
+    args = ap.parse_args()
+
+    store = annotate(args.video, args.workers, args.chunk, args.overlap, args.profile, args.render)
+    base = os.path.splitext(args.video)[0]
+    store.export_npz(base + ".features.npz")
+    store.export_csv(base + ".features.csv")
+    events = timeline(store, args.min_event)
+    with open(base + ".events.csv", "w", encoding="utf-8") as f:
+        f.write("start,end,duration,event\n")
+        for t0, t1, name in events:
+            f.write(f"{t0:.3f},{t1:.3f},{t1 - t0:.3f},{name}\n")
+    print(store.summary())
+    print(f"{len(events)} events -> {base}.events.csv; features -> {base}.features.npz/.csv")
+
+
+if __name__ == "__main__":
+    main()
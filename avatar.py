@@ -4,6 +4,8 @@ import math
 import time
 import random
 
+from text_render import put_text, wrap_text
+
 # Brand palette
 BRAND_BG = (26, 32, 56)
 BRAND_STROKE = (180, 190, 210)
@@ -27,12 +29,22 @@ class Avatar:
         self.blink_dur = 0.12
         self.blinking = False
         self.speaking = False
-        self._speak_anim_phase = 0.0
+        self._speak_t0 = 0.0    # animațiile depind de ceas, nu de numărul de cadre desenate
+        self._last_word = 0.0  # ultima limită de cuvânt raportată de TTS
+        self._wave_until = 0.0
 
     def set_speaking(self, speaking: bool):
         self.speaking = speaking
         if speaking:
-            self._speak_anim_phase = 0.0
+            self._speak_t0 = time.time()
+
+    def start_wave(self, seconds: float = 2.0):
+        """Mâna face cu mâna `seconds` secunde (salut)."""
+        self._wave_until = time.time() + seconds
+
+    def on_word(self):
+        """Limită de cuvânt din TTS: gura se deschide pe ritmul real al rostirii."""
+        self._last_word = time.time()
 
     def _clip_rect(self, frame, x, y, w, h):
         H, W = frame.shape[:2]
@@ -42,8 +54,7 @@ class Avatar:
         h = max(1, min(H - y, h))
         return x, y, w, h
 
-    def _update_blink(self):
-        now = time.time()
+    def _update_blink(self, now):
         if not self.blinking and now >= self.next_blink_t:
             self.blinking = True
             self.next_blink_t = now + self.blink_dur
@@ -82,13 +93,25 @@ class Avatar:
         cv2.line(roi, (x+50, y+55), (x+65, y+55), color, 2)
         cv2.line(roi, (x+50, y+65), (x+65, y+65), color, 2)
 
-    def draw(self, frame, x, y, w, h, state):
+    def _draw_hand_wave(self, roi, x, y, angle, scale=1.0, color=BRAND_OK):
+        # palmă deschisă care se rotește în jurul încheieturii (x, y)
+        c, s = math.cos(angle), math.sin(angle)
+        def rot(dx, dy):
+            return (int(x + (dx*c - dy*s)*scale), int(y + (dx*s + dy*c)*scale))
+        cv2.circle(roi, rot(0, -22), int(14*scale), color, 2)
+        for fx, length in ((-12, 20), (-5, 26), (3, 27), (10, 23)):
+            cv2.line(roi, rot(fx, -32), rot(fx, -32 - length), color, 2)
+        cv2.line(roi, rot(13, -18), rot(26, -28), color, 2)
+
+    def draw(self, frame, x, y, w, h, state, now=None):
+        """Desenează avatarul în (x, y, w, h); animațiile (gură, clipit, wave) urmează ceasul `now`."""
         x, y, w, h = self._clip_rect(frame, x, y, w, h)
         roi = frame[y:y+h, x:x+w]
         if roi.size == 0:
             return frame
+        now = time.time() if now is None else now
 
-        self._update_blink()
+        self._update_blink(now)
 
         # background panel
         cv2.rectangle(roi, (0,0), (w-1,h-1), BRAND_BG, -1)
@@ -111,8 +134,10 @@ class Avatar:
         eye_dx = int(radius*0.45)
         eye_y = cy - int(radius*0.18)
         eye_r = max(3, int(radius*0.11))
-        self._draw_eye(roi, (cx - eye_dx, eye_y), eye_r, self.blinking)
-        self._draw_eye(roi, (cx + eye_dx, eye_y), eye_r, self.blinking)
+        gx, gy = state.get('gaze', (0.0, 0.0))
+        pupil = (max(-0.4, min(0.4, gx*0.4)), max(-0.3, min(0.3, gy*0.3)))
+        self._draw_eye(roi, (cx - eye_dx, eye_y), eye_r, self.blinking, pupil)
+        self._draw_eye(roi, (cx + eye_dx, eye_y), eye_r, self.blinking, pupil)
 
         # eyebrows
         brow_offset = 6 if state.get('eyebrow_raise', False) else 0
@@ -127,8 +152,12 @@ class Avatar:
 
         # mouth
         if self.speaking:
-            self._speak_anim_phase += 0.22
-            amp = 0.35 + 0.25*abs(math.sin(self._speak_anim_phase))
+            since_word = now - self._last_word
+            if since_word < 0.6:
+                # deschisă la începutul cuvântului, se închide în ~250 ms
+                amp = 0.12 + 0.45*max(0.0, 1.0 - since_word/0.25)
+            else:  # driver fără evenimente de cuvânt: ~1 deschidere / 0.5 s
+                amp = 0.35 + 0.25*abs(math.sin(6.6*(now - self._speak_t0)))
             cv2.ellipse(roi, (cx, cy+int(radius*0.18)), (int(radius*0.40), int(radius*amp)), 0, 0, 360, (40,60,120), 4)
         else:
             if state.get('smile', False):
@@ -143,6 +172,9 @@ class Avatar:
             self._draw_hand_thumbsup(roi, hand_x, hand_y, scale=1.2, color=BRAND_LIKE)
         if state.get('ok', False):
             self._draw_hand_ok(roi, hand_x - 24, hand_y, scale=1.2, color=BRAND_OK)
+        if now < self._wave_until:
+            angle = 0.45*math.sin(2*math.pi*2.0*now)  # ±25°, 2 Hz
+            self._draw_hand_wave(roi, int(w*0.13), int(h*0.70), angle, scale=1.2)
 
         # speech bubble
         text = state.get('speech', None)
@@ -150,17 +182,10 @@ class Avatar:
             bx, by, bw, bh = 10, h-70, w-20, 60
             cv2.rectangle(roi, (bx, by), (bx+bw, by+bh), BRAND_BUBBLE, -1)
             cv2.rectangle(roi, (bx, by), (bx+bw, by+bh), BRAND_BUBBLE_STROKE, 2)
-            words = text.split()
-            lines, line = [], ""
-            for word in words:
-                if len(line)+len(word)+1 > 28:
-                    lines.append(line); line = word
-                else:
-                    line = (line+" "+word).strip()
-            if line: lines.append(line)
+            # împărțirea pe rânduri și rasterizarea sunt memorate per text (text_render)
             ty = by+22
-            for ln in lines[:2]:
-                cv2.putText(roi, ln, (bx+10, ty), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (20,20,20), 2)
+            for ln in wrap_text(text, 18, bw-20, bold=True)[:2]:
+                put_text(roi, ln, (bx+10, ty), 18, (20,20,20), bold=True)
                 ty += 22
 
         frame[y:y+h, x:x+w] = roi
@@ -0,0 +1,83 @@
+"""
+Randarea avatarului pe un thread propriu, la rata lui (implicit 15 FPS), într-un double buffer.
+
+Bucla de cadre doar publică starea (`update`) și copiază ultimul cadru de
+avatar în panou (`composite`, un memcpy); desenarea propriu-zisă rulează pe
+ceasul de perete, independent de FPS-ul camerei — animațiile au aceeași viteză
+la 15 sau 60 FPS, iar costul avatarului e plafonat la `fps` randări pe secundă.
+Fără `update` recent (avatar oprit / cameră oprită) thread-ul nu desenează nimic.
+"""
+import threading
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+from avatar import Avatar
+
+
+class AvatarRenderer:
+    def __init__(self, avatar: Avatar, fps: float = 15.0, idle_after: float = 1.0):
+        self.avatar = avatar
+        self.fps = float(fps)
+        self.idle_after = idle_after     # s fără update -> thread-ul stă
+        self._lock = threading.Lock()
+        self._size: Optional[Tuple[int, int]] = None  # (w, h) cerut de bucla de cadre
+        self._state: dict = {}
+        self._updated = 0.0
+        self._front: Optional[np.ndarray] = None      # ultimul cadru complet (citit de composite)
+        self._back: Optional[np.ndarray] = None       # cadrul în lucru
+        self.rendered = 0
+        self.render_ms = 0.0                          # EMA a costului unei randări
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="avatar-render", daemon=True)
+        self._thread.start()
+
+    def set_fps(self, fps: float):
+        self.fps = max(1.0, float(fps))
+
+    # ---------- din bucla de cadre ----------
+    def update(self, size: Tuple[int, int], state: dict):
+        """Starea curentă (gaze, zâmbet, gesturi, text) și dimensiunea panoului (w, h)."""
+        with self._lock:
+            self._size = (int(size[0]), int(size[1]))
+            self._state = state
+            self._updated = time.monotonic()
+
+    def composite(self, frame, x: int, y: int) -> bool:
+        """Copiază ultimul cadru de avatar în `frame` la (x, y); False dacă nu există încă unul de mărimea cerută."""
+        with self._lock:
+            img, size = self._front, self._size
+            if img is None or size is None or img.shape[1::-1] != size:
+                return False
+            h, w = img.shape[:2]
+            roi = frame[y:y+h, x:x+w]
+            if roi.shape != img.shape:
+                return False
+            roi[...] = img
+        return True
+
+    # ---------- thread-ul de randare ----------
+    def _loop(self):
+        next_t = time.monotonic()
+        while not self._stop.wait(max(0.0, next_t - time.monotonic())):
+            now = time.monotonic()
+            next_t = max(next_t + 1.0 / self.fps, now)  # fără rafale de recuperare după o pauză
+            with self._lock:
+                size, state, fresh = self._size, self._state, now - self._updated < self.idle_after
+            if size is None or not fresh:
+                continue
+            w, h = size
+            back = self._back
+            if back is None or back.shape[:2] != (h, w):
+                back = np.empty((h, w, 3), dtype=np.uint8)
+            t0 = time.perf_counter()
+            self.avatar.draw(back, 0, 0, w, h, state, now=time.time())
+            self.render_ms += ((time.perf_counter() - t0) * 1000.0 - self.render_ms) * 0.1
+            with self._lock:
+                self._front, self._back = back, self._front
+            self.rendered += 1
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
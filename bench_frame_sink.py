@@ -0,0 +1,94 @@
+"""
+Throughput test pentru `SharedMemorySink`: producătorul scrie cât de repede poate,
+în timp ce cititori în alte procese (unul rapid, unul lent) consumă cadrele.
+
+    python bench_frame_sink.py                    # 1080p, 5 s
+    python bench_frame_sink.py --width 1280 --height 720 --seconds 3
+
+Fiecare cadru e umplut cu un model derivat din numărul de secvență, așa că
+cititorii verifică și conținutul (nu doar antetul). Raportează FPS-ul
+producătorului cu / fără cititori (un cititor lent nu trebuie să-l încetinească),
+FPS-ul cititorilor, cadrele pierdute și citirile invalide (torn).
+"""
+import argparse
+import multiprocessing as mp
+import time
+import uuid
+
+import numpy as np
+
+from frame_sink import SharedMemoryReader, SharedMemorySink
+
+
+def _pattern(seq: int) -> int:
+    return (seq * 37) & 0xFF
+
+
+def _reader(name: str, seconds: float, delay: float, out):
+    reader = SharedMemoryReader(name)
+    got = bad = 0
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < seconds:
+        item = reader.next(timeout=0.5)
+        if item is None:
+            continue
+        seq, _ts, frame = item
+        # verifică conținutul pe eșantioane (început / mijloc / sfârșit)
+        flat = frame.reshape(-1)
+        ok = (flat[0] == flat[len(flat) // 2] == flat[-1] == _pattern(seq))
+        if delay:
+            time.sleep(delay)  # consumator lent
+        if not ok or not reader.is_valid(seq):
+            bad += 1
+        got += 1
+    out.put({"delay": delay, "frames": got, "fps": got / seconds, "missed": reader.missed,
+             "torn": reader.torn, "bad": bad})
+    reader.close()
+
+
+def produce(sink: SharedMemorySink, frame: np.ndarray, seconds: float) -> float:
+    n = 0
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < seconds:
+        seq = sink.seq + 1
+        frame.fill(_pattern(seq))
+        sink.write(frame)
+        n += 1
+    return n / (time.perf_counter() - t0)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Shared-memory frame sink throughput test")
+    ap.add_argument("--width", type=int, default=1920)
+    ap.add_argument("--height", type=int, default=1080)
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--slow-delay", type=float, default=0.05, help="pauza cititorului lent (s/cadru)")
+    args = ap.parse_args()
+
+    name = f"vafr_bench_{uuid.uuid4().hex[:8]}"
+    frame = np.zeros((args.height, args.width, 3), dtype=np.uint8)
+    with SharedMemorySink(name, max_width=args.width, max_height=args.height) as sink:
+        mb = frame.nbytes / 1e6
+        alone = produce(sink, frame, min(2.0, args.seconds))
+        print(f"producer alone:        {alone:7.1f} fps ({alone * mb:.0f} MB/s, {mb:.1f} MB/frame)")
+
+        ctx = mp.get_context("spawn")
+        out = ctx.Queue()
+        procs = [ctx.Process(target=_reader, args=(name, args.seconds, d, out))
+                 for d in (0.0, args.slow_delay)]
+        for p in procs:
+            p.start()
+        time.sleep(0.5)  # pornirea proceselor
+        with_readers = produce(sink, frame, args.seconds)
+        results = [out.get(timeout=args.seconds + 10) for _ in procs]
+        for p in procs:
+            p.join()
+        print(f"producer with readers: {with_readers:7.1f} fps")
+        for r in sorted(results, key=lambda r: r["delay"]):
+            kind = "fast reader" if not r["delay"] else f"slow reader ({r['delay'] * 1000:.0f} ms)"
+            print(f"{kind:22s} {r['fps']:7.1f} fps, missed {r['missed']}, torn {r['torn']}, "
+                  f"invalid after use {r['bad']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Replay benchmark pentru filtrul de gaze: lag vs jitter.
+
+Rulează (fără cameră / modele):
+    python bench_gaze.py                      # traiectorie sintetică (fixații + sacade + urmăriri lente)
+    python bench_gaze.py --latency 0.08       # latență pipeline simulată
+    python bench_gaze.py --csv gaze.csv       # replay t,gx,gy (gaze brut înregistrat)
+
+Metrici (per filtru, per axă x):
+    lag_ms     – decalajul (cross-corelație) dintre ieșire și adevăr, la momentul afișării
+    rmse       – eroare față de adevăr la momentul afișării
+    jitter     – deviația standard a pașilor cadru-cu-cadru în fixații
+    pur_lag    – în urmăriri lente: eroarea proiectată pe direcția mișcării / viteză (ms)
+    pur_rmse   – eroare față de adevăr în urmăriri lente
+"""
+import argparse
+import csv
+
+import numpy as np
+
+from gaze_filter import GazeFilter, GazeFilterConfig
+
+
+FIXATION, SACCADE, PURSUIT = 0, 1, 2
+
+
+def synth_trajectory(seconds=30.0, fps=30.0, noise=0.04, seed=7, pursuit=0.4):
+    """Fixații 0.3–1.2 s urmate de sacade de 40–80 ms sau (cu prob. `pursuit`) de
+    urmăriri lente (viteză constantă, 0.8–2 s, ~0.25–0.8 unități/s); timpi de cadru cu jitter.
+    Întoarce și faza fiecărui cadru (FIXATION / SACCADE / PURSUIT)."""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * fps)
+    t = np.cumsum(rng.normal(1.0 / fps, 0.003, n).clip(0.5 / fps))
+    truth = np.zeros((n, 2))
+    phase = np.full(n, FIXATION, dtype=np.int8)
+    pos = np.zeros(2)
+    t_next, i = 0.0, 0
+    while i < n:
+        t0 = t_next + rng.uniform(0.3, 1.2)
+        while i < n and t[i] < t0:
+            truth[i] = pos
+            i += 1
+        if rng.random() < pursuit:
+            target = rng.uniform(-0.8, 0.8, 2)
+            while np.linalg.norm(target - pos) < 0.3:
+                target = rng.uniform(-0.8, 0.8, 2)
+            dur = float(np.clip(np.linalg.norm(target - pos) / rng.uniform(0.25, 0.8), 0.8, 2.0))
+            vel = (target - pos) / dur
+            while i < n and t[i] < t0 + dur:
+                truth[i] = pos + vel * (t[i] - t0)
+                phase[i] = PURSUIT
+                i += 1
+        else:
+            dur = rng.uniform(0.04, 0.08)
+            target = rng.uniform(-0.8, 0.8, 2)
+            while i < n and t[i] < t0 + dur:
+                k = (t[i] - t0) / dur
+                k = k * k * (3 - 2 * k)  # smoothstep
+                truth[i] = pos + (target - pos) * k
+                phase[i] = SACCADE
+                i += 1
+        pos = target
+        t_next = t0 + dur
+    raw = (truth + rng.normal(0, noise, truth.shape)).clip(-1, 1)
+    return t, raw, truth, phase
+
+
+def load_csv(path, smooth=9):
+    """Gaze brut înregistrat; 'adevărul' = medie centrată (zero-phase) a semnalului brut."""
+    rows = []
+    with open(path, newline="") as f:
+        for r in csv.DictReader(f):
+            rows.append((float(r["t"]), float(r["gx"]), float(r["gy"])))
+    arr = np.array(rows)
+    t, raw = arr[:, 0], arr[:, 1:3]
+    k = np.ones(smooth) / smooth
+    truth = np.stack([np.convolve(np.pad(raw[:, j], smooth // 2, mode="edge"), k, "valid")
+                      for j in range(2)], axis=1)
+    moving = np.r_[False, np.linalg.norm(np.diff(truth, axis=0), axis=1) > 0.02]
+    return t, raw, truth, np.where(moving, SACCADE, FIXATION).astype(np.int8)  # fără etichete de urmărire
+
+
+def run_ema(t, raw, alpha=0.35):
+    out = np.zeros_like(raw)
+    y = np.zeros(2)
+    for i in range(len(t)):
+        y = y * (1 - alpha) + raw[i] * alpha
+        out[i] = y
+    return out
+
+
+def run_filter(t, raw, config, latency):
+    f = GazeFilter(config)
+    out = np.zeros_like(raw)
+    for i in range(len(t)):
+        f.observe_delay(latency)
+        out[i] = f.update((raw[i, 0], raw[i, 1]), t[i])
+    return out
+
+
+def metrics(t, out, truth, phase, latency):
+    """Ieșirea de la cadrul i e afișată la t[i] + latency; comparăm cu adevărul de atunci.
+
+    Întoarce lag-ul global (ms), RMSE, jitter-ul în fixații și, pe cadrele de urmărire
+    lentă, lag-ul (eroarea proiectată pe direcția mișcării / viteză, ms) și RMSE."""
+    truth_disp = np.stack([np.interp(t + latency, t, truth[:, j]) for j in range(2)], axis=1)
+    valid = t + latency <= t[-1]
+    err = out[valid] - truth_disp[valid]
+    rmse = float(np.sqrt(np.mean(err ** 2)))
+    # lag: decalajul (în cadre) care minimizează MSE între ieșire și adevărul afișat
+    dt = float(np.median(np.diff(t)))
+    x, y = out[valid, 0], truth_disp[valid, 0]
+    best, best_k = None, 0
+    for k in range(-3, 16):
+        a = x[k:] if k >= 0 else x[:k]
+        b = y[:len(y) - k] if k >= 0 else y[-k:]
+        m = float(np.mean((a - b) ** 2))
+        if best is None or m < best:
+            best, best_k = m, k
+    still = (phase[1:] == FIXATION) & (phase[:-1] == FIXATION)
+    steps = np.diff(out, axis=0)[still]
+    jitter = float(np.std(steps)) if len(steps) else 0.0
+    pursuit_lag = pursuit_rmse = float("nan")
+    sel = valid & (phase == PURSUIT)
+    sel[-1] = False
+    if sel.sum() > 10:
+        vel = np.gradient(truth_disp, t, axis=0)[sel]
+        e = out[sel] - truth_disp[sel]
+        speed2 = (vel ** 2).sum(axis=1)
+        pursuit_lag = float(-np.sum((e * vel).sum(axis=1)) / np.sum(speed2)) * 1000.0
+        pursuit_rmse = float(np.sqrt(np.mean(e ** 2)))
+    return best_k * dt * 1000.0, rmse, jitter, pursuit_lag, pursuit_rmse
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Gaze filter lag/jitter benchmark")
+    ap.add_argument("--csv", help="replay t,gx,gy (gaze brut)")
+    ap.add_argument("--seconds", type=float, default=30.0)
+    ap.add_argument("--fps", type=float, default=30.0)
+    ap.add_argument("--noise", type=float, default=0.04)
+    ap.add_argument("--pursuit", type=float, default=0.4, help="fracția mișcărilor care sunt urmăriri lente")
+    ap.add_argument("--latency", type=float, default=0.06, help="s, captură -> afișare")
+    ap.add_argument("--min-cutoff", type=float, default=GazeFilterConfig.min_cutoff)
+    ap.add_argument("--beta", type=float, default=GazeFilterConfig.beta)
+    args = ap.parse_args()
+
+    if args.csv:
+        t, raw, truth, phase = load_csv(args.csv)
+    else:
+        t, raw, truth, phase = synth_trajectory(args.seconds, args.fps, args.noise, pursuit=args.pursuit)
+
+    base = dict(min_cutoff=args.min_cutoff, beta=args.beta)
+    runs = {
+        "raw": raw,
+        "ema(0.35)": run_ema(t, raw),
+        "one-euro": run_filter(t, raw, GazeFilterConfig(predict=False, **base), args.latency),
+        "one-euro+predict": run_filter(t, raw, GazeFilterConfig(predict=True, **base), args.latency),
+    }
+    print(f"frames={len(t)} latency={args.latency * 1000:.0f}ms")
+    print(f"{'filter':<18}{'lag_ms':>9}{'rmse':>9}{'jitter':>9}{'pur_lag':>9}{'pur_rmse':>9}")
+    for name, out in runs.items():
+        lag, rmse, jitter, p_lag, p_rmse = metrics(t, out, truth, phase, args.latency)
+        print(f"{name:<18}{lag:>9.1f}{rmse:>9.4f}{jitter:>9.4f}{p_lag:>9.1f}{p_rmse:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
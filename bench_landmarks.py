@@ -0,0 +1,77 @@
+"""
+Benchmark / regression run pe landmark-uri înregistrate (fără cameră, fără modele).
+
+    python bench_landmarks.py captures/landmarks_20250101_120000.lmk
+    python bench_landmarks.py --synthetic 5000      # înregistrare sintetică temporară
+    python bench_landmarks.py rec.lmk --avatar      # include și Avatar.draw
+
+Raportează cadre/s pentru `Perception.analyze` (+ avatar) și numărul de cadre
+pe care s-a declanșat fiecare gest, ca să poată fi comparat între versiuni.
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from gestures import Perception
+from landmark_log import LandmarkRecorder, LandmarkReplay
+
+
+def make_synthetic(path: str, frames: int, w: int = 1280, h: int = 720, seed: int = 3):
+    """Landmark-uri sintetice (layout aleator + jitter) — doar pentru throughput."""
+    rng = np.random.default_rng(seed)
+    face0 = rng.uniform(0.35, 0.65, (478, 2)).astype(np.float32) * (w, h)
+    hand0 = rng.uniform(0.1, 0.3, (21, 2)).astype(np.float32) * (w, h)
+    with LandmarkRecorder(path) as rec:
+        for i in range(frames):
+            face = face0 + rng.normal(0, 1.5, face0.shape).astype(np.float32)
+            hand = hand0 + rng.normal(0, 1.5, hand0.shape).astype(np.float32) if i % 3 else None
+            rec.write(i / 30.0, w, h, hand, face)
+    return path
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Landmark replay benchmark")
+    ap.add_argument("path", nargs="?", help="director .lmk")
+    ap.add_argument("--synthetic", type=int, default=0, help="generează N cadre sintetice")
+    ap.add_argument("--avatar", action="store_true", help="desenează și avatarul la fiecare cadru")
+    args = ap.parse_args()
+
+    path = args.path
+    if args.synthetic or not path:
+        path = make_synthetic(tempfile.mkdtemp(suffix=".lmk"), args.synthetic or 3000)
+
+    replay = LandmarkReplay(path)
+    perc = Perception(load_models=False)
+    avatar = canvas = None
+    if args.avatar:
+        from avatar import Avatar
+        avatar = Avatar()
+        canvas = np.zeros((360, 360, 3), dtype=np.uint8)
+
+    counts = {"ok": 0, "thumbs_up": 0, "smile": 0, "eyebrow_raise": 0}
+    t0 = time.perf_counter()
+    for _fr, hs, fs in replay.run(perc):
+        counts["ok"] += bool(hs and hs.ok_gesture)
+        counts["thumbs_up"] += bool(hs and hs.thumbs_up)
+        counts["smile"] += bool(fs and fs.smiling)
+        counts["eyebrow_raise"] += bool(fs and fs.eyebrow_raise)
+        if avatar:
+            avatar.draw(canvas, 0, 0, 360, 360, {
+                "smile": bool(fs and fs.smiling),
+                "eyebrow_raise": bool(fs and fs.eyebrow_raise),
+                "ok": bool(hs and hs.ok_gesture),
+                "thumbs_up": bool(hs and hs.thumbs_up),
+                "gaze": fs.gaze_offset if fs else (0.0, 0.0),
+            })
+    dt = time.perf_counter() - t0
+
+    n = len(replay)
+    print(f"{path}: {n} frames ({replay.duration():.1f}s recorded)")
+    print(f"replay: {dt * 1000:.1f} ms total, {n / max(dt, 1e-9):.0f} frames/s")
+    print("gesture frames: " + ", ".join(f"{k}={v}" for k, v in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+Soak test headless pentru sesiuni lungi: memoria și latența per cadru trebuie să rămână plate.
+
+    python bench_soak.py                         # 30k cadre (~17 min de sesiune la 30 FPS)
+    python bench_soak.py --frames 900000 --no-tracemalloc   # o zi de 8h+ de cadre, cât de repede se poate
+    python bench_soak.py --max-rss-growth 32 --max-rss-slope 4 --csv soak.csv
+
+Cadre sintetice (`SyntheticSource`, fără cameră) trec prin aceeași buclă ca
+GUI-ul: `Perception.process` (cu un „model” scriptat care întoarce landmark-uri
+de mână / 1-2 fețe în formatul MediaPipe), desenarea landmark-urilor, reacțiile,
+HUD-ul, avatarul (`AvatarRenderer`, cu vorbire + limite de cuvânt),
+FeatureStore, ListenGate, instant replay, cicluri de înregistrare start/stop și
+fraze scriptate prin `CommandCenter` / `CommandDispatcher` (screenshot, capturi
+recente, temă, accent, replay; comenzile de browser sunt doar parsate).
+Capturile merg într-un director temporar, șters la final.
+
+La fiecare `--sample-every` cadre: RSS (psutil sau /proc), memoria Python
+urmărită de tracemalloc și percentilele latenței per cadru pe interval. La
+final: alocatorii care au crescut cel mai mult față de baseline (după
+`--warmup`) și verdictul — exit code 1 dacă creșterea RSS / tracemalloc, panta
+RSS din a doua jumătate sau p95 depășește pragurile. Widget-urile Tk (istoric, log) nu sunt acoperite.
+"""
+import argparse
+import gc
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+from collections import deque, namedtuple
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+try:
+    import psutil
+except Exception:
+    psutil = None
+
+from avatar import Avatar
+from avatar_renderer import AvatarRenderer
+from commands import CommandCenter
+from dispatcher import CommandDispatcher
+from feature_store import FeatureStore
+from frame_pool import FramePool
+from frame_source import SyntheticSource
+from gestures import Perception
+from listen_gate import ListenGate
+from replay_buffer import ReplayBuffer
+from tracing import Tracer, activate
+
+PHRASES = (
+    "take a screenshot",
+    "show recent captures",
+    "theme dark",
+    "hello there",
+    "accent #ff8800",
+    "search for weather tomorrow",   # browser: doar parsată
+    "theme light",
+    "save last 5 seconds",
+    "arată ultimele capturi",
+    "ce mai faci",
+)
+SAFE_ACTIONS = {"screenshot", "recent_captures", "theme", "accent", "replay"}
+STAGES = ("perception", "overlays", "avatar", "output")
+SLOPE_MIN_SPAN = 50000  # cadre; pe ferestre mai scurte panta RSS e dominată de zgomot (±10-20 MB / 100k)
+
+_Point = namedtuple("_Point", "x y")
+
+
+class ScriptedModel:
+    """Ține locul lui Hands / FaceMesh: `process` întoarce landmark-urile scenariului pentru cadrul curent."""
+
+    def __init__(self, attr: str):
+        self.attr = attr        # multi_hand_landmarks / multi_face_landmarks
+        self.landmarks = None   # listă de puncte normalizate (N, 2) sau None
+
+    def process(self, _frame_rgb):
+        if self.landmarks is None:
+            return SimpleNamespace(**{self.attr: None})
+        return SimpleNamespace(**{self.attr: [
+            SimpleNamespace(landmark=[_Point(x, y) for x, y in pts.tolist()]) for pts in self.landmarks]})
+
+    def close(self):
+        pass
+
+
+class Scenario:
+    """Mână prezentă 2/3 din timp, o față care dispare scurt la 40 s, a doua față 10 s din 20."""
+
+    def __init__(self, faces: int, seed: int = 5):
+        rng = np.random.default_rng(seed)
+        self.rng = rng
+        self.faces = faces
+        self.face0 = [rng.uniform(0.1, 0.3, (478, 2)) + (0.1 + 0.45 * i, 0.3) for i in range(faces)]
+        self.hand0 = rng.uniform(0.0, 0.15, (21, 2)) + (0.6, 0.55)
+
+    def step(self, t: float, hands: ScriptedModel, face: ScriptedModel):
+        drift = np.array([0.03 * np.sin(t * 0.7), 0.02 * np.cos(t * 0.5)])
+        n = 0 if t % 40.0 > 38.0 else (self.faces if t % 20.0 < 10.0 else 1)
+        face.landmarks = [f + drift + self.rng.normal(0, 0.002, f.shape) for f in self.face0[:n]] or None
+        hands.landmarks = ([self.hand0 - drift + self.rng.normal(0, 0.003, self.hand0.shape)]
+                           if t % 9.0 < 6.0 else None)
+
+
+def rss_mb() -> float:
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 2 ** 20
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        return float("nan")  # Windows fără psutil: doar tracemalloc
+
+
+def traced_mb() -> float:
+    return tracemalloc.get_traced_memory()[0] / 2 ** 20 if tracemalloc.is_tracing() else float("nan")
+
+
+def top_growth(base, limit: int):
+    snap = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+    return [s for s in snap.compare_to(base, "lineno") if s.size_diff > 0][:limit]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Long-session soak / memory-leak benchmark")
+    ap.add_argument("--frames", type=int, default=30000)
+    ap.add_argument("--warmup", type=int, default=3000, help="cadre înainte de baseline")
+    ap.add_argument("--sample-every", type=int, default=3000)
+    ap.add_argument("--width", type=int, default=640)
+    ap.add_argument("--height", type=int, default=480)
+    ap.add_argument("--faces", type=int, default=2)
+    ap.add_argument("--phrase-every", type=int, default=300, help="o frază scriptată la N cadre")
+    ap.add_argument("--record-every", type=int, default=1800, help="un ciclu de înregistrare la N cadre")
+    ap.add_argument("--record-frames", type=int, default=150)
+    ap.add_argument("--max-rss-growth", type=float, default=64.0, help="MB peste baseline")
+    ap.add_argument("--max-rss-slope", type=float, default=8.0,
+                    help="MB / 100k cadre, panta RSS în a doua jumătate (scurgere lentă; "
+                         f"verificată de la {SLOPE_MIN_SPAN} cadre în a doua jumătate)")
+    ap.add_argument("--max-traced-growth", type=float, default=16.0, help="MB (tracemalloc) peste baseline")
+    ap.add_argument("--max-p95-ratio", type=float, default=1.5, help="p95 la final / p95 după warmup")
+    ap.add_argument("--top", type=int, default=10, help="alocatori afișați")
+    ap.add_argument("--no-tracemalloc", action="store_true", help="fără tracemalloc (overhead mai mic)")
+    ap.add_argument("--csv", default=None, help="scrie eșantioanele în CSV")
+    ap.add_argument("--keep", action="store_true", help="păstrează directorul temporar cu capturi")
+    args = ap.parse_args()
+
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+    base_dir = tempfile.mkdtemp(prefix="soak_")
+    src = SyntheticSource(args.width, args.height, fps=30.0, realtime=False, max_frames=args.frames)
+    src.open()
+    perc = Perception(load_models=False, max_faces=args.faces)
+    perc.hands, perc.face = ScriptedModel("multi_hand_landmarks"), ScriptedModel("multi_face_landmarks")
+    scenario = Scenario(args.faces)
+    pool = FramePool()
+    avatar = Avatar()
+    renderer = AvatarRenderer(avatar, fps=15.0)
+    features = FeatureStore()
+    gate = ListenGate("mouth")
+    replay = ReplayBuffer(seconds=30.0, fps=15.0)
+    tracer = Tracer(max_traces=500)
+    cmd = CommandCenter(base_dir)
+    dispatcher = CommandDispatcher(cmd)
+    history: deque = deque(maxlen=20)   # ca lista „History (last 20)” din GUI
+    counts = {"phrases": 0, "commands": 0, "parsed_only": 0, "log_lines": 0, "recordings": 0}
+
+    def log(msg):
+        counts["log_lines"] += 1
+        history.append(msg)
+
+    writer = None
+    rec_path, rec_left, speech_text = "", 0, ""
+    lat: list = []
+    stage_ms = {s: [] for s in STAGES}
+    samples = []
+    base = None
+    t_start = time.perf_counter()
+
+    print(f"{'frames':>8s} {'session':>8s} {'RSS MB':>8s} {'py MB':>7s} "
+          f"{'p50 ms':>7s} {'p95 ms':>7s} {'p99 ms':>7s} {'fps':>6s}")
+    k = 0
+    t_int = time.perf_counter()
+    for fr in src:
+        k += 1
+        ts, t_sim = fr.ts, k / src.fps
+        t0 = time.perf_counter()
+
+        frame = pool.flip(fr.image, 1)
+        scenario.step(t_sim, perc.hands, perc.face)
+        _, hand_state, face_state = perc.process(frame, draw=False, ts=ts)
+        features.append(ts, hand_state, face_state)
+        gate.observe(ts, hand_state, face_state)
+        t1 = time.perf_counter()
+
+        perc.draw_landmarks(frame)
+        perc.draw_assistant_reactions(frame, hand_state, face_state)
+        perc.draw_hud(frame, "en", tts_on=True, help_on=k % 600 < 300)
+        t2 = time.perf_counter()
+
+        if k % 240 == 0:   # avatarul „vorbește” 2 s din 8, cu limite de cuvânt la ~300 ms
+            avatar.set_speaking(True)
+        elif k % 240 == 60:
+            avatar.set_speaking(False)
+        if avatar.speaking and k % 9 == 0:
+            avatar.on_word()
+        H, W = frame.shape[:2]
+        state = {
+            "smile": bool(face_state and face_state.smiling),
+            "eyebrow_raise": bool(face_state and face_state.eyebrow_raise),
+            "ok": bool(hand_state and hand_state.ok_gesture),
+            "thumbs_up": bool(hand_state and hand_state.thumbs_up),
+            "gaze": face_state.gaze_offset if face_state else (0.0, 0.0),
+            "speech": speech_text,
+        }
+        renderer.update((W // 3, H // 2), state)
+        if not renderer.composite(frame, W - W // 3 - 12, 12):
+            avatar.draw(frame, W - W // 3 - 12, 12, W // 3, H // 2, state)
+        t3 = time.perf_counter()
+
+        if writer is not None:
+            writer.write(frame)
+            rec_left -= 1
+            if rec_left <= 0:
+                writer.release()
+                writer = None
+                cmd.register_recording(rec_path, frame, duration=args.record_frames / src.fps, trigger="soak")
+                os.remove(rec_path)  # rândul din catalog rămâne; fișierul nu ne interesează
+                counts["recordings"] += 1
+        replay.push(frame, ts)
+        t4 = time.perf_counter()
+
+        for name, a, b in zip(STAGES, (t0, t1, t2, t3), (t1, t2, t3, t4)):
+            stage_ms[name].append((b - a) * 1000.0)
+        lat.append((t4 - t0) * 1000.0)
+
+        # ---------- în afara cadrului (ca pe thread-urile GUI-ului) ----------
+        if args.record_every and k % args.record_every == 0 and writer is None:
+            rec_path = os.path.join(cmd.captures_dir, f"record_{k}.mp4")
+            writer = cv2.VideoWriter(rec_path, cv2.VideoWriter_fourcc(*"mp4v"), src.fps, (W, H))
+            rec_left = args.record_frames
+        if args.phrase_every and k % args.phrase_every == 0:
+            text = PHRASES[counts["phrases"] % len(PHRASES)]
+            counts["phrases"] += 1
+            speech_text = text
+            history.append(f"User said: {text}")
+            trace = tracer.begin("utterance", t0=time.time())
+            with activate(trace):
+                intent = cmd.parse(text)
+                if intent is not None and intent.action in SAFE_ACTIONS:
+                    dispatcher.submit(text, frame_bgr=frame.copy(), log_fn=log, replay=replay)
+                    counts["commands"] += 1
+                elif intent is not None:
+                    counts["parsed_only"] += 1
+            tracer.finish(trace, text=text)
+
+        if k == args.warmup or (k > args.warmup and k % args.sample_every == 0) or k == args.frames:
+            gc.collect()
+            now = time.perf_counter()
+            d = np.asarray(lat) if lat else np.zeros(1)
+            p50, p95, p99 = np.percentile(d, (50, 95, 99))
+            sample = {"frames": k, "session_s": t_sim, "rss_mb": rss_mb(), "traced_mb": traced_mb(),
+                      "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+                      "fps": len(lat) / max(1e-9, now - t_int),
+                      **{f"{s}_p95_ms": float(np.percentile(stage_ms[s] or [0.0], 95)) for s in STAGES}}
+            if k == args.warmup:
+                base = sample
+                snap = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+            else:
+                samples.append(sample)
+            print(f"{k:8d} {time.strftime('%H:%M:%S', time.gmtime(t_sim)):>8s} {sample['rss_mb']:8.1f} "
+                  f"{sample['traced_mb']:7.1f} {p50:7.2f} {p95:7.2f} {p99:7.2f} {sample['fps']:6.0f}"
+                  + ("   <- baseline" if k == args.warmup else ""))
+            lat.clear()
+            for v in stage_ms.values():
+                v.clear()
+            t_int = time.perf_counter()
+
+    dispatcher.shutdown(wait=True)  # comenzile în curs încă scriu în directorul temporar
+    renderer.stop()
+    replay.close()
+    if writer is not None:
+        writer.release()
+    elapsed = time.perf_counter() - t_start
+    print(f"\n{k} frames in {elapsed:.0f}s ({k / max(1e-9, elapsed):.0f} fps); "
+          f"{counts['phrases']} phrases ({counts['commands']} run, {counts['parsed_only']} parse-only), "
+          f"{counts['recordings']} recordings, {counts['log_lines']} log lines, "
+          f"{cmd.catalog.count()} catalog rows, {len(tracer.traces)} traces kept")
+    print(dispatcher.summary())
+    cmd.close()  # așteaptă scrierile de replay, apoi închide catalogul SQLite
+
+    if base is None or not samples:
+        print("Run too short for a verdict (increase --frames or lower --warmup).")
+        if not args.keep:
+            shutil.rmtree(base_dir, ignore_errors=True)
+        return
+
+    last = samples[-3:]
+    rss_growth = min(s["rss_mb"] for s in last) - base["rss_mb"]
+    traced_growth = min(s["traced_mb"] for s in last) - base["traced_mb"]
+    p95_first = float(np.median([s["p95_ms"] for s in samples[:3]]))
+    p95_ratio = float(np.median([s["p95_ms"] for s in last])) / max(1e-9, p95_first)
+    recent = samples[len(samples) // 2:]  # a doua jumătate: fără rampa de după warmup
+    slope = float("nan")
+    if len(recent) >= 2 and not np.isnan(base["rss_mb"]):
+        x = np.array([s["frames"] for s in recent], dtype=np.float64)
+        slope = np.polyfit(x, [s["rss_mb"] for s in recent], 1)[0]
+        print(f"RSS slope (2nd half): {slope * 1e5:+.2f} MB / 100k frames "
+              f"(~{slope * 30 * 3600 * 8:+.1f} MB over an 8h day at 30 FPS)"
+              + ("" if x[-1] - x[0] >= SLOPE_MIN_SPAN else f" — not checked, span < {SLOPE_MIN_SPAN} frames"))
+        if x[-1] - x[0] < SLOPE_MIN_SPAN:
+            slope = float("nan")
+    print("Stage p95 (last interval): " + ", ".join(f"{s} {samples[-1][f'{s}_p95_ms']:.2f} ms" for s in STAGES))
+
+    if snap is not None:
+        print(f"\nTop {args.top} allocation growth since baseline (tracemalloc):")
+        for stat in top_growth(snap, args.top):
+            where = stat.traceback[0]
+            print(f"  {stat.size_diff / 1024:+9.1f} KiB {stat.count_diff:+7d} blocks  "
+                  f"{where.filename}:{where.lineno}")
+
+    if args.csv:
+        import csv
+        with open(args.csv, "w", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=list(base))
+            w.writeheader()
+            w.writerows([base] + samples)
+
+    failures = []
+    if rss_growth > args.max_rss_growth:
+        failures.append(f"RSS grew {rss_growth:.1f} MB (> {args.max_rss_growth:.0f} MB)")
+    if slope * 1e5 > args.max_rss_slope:
+        failures.append(f"RSS slope {slope * 1e5:+.2f} MB / 100k frames (> {args.max_rss_slope:g})")
+    if traced_growth > args.max_traced_growth:
+        failures.append(f"Python heap grew {traced_growth:.1f} MB (> {args.max_traced_growth:.0f} MB)")
+    if p95_ratio > args.max_p95_ratio:
+        failures.append(f"p95 frame latency x{p95_ratio:.2f} vs. after warmup (> x{args.max_p95_ratio:.2f})")
+    heap = "n/a" if np.isnan(traced_growth) else f"{traced_growth:+.1f} MB"
+    print(f"\nRSS {rss_growth:+.1f} MB, Python heap {heap}, p95 x{p95_ratio:.2f} since baseline")
+    if not args.keep:
+        shutil.rmtree(base_dir, ignore_errors=True)
+    else:
+        print(f"Captures kept in {base_dir}")
+    if failures:
+        raise SystemExit("FAIL: " + "; ".join(failures))
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
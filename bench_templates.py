@@ -0,0 +1,62 @@
+"""
+Benchmark pentru clasificarea gesturilor pe șabloane (GestureLibrary).
+
+    python bench_templates.py               # 8 -> 64 gesturi, 2000 de mâini
+    python bench_templates.py --hands 5000
+
+Arată că timpul per mână rămâne practic constant când biblioteca crește
+(distanțele față de toate șabloanele = un singur produs matriceal) și
+verifică acuratețea pe mâini sintetice rotite / scalate / oglindite / cu zgomot.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from gesture_templates import GestureLibrary, default_templates, mirror
+
+
+def perturb(pts: np.ndarray, rng) -> np.ndarray:
+    ang = rng.uniform(-0.6, 0.6)
+    c, s = np.cos(ang), np.sin(ang)
+    p = pts @ np.array([[c, s], [-s, c]], dtype=np.float32)
+    p = p * rng.uniform(80, 300) + rng.uniform(100, 900, 2)
+    if rng.random() < 0.5:
+        p = mirror(p)
+    return (p + rng.normal(0, 2.0, p.shape)).astype(np.float32)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Gesture template matching benchmark")
+    ap.add_argument("--hands", type=int, default=2000)
+    args = ap.parse_args()
+    rng = np.random.default_rng(7)
+
+    base = default_templates()
+    names = list(base)
+    hands = np.stack([perturb(base[names[i % len(names)]][0], rng) for i in range(args.hands)])
+    truth = [names[i % len(names)] for i in range(args.hands)]
+
+    lib = GestureLibrary.default()
+    pred = lib.classify_many(hands)
+    acc = np.mean([p == t for (p, _), t in zip(pred, truth)])
+    print(f"accuracy on {args.hands} perturbed hands: {acc * 100:.1f}%")
+
+    for extra in (0, 8, 24, 56):
+        lib = GestureLibrary.default()
+        for k in range(extra):
+            lib.add(f"extra_{k}", rng.uniform(0, 1, (21, 2)), rebuild=False)
+        lib.rebuild()
+        t0 = time.perf_counter()
+        for h in hands:
+            lib.classify(h)
+        single = (time.perf_counter() - t0) / len(hands)
+        t0 = time.perf_counter()
+        lib.classify_many(hands)
+        batch = (time.perf_counter() - t0) / len(hands)
+        print(f"{len(lib):3d} gestures ({lib.rows:3d} rows): "
+              f"classify {single * 1e6:6.1f} us/hand, classify_many {batch * 1e6:5.2f} us/hand")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Benchmark pentru endpointing-ul vocal: VAD-ul local (`vad.py`) vs. pragul de
+energie din SpeechRecognition (emulat: adjust_for_ambient_noise 0.6 s, prag
+dinamic, pause_threshold 0.75 s, phrase_time_limit 6 s).
+
+    python bench_vad.py                          # fixture-uri WAV sintetice (scrise în captures/vad_fixtures)
+    python bench_vad.py --fixtures dir/          # WAV-uri proprii (16 kHz mono) + <nume>.segments.csv
+    python bench_vad.py --hangover 200,300,450   # mai multe configurații VAD
+
+`<nume>.segments.csv` are câte un rând `start,end` (secunde) per frază rostită.
+Metrici per fixture: întârzierea de endpointing (sfârșitul vorbirii -> fraza
+închisă, p50/p90), tăieri false (fraza închisă înainte de sfârșitul ei),
+fraze închise forțat de limita de timp, fraze ratate, detecții false.
+"""
+import argparse
+import glob
+import os
+import wave
+from typing import List, Tuple
+
+import numpy as np
+
+from vad import VAD, VADConfig
+
+RATE = 16000
+Segments = List[Tuple[float, float]]
+
+
+# ---------- fixture-uri sintetice ----------
+def _word(rng, dur: float) -> np.ndarray:
+    """„Cuvânt”: sunet vocalic armonic (f0 variabil) cu anvelopă + uneori o fricativă la capăt."""
+    n = int(dur * RATE)
+    t = np.arange(n) / RATE
+    f0 = rng.uniform(100, 220) * (1 + 0.08 * np.sin(2 * np.pi * rng.uniform(2, 5) * t))
+    phase = 2 * np.pi * np.cumsum(f0) / RATE
+    x = sum(np.sin(k * phase) / k for k in range(1, 8))
+    x *= np.sin(np.pi * np.linspace(0, 1, n)) ** 0.5
+    if rng.random() < 0.4:  # „s”/„ș” scurt: ZCR mare, energie medie
+        m = int(0.08 * RATE)
+        x[-m:] += rng.normal(0, 0.25, m)
+    return x
+
+
+def _phrase(rng) -> np.ndarray:
+    parts = []
+    for i in range(rng.integers(2, 7)):
+        if i:
+            parts.append(np.zeros(int(rng.uniform(0.05, 0.22) * RATE)))  # pauze între cuvinte
+        parts.append(_word(rng, rng.uniform(0.15, 0.45)))
+    return np.concatenate(parts)
+
+
+def make_fixture(rng, noise_db: float, step_db: float = 0.0, seconds: float = 30.0,
+                 level_db: float = -20.0) -> Tuple[np.ndarray, Segments]:
+    """Fraze la `level_db` dBFS peste zgomot alb/roz la `noise_db`; `step_db` = saltul zgomotului la jumătate."""
+    n = int(seconds * RATE)
+    speech = np.zeros(n)
+    segs: Segments = []
+    t = rng.uniform(1.2, 2.0)
+    while True:
+        ph = _phrase(rng)
+        i = int(t * RATE)
+        if i + len(ph) + RATE > n:
+            break
+        speech[i:i + len(ph)] = ph
+        segs.append((t, t + len(ph) / RATE))
+        t += len(ph) / RATE + rng.uniform(1.5, 3.0)
+    speech *= 10 ** (level_db / 20) / (np.sqrt(np.mean(speech[speech != 0] ** 2)) + 1e-9)
+    white = rng.normal(0, 1, n)
+    pink = np.cumsum(rng.normal(0, 1, n))
+    pink -= np.convolve(pink, np.ones(800) / 800, mode="same")  # fără derivă DC
+    noise = 0.5 * white / white.std() + 0.5 * pink / pink.std()
+    gain = np.full(n, 10 ** (noise_db / 20))
+    if step_db:
+        gain[n // 2:] *= 10 ** (step_db / 20)
+    x = np.clip(speech + noise * gain, -1, 1)
+    return (x * 32767).astype(np.int16), segs
+
+
+FIXTURES = {
+    "quiet": {"noise_db": -55},
+    "office": {"noise_db": -38},
+    "noisy": {"noise_db": -30},
+    "noise-step": {"noise_db": -50, "step_db": 16},
+}
+
+
+def write_fixtures(path: str, seed: int = 11) -> List[str]:
+    os.makedirs(path, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    out = []
+    for name, kw in FIXTURES.items():
+        x, segs = make_fixture(rng, **kw)
+        wav = os.path.join(path, f"{name}.wav")
+        with wave.open(wav, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(RATE)
+            w.writeframes(x.tobytes())
+        with open(wav[:-4] + ".segments.csv", "w") as f:
+            f.writelines(f"{a:.3f},{b:.3f}\n" for a, b in segs)
+        out.append(wav)
+    return out
+
+
+def load(wav: str) -> Tuple[np.ndarray, Segments]:
+    with wave.open(wav, "rb") as w:
+        if w.getframerate() != RATE or w.getnchannels() != 1 or w.getsampwidth() != 2:
+            raise SystemExit(f"{wav}: expected 16 kHz mono int16")
+        x = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+    segs = [tuple(map(float, line.split(",")[:2]))
+            for line in open(wav[:-4] + ".segments.csv") if line.strip()]
+    return x, segs
+
+
+# ---------- detectoare ----------
+def run_vad(x: np.ndarray, cfg: VADConfig):
+    """(start, end_vorbire, momentul_închiderii, forțat) per frază, alimentat în bucăți de 20 ms."""
+    vad = VAD(cfg)
+    out = []
+    for i in range(0, len(x), cfg.frame_len):
+        out += [(u.start, u.end, u.detected, u.forced) for u in vad.feed(x[i:i + cfg.frame_len])]
+    out += [(u.start, u.end, u.detected, u.forced) for u in vad.flush()]
+    return out
+
+
+def run_legacy(x: np.ndarray, energy_threshold=300.0, pause_threshold=0.75, phrase_time_limit=6.0,
+               chunk=1024, ambient=0.6, damping=0.15, ratio=1.5):
+    """Emulează Recognizer.adjust_for_ambient_noise + listen() (prag dinamic pe RMS per bucată)."""
+    spb = chunk / RATE
+    rms = np.sqrt(np.mean(x[:len(x) // chunk * chunk].reshape(-1, chunk).astype(np.float64) ** 2, axis=1))
+    thr = energy_threshold
+
+    def adjust(e):
+        d = damping ** spb
+        return thr * d + e * ratio * (1 - d)
+
+    i = 0
+    for _ in range(int(np.ceil(ambient / spb))):
+        thr = adjust(rms[i])
+        i += 1
+    pause_needed = int(np.ceil(pause_threshold / spb))
+    out = []
+    while i < len(rms):
+        while i < len(rms) and rms[i] <= thr:  # așteaptă începutul frazei (prag dinamic)
+            thr = adjust(rms[i])
+            i += 1
+        if i >= len(rms):
+            break
+        start, pause, last_loud = i, 0, i
+        while i < len(rms):
+            if rms[i] > thr:
+                pause, last_loud = 0, i
+            else:
+                pause += 1
+            i += 1
+            if pause > pause_needed or (i - start) * spb >= phrase_time_limit:
+                break
+        forced = pause <= pause_needed
+        out.append((start * spb, (last_loud + 1) * spb, i * spb, forced))
+    return out
+
+
+# ---------- scor ----------
+def score(dets, segs: Segments, tol: float = 0.1) -> dict:
+    delays, cutoffs, missed = [], 0, 0
+    used = set()
+    for a, b in segs:
+        covering = [k for k, (s, e, _, _) in enumerate(dets) if s < b and e > a]
+        if not covering:
+            missed += 1
+            continue
+        used.update(covering)
+        # tăiere falsă: o frază închisă (din liniște) în interiorul frazei reale
+        cutoffs += sum(1 for k in covering if dets[k][1] < b - tol and not dets[k][3])
+        last = max(covering, key=lambda k: dets[k][1])
+        delays.append(dets[last][2] - b)
+    d = np.asarray(delays) * 1000 if delays else np.zeros(1)
+    return {"p50": float(np.percentile(d, 50)), "p90": float(np.percentile(d, 90)),
+            "cutoffs": cutoffs, "forced": sum(1 for det in dets if det[3]), "missed": missed,
+            "false": len(dets) - len(used), "phrases": len(segs)}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Voice endpointing benchmark (local VAD vs. energy threshold)")
+    ap.add_argument("--fixtures", default=None, help="director cu .wav + .segments.csv (implicit: sintetice)")
+    ap.add_argument("--hangover", default="300", help="hangover_ms pentru VAD, listă separată prin virgulă")
+    args = ap.parse_args()
+
+    if args.fixtures:
+        wavs = sorted(glob.glob(os.path.join(args.fixtures, "*.wav")))
+    else:
+        wavs = write_fixtures(os.path.join(os.path.dirname(os.path.abspath(__file__)), "captures", "vad_fixtures"))
+    detectors = [("speech_recognition", run_legacy)]
+    for h in (int(v) for v in args.hangover.split(",") if v.strip()):
+        cfg = VADConfig(hangover_ms=h)
+        detectors.append((f"vad {h}ms", lambda x, cfg=cfg: run_vad(x, cfg)))
+
+    print(f"{'fixture':12s} {'detector':20s} {'delay p50/p90 ms':>17s} {'cut-offs':>8s} "
+          f"{'forced':>6s} {'missed':>6s} {'false':>5s}")
+    for wav in wavs:
+        x, segs = load(wav)
+        name = os.path.basename(wav)[:-4]
+        for det_name, fn in detectors:
+            s = score(fn(x), segs)
+            print(f"{name:12s} {det_name:20s} {s['p50']:8.0f}/{s['p90']:<8.0f} {s['cutoffs']:8d} "
+                  f"{s['forced']:6d} {s['missed']:6d}/{s['phrases']:<3d}{s['false']:3d}")
+
+
+if __name__ == "__main__":
+    main()
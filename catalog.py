@@ -0,0 +1,124 @@
+"""
+Catalog indexat pentru /captures (SQLite).
+
+Fiecare salvare (screenshot, înregistrare, replay) adaugă un rând cu tip,
+timestamp, rezoluție, durată, declanșator (buton / gest / comandă vocală) și
+un thumbnail JPEG mic. Interogările ("ultimele capturi") citesc doar indexul —
+fără listarea sau decodarea fișierelor din director.
+"""
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    ts REAL NOT NULL,
+    width INTEGER DEFAULT 0,
+    height INTEGER DEFAULT 0,
+    duration REAL DEFAULT 0,
+    trigger TEXT DEFAULT '',
+    thumb BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_captures_ts ON captures(ts);
+CREATE INDEX IF NOT EXISTS idx_captures_kind_ts ON captures(kind, ts);
+"""
+
+
+@dataclass
+class CaptureEntry:
+    id: int
+    kind: str          # "screenshot" / "recording" / "replay"
+    path: str
+    ts: float
+    width: int = 0
+    height: int = 0
+    duration: float = 0.0
+    trigger: str = ""
+
+    def label(self) -> str:
+        when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.ts))
+        size = f"{self.width}x{self.height}" if self.width else "?"
+        dur = f" {self.duration:.1f}s" if self.duration else ""
+        trig = f" [{self.trigger}]" if self.trigger else ""
+        return f"{when} {self.kind} {size}{dur} {os.path.basename(self.path)}{trig}"
+
+
+class CaptureCatalog:
+    def __init__(self, db_path: str, thumb_width: int = 160):
+        self.db_path = db_path
+        self.thumb_width = int(thumb_width)
+        self._lock = threading.Lock()
+        # scrieri din thread-uri diferite (speech, encoder replay, UI) -> o conexiune + lock
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    # ---------- thumbnails ----------
+    def thumbnail_from_frame(self, frame_bgr) -> Optional[bytes]:
+        if frame_bgr is None or frame_bgr.size == 0:
+            return None
+        h, w = frame_bgr.shape[:2]
+        tw = min(self.thumb_width, w)
+        small = cv2.resize(frame_bgr, (tw, max(1, int(h * tw / float(w)))), interpolation=cv2.INTER_AREA)
+        ok, buf = cv2.imencode(".jpg", small, [int(cv2.IMWRITE_JPEG_QUALITY), 75])
+        return buf.tobytes() if ok else None
+
+    def thumbnail_from_jpeg(self, data: bytes) -> Optional[bytes]:
+        img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        return self.thumbnail_from_frame(img)
+
+    # ---------- write ----------
+    def add(self, kind: str, path: str, width: int = 0, height: int = 0, duration: float = 0.0,
+            trigger: str = "", thumb: Optional[bytes] = None, ts: Optional[float] = None) -> CaptureEntry:
+        ts = time.time() if ts is None else float(ts)
+        with self._lock:
+            cur = self._db.execute(
+                "INSERT INTO captures(kind, path, ts, width, height, duration, trigger, thumb) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, path, ts, int(width), int(height), float(duration), trigger or "", thumb),
+            )
+            self._db.commit()
+            row_id = cur.lastrowid
+        return CaptureEntry(row_id, kind, path, ts, int(width), int(height), float(duration), trigger or "")
+
+    def add_frame(self, kind: str, path: str, frame_bgr, trigger: str = "", duration: float = 0.0,
+                  ts: Optional[float] = None) -> CaptureEntry:
+        h, w = frame_bgr.shape[:2] if frame_bgr is not None else (0, 0)
+        return self.add(kind, path, w, h, duration, trigger, self.thumbnail_from_frame(frame_bgr), ts)
+
+    # ---------- read ----------
+    def recent(self, limit: int = 20, kind: Optional[str] = None) -> List[CaptureEntry]:
+        sql = "SELECT id, kind, path, ts, width, height, duration, trigger FROM captures"
+        args = []
+        if kind:
+            sql += " WHERE kind = ?"
+            args.append(kind)
+        sql += " ORDER BY ts DESC, id DESC LIMIT ?"
+        args.append(int(limit))
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        return [CaptureEntry(*r) for r in rows]
+
+    def thumbnail(self, entry_id: int) -> Optional[bytes]:
+        with self._lock:
+            row = self._db.execute("SELECT thumb FROM captures WHERE id = ?", (entry_id,)).fetchone()
+        return row[0] if row else None
+
+    def count(self, kind: Optional[str] = None) -> int:
+        with self._lock:
+            if kind:
+                return self._db.execute("SELECT COUNT(*) FROM captures WHERE kind = ?", (kind,)).fetchone()[0]
+            return self._db.execute("SELECT COUNT(*) FROM captures").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
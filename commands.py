@@ -1,39 +1,118 @@
 
 import os
+import threading
 import webbrowser
 import urllib.parse
 from datetime import datetime
 import re
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+from catalog import CaptureCatalog
+from tracing import current, span
+
+@dataclass
+class Intent:
+    action: str        # screenshot, recent_captures, replay, open_youtube, play_music, google, youtube, open_site, theme, accent
+    arg: object = None  # termen de căutare / site / temă / accent / secunde de replay
+    text: str = ""     # fraza (lowercase) din care a fost parsată
+
 
 class CommandCenter:
-    def __init__(self, base_dir: str, on_theme_change=None, on_accent_change=None):
+    def __init__(self, base_dir: str, on_theme_change=None, on_accent_change=None, on_capture_saved=None):
         self.base_dir = base_dir
         self.captures_dir = os.path.join(self.base_dir, "captures")
         os.makedirs(self.captures_dir, exist_ok=True)
+        # index incremental al capturilor (fără scanarea directorului)
+        self.catalog = CaptureCatalog(os.path.join(self.captures_dir, "catalog.sqlite3"))
         # Optional callbacks wired from GUI
         self.on_theme_change = on_theme_change
         self.on_accent_change = on_accent_change
+        self.on_capture_saved = on_capture_saved  # on_capture_saved(CaptureEntry)
+        self._writers = []  # thread-uri de scriere replay (indexează în catalog la final)
 
     # ---------- Utils ----------
     def _ts(self) -> str:
         return datetime.now().strftime("%Y%m%d_%H%M%S")
 
+    def _register(self, entry) -> None:
+        if self.on_capture_saved:
+            try:
+                self.on_capture_saved(entry)
+            except Exception:
+                pass
+
     # ---------- Actions ----------
-    def take_screenshot(self, frame_bgr) -> str:
-        """Save current frame as PNG under /captures and return path."""
-        import cv2
+    def take_screenshot(self, frame_bgr, trigger: str = "") -> str:
+        """Save current frame as PNG under /captures, index it and return path."""
         fn = f"screenshot_{self._ts()}.png"
         path = os.path.join(self.captures_dir, fn)
-        cv2.imwrite(path, frame_bgr)
+        with span("action:imwrite"):
+            cv2.imwrite(path, frame_bgr)
+        with span("action:catalog"):
+            self._register(self.catalog.add_frame("screenshot", path, frame_bgr, trigger=trigger))
         return path
 
+    def register_recording(self, path: str, first_frame, duration: float, trigger: str = "") -> None:
+        """Index a finished recording (thumbnail from its first frame)."""
+        self._register(self.catalog.add_frame("recording", path, first_frame, trigger=trigger, duration=duration))
+
+    def save_replay(self, replay, seconds: float | None = None, on_done=None, trigger: str = "") -> str | None:
+        """Flush the instant-replay ring to an MP4 under /captures (async), index it; return path."""
+        if replay is None:
+            return None
+        with span("action:replay_snapshot"):
+            items = replay.snapshot(seconds)
+        if not items:
+            return None
+        fn = f"replay_{self._ts()}.mp4"
+        path = os.path.join(self.captures_dir, fn)
+        trace = current()  # scrierea continuă pe alt thread, în același trace
+
+        def _run():
+            try:
+                with span("action:replay_write", trace):
+                    out = replay.write_mp4(items, path)
+            except Exception:
+                out = None
+            if out:
+                first = cv2.imdecode(np.frombuffer(items[0][1], dtype=np.uint8), cv2.IMREAD_COLOR)
+                with span("action:catalog", trace):
+                    self._register(self.catalog.add_frame(
+                        "replay", out, first, trigger=trigger, duration=items[-1][0] - items[0][0]
+                    ))
+            if on_done:
+                on_done(out)
+
+        th = threading.Thread(target=_run, daemon=True)
+        self._writers = [t for t in self._writers if t.is_alive()] + [th]
+        th.start()
+        return path
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Wait for pending replay writers (they still index into the catalog), then close the catalog."""
+        for th in self._writers:
+            th.join(timeout)
+        self._writers = []
+        self.catalog.close()
+
+    @staticmethod
+    def _open_url(url: str) -> None:
+        with span("action:webbrowser"):
+            webbrowser.open(url)
+
+    def recent_captures(self, limit: int = 5):
+        return self.catalog.recent(limit)
+
     def open_youtube(self, query: str | None = None) -> None:
         if query:
             q = urllib.parse.quote_plus(query)
             url = f"https://www.youtube.com/results?search_query={q}"
         else:
             url = "https://www.youtube.com/"
-        webbrowser.open(url)
+        self._open_url(url)
 
     def play_music(self, title: str) -> None:
         self.open_youtube(title)
@@ -42,13 +121,13 @@ class CommandCenter:
         if not query:
             return
         q = urllib.parse.quote_plus(query.strip())
-        webbrowser.open(f"https://www.google.com/search?q={q}")
+        self._open_url(f"https://www.google.com/search?q={q}")
 
     def youtube_search(self, query: str) -> None:
         if not query:
             return
         q = urllib.parse.quote_plus(query.strip())
-        webbrowser.open(f"https://www.youtube.com/results?search_query={q}")
+        self._open_url(f"https://www.youtube.com/results?search_query={q}")
 
     def open_site(self, domain_or_url: str) -> None:
         """Accepts "google.com" or "https://google.com" or "youtube" -> "youtube.com"."""
@@ -59,10 +138,14 @@ class CommandCenter:
             if "." not in u:
                 u = u + ".com"
             u = "https://" + u
-        webbrowser.open(u)
+        self._open_url(u)
 
     # ---------- Theme helpers ----------
     def _apply_theme(self, mode: str) -> bool:
+        with span("action:theme"):
+            return self._apply_theme_now(mode)
+
+    def _apply_theme_now(self, mode: str) -> bool:
         try:
             if self.on_theme_change:
                 self.on_theme_change(mode)
@@ -74,6 +157,10 @@ class CommandCenter:
             return False
 
     def _apply_accent(self, hex_code: str) -> bool:
+        with span("action:accent"):
+            return self._apply_accent_now(hex_code)
+
+    def _apply_accent_now(self, hex_code: str) -> bool:
         try:
             if self.on_accent_change:
                 self.on_accent_change(hex_code)
@@ -85,33 +172,36 @@ class CommandCenter:
             return False
 
     # ---------- Parser ----------
-    def parse_and_run(self, text: str, frame_bgr=None, log_fn=None, lang_hint: str = "en") -> bool:
+    def parse(self, text: str) -> Intent | None:
+        """Text -> Intent (fără efecte; ieftin, rulat pe thread-ul de recunoaștere). None = nu e comandă."""
         if not text:
-            return False
+            return None
         t = text.lower().strip()
 
-        def log(msg: str) -> None:
-            if log_fn:
-                log_fn(msg)
-
         # --- SCREENSHOT ---
         if any(kw in t for kw in [
             "screenshot", "screen shot", "take a screenshot",
             "fa un screenshot", "fă un screenshot", "fa screenshot",
             "salveaza imaginea", "salvează imaginea"
         ]):
-            if frame_bgr is None:
-                log("Screenshot: no frame available.")
-                return True
-            path = self.take_screenshot(frame_bgr)
-            log(f"Screenshot salvat: {path}")
-            return True
+            return Intent("screenshot", None, t)
+
+        # --- RECENT CAPTURES ("arată ultimele capturi" / "show recent captures") ---
+        if any(kw in t for kw in ["captur", "captures", "recordings", "screenshots list"]) and any(kw in t for kw in [
+            "arata", "arată", "afiseaza", "afișează", "listeaza", "listează", "show", "list", "recent", "ultimele"
+        ]):
+            return Intent("recent_captures", None, t)
+
+        # --- INSTANT REPLAY ("salvează ultimele 30 de secunde" / "save last 30 seconds") ---
+        if any(kw in t for kw in ["salveaza", "salvează", "save"]) and any(kw in t for kw in [
+            "ultimele", "last", "replay", "reluare", "reluarea"
+        ]):
+            m = re.search(r"(\d+)\s*(?:de\s*)?(?:sec|s\b)", t)
+            return Intent("replay", float(m.group(1)) if m else None, t)
 
         # --- OPEN YOUTUBE HOME ---
         if any(kw in t for kw in ["open youtube", "deschide youtube"]):
-            self.open_youtube(None)
-            log("Deschid YouTube.")
-            return True
+            return Intent("open_youtube", None, t)
 
         # --- PLAY MUSIC ---
         music_prefixes = ["muzica ", "muzică ", "pune melodia ", "play music ", "play "]
@@ -119,9 +209,7 @@ class CommandCenter:
             if t.startswith(prefix):
                 title = t[len(prefix):].strip()
                 if title:
-                    self.play_music(title)
-                    log(f"Caut pe YouTube: {title}")
-                    return True
+                    return Intent("play_music", title, t)
 
         # --- GOOGLE SEARCH ---
         google_prefixes = [
@@ -132,9 +220,7 @@ class CommandCenter:
             if t.startswith(prefix):
                 query = t[len(prefix):].strip()
                 if query:
-                    self.google_search(query)
-                    log(f"Caut pe Google: {query}")
-                    return True
+                    return Intent("google", query, t)
 
         # --- YOUTUBE SEARCH ---
         yt_prefixes = ["cauta pe youtube ", "caută pe youtube ", "youtube ", "search youtube "]
@@ -142,9 +228,7 @@ class CommandCenter:
             if t.startswith(prefix):
                 q = t[len(prefix):].strip()
                 if q:
-                    self.youtube_search(q)
-                    log(f"Caut pe YouTube: {q}")
-                    return True
+                    return Intent("youtube", q, t)
 
         # --- OPEN SITE ---
         site_prefixes = ["deschide ", "deschide site ", "deschide pagina ", "open ", "open site ", "go to "]
@@ -152,9 +236,7 @@ class CommandCenter:
             if t.startswith(prefix):
                 site = t[len(prefix):].strip()
                 if site and not site.startswith(("youtube", "muzica", "google")):
-                    self.open_site(site)
-                    log(f"Deschid site: {site}")
-                    return True
+                    return Intent("open_site", site, t)
 
         # --- THEME SWITCH ---
         theme_prefixes = [
@@ -170,21 +252,83 @@ class CommandCenter:
                 elif mode in ["luminos", "light", "zi", "alb"]:
                     mode = "light"
                 if mode in ["dark", "light"]:
-                    self._apply_theme(mode)
-                    log(f"Theme -> {mode}")
-                    return True
+                    return Intent("theme", mode, t)
 
         # --- ACCENT HEX ---
         if "accent" in t:
             m = re.search(r"#([0-9a-f]{6})", t, re.IGNORECASE)
             if m:
-                hex_code = "#" + m.group(1)
-                self._apply_accent(hex_code)
-                log(f"Accent -> {hex_code}")
-                return True
+                return Intent("accent", "#" + m.group(1), t)
+
+        # --- Simple greetings as non-command (small talk handler replies) ---
+        return None
 
-        # --- Simple greetings as non-command ---
-        if any(g in t for g in ["hello", "hi", "hey", "salut", "bună", "buna"]):
-            return False  # let small talk handler reply
+    def run(self, intent: Intent, frame_bgr=None, log_fn=None, lang_hint: str = "en", replay=None) -> bool:
+        """Execută o comandă parsată (poate bloca: imwrite, browser, replay)."""
+        def log(msg: str) -> None:
+            if log_fn:
+                log_fn(msg)
 
-        return False
\ No newline at end of file
+        a, arg, t = intent.action, intent.arg, intent.text
+        if a == "screenshot":
+            if callable(frame_bgr):  # snapshot la cerere (cadrul se copiază doar acum)
+                frame_bgr = frame_bgr()
+            if frame_bgr is None:
+                log("Screenshot: no frame available.")
+                return True
+            path = self.take_screenshot(frame_bgr, trigger=f"voice: {t}")
+            log(f"Screenshot salvat: {path}")
+        elif a == "recent_captures":
+            entries = self.recent_captures(5)
+            if not entries:
+                log("Nicio captură în catalog." if lang_hint == "ro" else "No captures yet.")
+                return True
+            total = self.catalog.count()
+            log(f"Ultimele capturi ({len(entries)}/{total}):" if lang_hint == "ro"
+                else f"Recent captures ({len(entries)}/{total}):")
+            for e in entries:
+                log("  " + e.label())
+        elif a == "replay":
+            if replay is None:
+                log("Replay: buffer not available.")
+                return True
+            path = self.save_replay(
+                replay, arg,
+                on_done=lambda p: log(f"Replay salvat: {p}" if p else "Replay: save failed."),
+                trigger=f"voice: {t}",
+            )
+            if path:
+                log(f"Replay: salvez ultimele {int(arg) if arg else int(replay.seconds)}s -> {path}")
+            else:
+                log("Replay: buffer empty.")
+        elif a == "open_youtube":
+            self.open_youtube(None)
+            log("Deschid YouTube.")
+        elif a == "play_music":
+            self.play_music(arg)
+            log(f"Caut pe YouTube: {arg}")
+        elif a == "google":
+            self.google_search(arg)
+            log(f"Caut pe Google: {arg}")
+        elif a == "youtube":
+            self.youtube_search(arg)
+            log(f"Caut pe YouTube: {arg}")
+        elif a == "open_site":
+            self.open_site(arg)
+            log(f"Deschid site: {arg}")
+        elif a == "theme":
+            self._apply_theme(arg)
+            log(f"Theme -> {arg}")
+        elif a == "accent":
+            self._apply_accent(arg)
+            log(f"Accent -> {arg}")
+        else:
+            return False
+        return True
+
+    def parse_and_run(self, text: str, frame_bgr=None, log_fn=None, lang_hint: str = "en", replay=None) -> bool:
+        """Sincron (parse + run pe thread-ul apelantului); GUI-ul folosește `CommandDispatcher`."""
+        intent = self.parse(text)
+        if intent is None:
+            return False
+        return self.run(intent, frame_bgr=frame_bgr, log_fn=log_fn, lang_hint=lang_hint, replay=replay)
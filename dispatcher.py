@@ -0,0 +1,149 @@
+"""
+Execuția comenzilor vocale în afara thread-ului de recunoaștere + canalul spre Tk.
+
+`on_phrase` (thread-ul de speech) doar parsează fraza (`CommandCenter.parse`,
+câteva µs) și pune intenția în coadă; acțiunile (browser, imwrite, replay)
+rulează într-un pool de workeri, așa că microfonul ascultă din nou imediat.
+Fiecare acțiune are un timeout: dacă îl depășește se raportează în log
+(thread-urile Python nu pot fi oprite forțat — acțiunea se termină în fundal,
+iar pool-ul are workeri de rezervă pentru comenzile următoare).
+
+Tot ce atinge widget-uri Tk (log, istoric, temă, lista de capturi) trece prin
+`UIChannel.post(fn, *args)`: o coadă thread-safe golită de bucla Tk.
+"""
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from commands import CommandCenter, Intent
+from tracing import activate, current, span
+
+DEFAULT_TIMEOUTS = {
+    "screenshot": 3.0,
+    "recent_captures": 2.0,
+    "replay": 2.0,   # doar snapshot-ul; scrierea MP4 continuă pe thread-ul ei
+    "theme": 1.0,
+    "accent": 1.0,
+}
+
+
+class UIChannel:
+    """Singurul drum de la thread-urile de fundal la Tk: `post` din orice thread, rulat în mainloop."""
+
+    def __init__(self, root, poll_ms: int = 15):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._closed = False
+        self.root.after(poll_ms, self._drain)
+
+    def post(self, fn: Callable, *args, **kwargs):
+        self._queue.put((fn, args, kwargs))
+
+    def wrap(self, fn: Callable) -> Callable:
+        """Callback apelabil din orice thread care rulează `fn` pe thread-ul Tk."""
+        return lambda *args, **kwargs: self.post(fn, *args, **kwargs)
+
+    def _drain(self):
+        while True:
+            try:
+                fn, args, kwargs = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args, **kwargs)
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+        if not self._closed:
+            self.root.after(self.poll_ms, self._drain)
+
+    def close(self):
+        self._closed = True
+
+
+class _Job:
+    def __init__(self, intent: Intent, timeout: float):
+        self.intent = intent
+        self.timeout = timeout
+        self.t_queued = time.time()
+        self.timed_out = False
+        self.timer: Optional[threading.Timer] = None
+
+
+class CommandDispatcher:
+    def __init__(self, center: CommandCenter, workers: int = 4, timeouts: Optional[Dict[str, float]] = None,
+                 default_timeout: float = 5.0, ui_post: Optional[Callable] = None):
+        self.center = center
+        self.timeouts = dict(DEFAULT_TIMEOUTS, **(timeouts or {}))
+        self.default_timeout = default_timeout  # acțiunile de browser (open_*, google, youtube, play_music)
+        self.ui_post = ui_post  # ui_post(fn, *args): rulează fn pe thread-ul UI (None = direct)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="command")
+        self._lock = threading.Lock()
+        self.submitted = self.completed = self.failed = self.timeouts_hit = 0
+
+    def _to_ui(self, fn: Optional[Callable], *args):
+        if fn is None:
+            return
+        if self.ui_post is not None:
+            self.ui_post(fn, *args)
+        else:
+            fn(*args)
+
+    def submit(self, text: str, lang_hint: str = "en", frame_bgr=None, log_fn: Optional[Callable] = None,
+               replay=None) -> bool:
+        """Parsează pe thread-ul curent și programează acțiunea; False = nu e comandă (small talk)."""
+        with span("parse"):
+            intent = self.center.parse(text)
+        if intent is None:
+            return False
+        job = _Job(intent, self.timeouts.get(intent.action, self.default_timeout))
+        log = (lambda m: self._to_ui(log_fn, m)) if log_fn else None
+        trace = current()
+        with self._lock:
+            self.submitted += 1
+        fut = self._pool.submit(self._run, job, trace, frame_bgr, log, lang_hint, replay)
+        fut.add_done_callback(lambda f: self._on_done(f, job, log))
+        return True
+
+    def _run(self, job: _Job, trace, frame_bgr, log, lang_hint, replay) -> bool:
+        # timeout-ul curge de la începutul acțiunii, nu din momentul în care a intrat în coadă
+        job.timer = threading.Timer(job.timeout, self._on_timeout, (job, log))
+        job.timer.daemon = True
+        job.timer.start()
+        with activate(trace):
+            if trace is not None:
+                trace.add("dispatch:queued", job.t_queued, time.time())
+            with span(f"run:{job.intent.action}"):
+                return self.center.run(job.intent, frame_bgr=frame_bgr, log_fn=log,
+                                       lang_hint=lang_hint, replay=replay)
+
+    def _on_timeout(self, job: _Job, log):
+        job.timed_out = True
+        with self._lock:
+            self.timeouts_hit += 1
+        if log:
+            log(f"Command '{job.intent.action}' timed out after {job.timeout:.1f}s.")
+
+    def _on_done(self, fut, job: _Job, log):
+        if job.timer is not None:
+            job.timer.cancel()
+        err = fut.exception() if not fut.cancelled() else None
+        with self._lock:
+            if err is not None:
+                self.failed += 1
+            elif not job.timed_out:  # cele expirate sunt numărate deja la timeouts_hit
+                self.completed += 1
+        if err is not None and log and not job.timed_out:
+            log(f"Command '{job.intent.action}' failed: {err}")
+
+    def summary(self) -> str:
+        with self._lock:
+            return (f"Commands: {self.submitted} submitted, {self.completed} done, "
+                    f"{self.failed} failed, {self.timeouts_hit} timed out")
+
+    def shutdown(self, wait: bool = False):
+        """Anulează comenzile din coadă; `wait=True` așteaptă și comenzile care rulează deja."""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
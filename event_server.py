@@ -0,0 +1,295 @@
+"""
+Server local de evenimente (asyncio, JSON pe linii peste TCP / Unix socket).
+
+Alte aplicații de pe aceeași mașină (overlay de apel, notițe de ședință) se
+conectează și primesc câte un obiect JSON per linie:
+
+    {"topic": "gesture", "ts": 1712345678.12, "name": "thumbs_up", "phase": "start"}
+
+Topicuri: hand, face (schimbări de stare), gesture (început/sfârșit), gaze
+(limitat la ~10 Hz), phrase (fraze recunoscute), command (acțiuni CommandCenter),
+capture (fișiere salvate). Clientul poate trimite oricând
+`{"subscribe": ["gesture", "phrase"]}` pentru a filtra topicurile.
+
+Bucla asyncio rulează într-un thread separat; `publish()` e apelat din bucla
+video și doar pune mesajul în cozile clienților (mărginite: la un client lent
+se aruncă cele mai vechi mesaje), deci cadrele nu sunt niciodată blocate.
+
+    python event_server.py client [127.0.0.1:8765]   # afișează evenimentele
+"""
+import asyncio
+import json
+import sys
+import threading
+import time
+from typing import Callable, Dict, Optional, Set
+
+TOPICS = ("hand", "face", "gesture", "gaze", "phrase", "command", "capture")
+DEFAULT_THROTTLE = {"gaze": 0.1}  # secunde minime între două mesaje pe topic
+
+
+def _json_default(o):
+    if hasattr(o, "item"):  # scalari numpy
+        return o.item()
+    if hasattr(o, "tolist"):
+        return o.tolist()
+    return str(o)
+
+
+class _Client:
+    def __init__(self, name: str, queue_size: int, writer: Optional[asyncio.StreamWriter] = None):
+        self.name = name
+        self.writer = writer
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.topics: Optional[Set[str]] = None  # None = toate
+        self.dropped = 0
+
+    def wants(self, topic: str) -> bool:
+        return self.topics is None or topic in self.topics
+
+    def put(self, data: bytes):
+        if self.queue.full():
+            self.queue.get_nowait()  # client lent: pierde cel mai vechi mesaj
+            self.dropped += 1
+        self.queue.put_nowait(data)
+
+
+class EventServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, unix_path: Optional[str] = None,
+                 queue_size: int = 256, throttle: Optional[Dict[str, float]] = None,
+                 on_clients: Optional[Callable[[int], None]] = None,
+                 log_fn: Optional[Callable[[str], None]] = None):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.queue_size = queue_size
+        self.throttle = dict(DEFAULT_THROTTLE if throttle is None else throttle)
+        self.on_clients = on_clients  # apelat (din thread-ul serverului) cu nr. de clienți
+        self.log_fn = log_fn          # pornire / oprire / clienți / erori (tot din thread-ul serverului)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._clients: Set[_Client] = set()
+        self._last_sent: Dict[str, float] = {}
+        self._prev: Dict[str, object] = {}
+        self.published = 0
+        self.throttled = 0
+        self.error: Optional[str] = None
+
+    # ---------- ciclu de viață ----------
+    def start(self, timeout: float = 2.0) -> bool:
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout)
+        return self._server is not None
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        asyncio.set_event_loop(loop)
+        try:
+            if self.unix_path:
+                coro = asyncio.start_unix_server(self._handle, path=self.unix_path)
+            else:
+                coro = asyncio.start_server(self._handle, self.host, self.port)
+            self._server = loop.run_until_complete(coro)
+            if not self.unix_path and not self.port:
+                self.port = self._server.sockets[0].getsockname()[1]  # port ales de sistem
+        except OSError as e:
+            self.error = str(e)
+            self._log(f"Event server: failed to start ({e}).")
+            self._ready.set()
+            loop.close()
+            return
+        self._log(f"Event server: listening on {self.address()} (JSON lines)")
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            self._server.close()
+            # pe 3.12+ wait_closed așteaptă și conexiunile deschise: clienții sunt închiși în stop(),
+            # iar timeout-ul acoperă un client care nu răspunde
+            try:
+                loop.run_until_complete(asyncio.wait_for(self._server.wait_closed(), 1.0))
+            except asyncio.TimeoutError:
+                self._log("Event server: timed out waiting for clients to close.")
+            loop.close()
+            self._log("Event server: stopped.")
+
+    def stop(self):
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            def _shutdown():
+                for c in list(self._clients):
+                    c.put(b"")  # semnal de închidere pentru writer
+                    if c.writer is not None:
+                        c.writer.close()  # readline() din _handle primește EOF
+                loop.call_later(0.05, loop.stop)
+            loop.call_soon_threadsafe(_shutdown)
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def address(self) -> str:
+        return self.unix_path if self.unix_path else f"{self.host}:{self.port}"
+
+    @property
+    def clients(self) -> int:
+        return len(self._clients)
+
+    def _log(self, msg: str):
+        if self.log_fn:
+            try:
+                self.log_fn(msg)
+            except Exception:
+                pass
+
+    # ---------- clienți ----------
+    def _notify_clients(self):
+        if self.on_clients:
+            try:
+                self.on_clients(len(self._clients))
+            except Exception:
+                pass
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info("peername") or "unix"
+        client = _Client(str(peer), self.queue_size, writer)
+        self._clients.add(client)
+        self._notify_clients()
+        self._log(f"Event server: client {client.name} connected")
+        hello = {"topic": "hello", "ts": time.time(), "topics": list(TOPICS)}
+        client.put((json.dumps(hello) + "\n").encode())
+        sender = asyncio.ensure_future(self._sender(client, writer))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    msg = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(msg, dict) and "subscribe" in msg:
+                    topics = msg["subscribe"]
+                    client.topics = None if topics in (None, "*", ["*"]) else set(topics)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            self._log(f"Event server: client {client.name} error: {e}")
+        finally:
+            self._clients.discard(client)
+            sender.cancel()
+            writer.close()
+            self._notify_clients()
+            self._log(f"Event server: client {client.name} disconnected"
+                      + (f" ({client.dropped} messages dropped)" if client.dropped else ""))
+
+    async def _sender(self, client: _Client, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                data = await client.queue.get()
+                if not data:
+                    break
+                writer.write(data)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            self._log(f"Event server: send to {client.name} failed: {e}")
+        finally:
+            writer.close()
+
+    def _fanout(self, topic: str, data: bytes):
+        for c in self._clients:
+            if c.wants(topic):
+                c.put(data)
+
+    # ---------- publicare (apelat din orice thread) ----------
+    def publish(self, topic: str, ts: Optional[float] = None, **fields) -> bool:
+        """Nu blochează: serializează o dată și programează trimiterea în bucla serverului."""
+        loop = self._loop
+        if loop is None or not self._clients:
+            return False
+        now = time.time()
+        min_dt = self.throttle.get(topic)
+        if min_dt and now - self._last_sent.get(topic, 0.0) < min_dt:
+            self.throttled += 1
+            return False
+        self._last_sent[topic] = now
+        msg = {"topic": topic, "ts": now if ts is None else ts}
+        msg.update(fields)
+        data = (json.dumps(msg, default=_json_default, ensure_ascii=False) + "\n").encode("utf-8")
+        try:
+            loop.call_soon_threadsafe(self._fanout, topic, data)
+        except RuntimeError:  # bucla s-a oprit
+            return False
+        self.published += 1
+        return True
+
+    def _changed(self, key: str, value) -> bool:
+        if self._prev.get(key) == value:
+            return False
+        self._prev[key] = value
+        return True
+
+    def publish_frame(self, ts: float, hand_state=None, face_state=None):
+        """Publică doar schimbările de stare + începutul/sfârșitul gesturilor + gaze (limitat)."""
+        if not self._clients:
+            return
+        hand = None
+        if hand_state is not None:
+            hand = {"ok": bool(hand_state.ok_gesture), "thumbs_up": bool(hand_state.thumbs_up),
+                    "gesture": hand_state.gesture}
+        if self._changed("hand", hand):
+            self.publish("hand", ts, visible=hand is not None, **(hand or {}))
+        face = None
+        if face_state is not None:
+            face = {"smiling": bool(face_state.smiling), "eyebrow_raise": bool(face_state.eyebrow_raise)}
+        if self._changed("face", face):
+            self.publish("face", ts, visible=face is not None, **(face or {}))
+
+        active = set()
+        if hand:
+            active.update(k for k in ("ok", "thumbs_up") if hand[k])
+            if hand["gesture"]:
+                active.add(hand["gesture"])
+        if face:
+            active.update(k for k in ("smiling", "eyebrow_raise") if face[k])
+        prev = self._prev.get("gestures", set())
+        for name in sorted(active - prev):
+            self.publish("gesture", ts, name=name, phase="start")
+        for name in sorted(prev - active):
+            self.publish("gesture", ts, name=name, phase="end")
+        self._prev["gestures"] = active
+
+        if face_state is not None:
+            gx, gy = face_state.gaze_offset
+            self.publish("gaze", ts, x=round(float(gx), 4), y=round(float(gy), 4))
+
+
+def _client(addr: str = "127.0.0.1:8765"):
+    """Client de test: afișează fiecare eveniment primit."""
+    async def run():
+        if ":" in addr:
+            host, port = addr.rsplit(":", 1)
+            reader, _writer = await asyncio.open_connection(host, int(port))
+        else:
+            reader, _writer = await asyncio.open_unix_connection(addr)
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            print(line.decode("utf-8").rstrip())
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "client":
+        _client(*sys.argv[2:3])
+    else:
+        print(__doc__)
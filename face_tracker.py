@@ -0,0 +1,126 @@
+"""
+Asocierea fețelor între cadre (ID-uri stabile) + detecțiile de față vectorizate.
+
+FaceMesh întoarce fețele în ordinea detecției, care se poate schimba de la un
+cadru la altul. `FaceTracker` potrivește bounding box-urile curente cu pistele
+existente după IoU (matrice N x M într-o singură operație, apoi potrivire
+greedy pe perechile cele mai bune) și păstrează ID-ul unei piste câteva cadre
+după ce fața dispare (ocluzie scurtă).
+
+`face_metrics` calculează zâmbetul, sprâncenele și gaze pentru toate fețele
+deodată pe un tablou (F, N, 2) — costul crește liniar cu F, fără bucle Python
+per față.
+"""
+from typing import Dict, List
+
+import numpy as np
+
+# indici FaceMesh
+MOUTH_L, MOUTH_R, LIP_UP, LIP_LOW = 61, 291, 13, 14
+L_EYE, R_EYE = (33, 133), (263, 362)
+L_BROW, R_BROW = 105, 334
+L_IRIS, R_IRIS = slice(468, 473), slice(473, 478)
+
+
+def boxes(faces: np.ndarray) -> np.ndarray:
+    """(F, N, 2) -> (F, 4) x0, y0, x1, y1."""
+    return np.concatenate([faces.min(axis=1), faces.max(axis=1)], axis=1)
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """IoU între fiecare box din `a` (N, 4) și fiecare din `b` (M, 4) -> (N, M)."""
+    x0 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y0 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x1 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y1 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x1 - x0, 0, None) * np.clip(y1 - y0, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-6)
+
+
+class FaceTracker:
+    def __init__(self, iou_threshold: float = 0.3, max_missed: int = 15):
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed  # cadre fără potrivire până la ștergerea pistei
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._boxes = np.zeros((0, 4), dtype=np.float32)
+        self._missed = np.zeros(0, dtype=np.int64)
+        self._next_id = 1
+
+    def __len__(self):
+        return len(self._ids)
+
+    @property
+    def ids(self) -> List[int]:
+        """ID-urile pistelor active (inclusiv cele nepotrivite de câteva cadre)."""
+        return self._ids.tolist()
+
+    def reset(self):
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._boxes = np.zeros((0, 4), dtype=np.float32)
+        self._missed = np.zeros(0, dtype=np.int64)
+
+    def update(self, det_boxes: np.ndarray) -> np.ndarray:
+        """Box-urile cadrului curent (F, 4) -> ID-ul stabil al fiecăreia (F,)."""
+        n = len(det_boxes)
+        out = np.zeros(n, dtype=np.int64)
+        matched_tracks = np.zeros(len(self._ids), dtype=bool)
+        if n and len(self._ids):
+            iou = iou_matrix(det_boxes, self._boxes)
+            # greedy: perechile în ordinea IoU descrescătoare
+            for flat in np.argsort(iou, axis=None)[::-1]:
+                d, t = divmod(int(flat), len(self._ids))
+                if iou[d, t] < self.iou_threshold:
+                    break
+                if out[d] or matched_tracks[t]:
+                    continue
+                out[d] = self._ids[t]
+                matched_tracks[t] = True
+                self._boxes[t] = det_boxes[d]
+        self._missed[matched_tracks] = 0
+        self._missed[~matched_tracks] += 1
+        new = np.flatnonzero(out == 0)
+        if len(new):
+            out[new] = np.arange(self._next_id, self._next_id + len(new))
+            self._next_id += len(new)
+            self._ids = np.concatenate([self._ids, out[new]])
+            self._boxes = np.concatenate([self._boxes, det_boxes[new].astype(np.float32)])
+            self._missed = np.concatenate([self._missed, np.zeros(len(new), dtype=np.int64)])
+        keep = self._missed <= self.max_missed
+        self._ids, self._boxes, self._missed = self._ids[keep], self._boxes[keep], self._missed[keep]
+        return out
+
+
+def face_metrics(faces: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Detecțiile pentru toate fețele (F, N, 2) deodată (aceleași praguri ca varianta per față):
+    smile_ratio, smiling, mouth_center (F, 2), mouth_open, brow_gap, eyebrow_raise, gaze (F, 2; 0 fără iris).
+    """
+    p = faces.astype(np.int32)  # coordonate întregi, ca la desenare
+    width = np.hypot(*(p[:, MOUTH_L] - p[:, MOUTH_R]).T)
+    height = np.hypot(*(p[:, LIP_UP] - p[:, LIP_LOW]).T)
+    ratio = width / np.maximum(1.0, height)
+    center = np.stack([(p[:, MOUTH_L, 0] + p[:, MOUTH_R, 0]) / 2,
+                       (p[:, LIP_UP, 1] + p[:, LIP_LOW, 1]) / 2], axis=1).astype(np.int32)
+
+    left_gap = np.maximum(1.0, (p[:, L_EYE[0], 1] + p[:, L_EYE[1], 1]) / 2.0 - p[:, L_BROW, 1])
+    right_gap = np.maximum(1.0, (p[:, R_EYE[0], 1] + p[:, R_EYE[1], 1]) / 2.0 - p[:, R_BROW, 1])
+    raise_ = (((left_gap / right_gap) > 1.2) & (left_gap > 8)) | (((right_gap / left_gap) > 1.2) & (right_gap > 8))
+
+    gaze = np.zeros((len(faces), 2), dtype=np.float32)
+    if faces.shape[1] >= 478:
+        def eye(a, b, iris):
+            c0, c1 = faces[:, a], faces[:, b]
+            half = (np.abs(c1 - c0) + 1e-5) * 0.5
+            return (faces[:, iris].mean(axis=1) - (c0 + c1) * 0.5) / half
+        gaze = np.clip((eye(*L_EYE, L_IRIS) + eye(*R_EYE, R_IRIS)) * 0.5, -1.0, 1.0)
+
+    return {"smile_ratio": ratio, "smiling": ratio > 1.8, "mouth_center": center,
+            "mouth_open": height / np.maximum(1.0, width),
+            "brow_gap": np.maximum(left_gap, right_gap), "eyebrow_raise": raise_, "gaze": gaze}
+
+
+def primary_index(ids: List[int]) -> int:
+    """Fața „principală” (cea urmărită cel mai de mult = ID-ul cel mai mic)."""
+    return int(np.argmin(ids))
@@ -0,0 +1,229 @@
+"""
+Serii de timp per sesiune pentru semnalele calculate de `Perception`.
+
+Stocare pe coloane (câte un array NumPy per semnal) într-un ring buffer de
+capacitate fixă: append O(1) fără alocări, memorie cunoscută dinainte
+(implicit 2h la 30 FPS ≈ 8 MB), iar cadrele cele mai vechi sunt suprascrise.
+Interogările sunt vectorizate pe fereastra cerută, de exemplu:
+
+    store.fraction("smiling", seconds=300)   # cât din ultimele 5 min a zâmbit
+    store.mean("gaze_x", seconds=60)
+    store.events("thumbs_up", seconds=600)   # de câte ori a apărut gestul
+
+La sfârșitul sesiunii: `export_npz(path)` / `export_csv(path)`.
+"""
+import csv
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# biți în coloana `flags`
+FLAGS = {
+    "face": 1,
+    "hand": 2,
+    "smiling": 4,
+    "eyebrow_raise": 8,
+    "ok": 16,
+    "thumbs_up": 32,
+}
+
+COLUMNS = (
+    ("ts", np.float64),
+    ("gaze_x", np.float32),
+    ("gaze_y", np.float32),
+    ("smile_ratio", np.float32),   # lățime / înălțime gură
+    ("brow_gap", np.float32),      # distanța maximă sprânceană-ochi (px)
+    ("hand_x", np.float32),        # centrul mâinii (px), NaN fără mână
+    ("hand_y", np.float32),
+    ("gesture", np.int16),         # index în `gesture_names`, -1 = niciunul
+    ("flags", np.uint8),
+)
+
+MAX_GAP = 1.0  # secunde; găuri mai mari (cameră oprită) nu contează ca timp petrecut
+
+
+class FeatureStore:
+    def __init__(self, seconds: float = 2 * 3600, fps: float = 30.0):
+        self.capacity = int(seconds * fps)
+        self.cols: Dict[str, np.ndarray] = {
+            name: np.zeros(self.capacity, dtype=dt) for name, dt in COLUMNS
+        }
+        self.gesture_names: List[str] = []
+        self._gesture_idx: Dict[str, int] = {}
+        self._head = 0   # următoarea poziție de scris
+        self.size = 0
+        self.total = 0   # cadre scrise în total (inclusiv cele suprascrise)
+
+    @classmethod
+    def from_columns(cls, cols: Dict[str, np.ndarray], gesture_names: List[str]) -> "FeatureStore":
+        """Store plin dintr-un set de coloane deja cronologice (ex. rezultatele `annotate.py`)."""
+        n = len(cols["ts"])
+        store = cls(seconds=max(n, 1), fps=1.0)  # capacitate = exact n rânduri
+        for name, _dt in COLUMNS:
+            store.cols[name][:n] = cols[name]
+        store.gesture_names = list(gesture_names)
+        store._gesture_idx = {g: i for i, g in enumerate(store.gesture_names)}
+        store.size = store.total = n
+        store._head = n % store.capacity
+        return store
+
+    def __len__(self):
+        return self.size
+
+    def memory_bytes(self) -> int:
+        return sum(a.nbytes for a in self.cols.values())
+
+    def clear(self):
+        self._head = self.size = self.total = 0
+
+    # ---------- scriere ----------
+    def _gesture_id(self, name: str) -> int:
+        if not name:
+            return -1
+        idx = self._gesture_idx.get(name)
+        if idx is None:
+            idx = self._gesture_idx[name] = len(self.gesture_names)
+            self.gesture_names.append(name)
+        return idx
+
+    def append(self, ts: float, hand_state=None, face_state=None):
+        """Un cadru: stările întoarse de `Perception.process` / `analyze` (pot fi None)."""
+        i = self._head
+        c = self.cols
+        flags = 0
+        c["ts"][i] = ts
+        if face_state is not None:
+            flags |= FLAGS["face"]
+            flags |= FLAGS["smiling"] if face_state.smiling else 0
+            flags |= FLAGS["eyebrow_raise"] if face_state.eyebrow_raise else 0
+            c["gaze_x"][i], c["gaze_y"][i] = face_state.gaze_offset
+            c["smile_ratio"][i] = face_state.smile_ratio
+            c["brow_gap"][i] = face_state.brow_gap
+        else:
+            c["gaze_x"][i] = c["gaze_y"][i] = c["smile_ratio"][i] = c["brow_gap"][i] = np.nan
+        if hand_state is not None:
+            flags |= FLAGS["hand"]
+            flags |= FLAGS["ok"] if hand_state.ok_gesture else 0
+            flags |= FLAGS["thumbs_up"] if hand_state.thumbs_up else 0
+            c["hand_x"][i], c["hand_y"][i] = hand_state.hand_center
+            c["gesture"][i] = self._gesture_id(hand_state.gesture)
+        else:
+            c["hand_x"][i] = c["hand_y"][i] = np.nan
+            c["gesture"][i] = -1
+        c["flags"][i] = flags
+        self._head = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.total += 1
+
+    # ---------- interogări ----------
+    def _pieces(self):
+        """Bucățile fizice ale bufferului, în ordine cronologică."""
+        if self.size < self.capacity:
+            return [slice(0, self.size)]
+        return [slice(self._head, self.capacity), slice(0, self._head)]
+
+    def _index(self, seconds: Optional[float], now: Optional[float]) -> np.ndarray:
+        pieces = self._pieces()
+        if seconds is None:
+            return np.concatenate([np.arange(s.start, s.stop) for s in pieces])
+        if now is None:
+            now = float(self.cols["ts"][self._head - 1]) if self.size else time.time()
+        t_from = now - seconds
+        out = []
+        for s in pieces:
+            k = np.searchsorted(self.cols["ts"][s], t_from)
+            out.append(np.arange(s.start + k, s.stop))
+        return np.concatenate(out)
+
+    def window(self, seconds: Optional[float] = None, now: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """Toate coloanele pe ultimele `seconds` (None = tot bufferul), cronologic."""
+        idx = self._index(seconds, now)
+        return {name: a[idx] for name, a in self.cols.items()}
+
+    def column(self, name: str, seconds: Optional[float] = None, now: Optional[float] = None) -> np.ndarray:
+        return self.cols[name][self._index(seconds, now)]
+
+    def _flag(self, flag: str, flags: np.ndarray) -> np.ndarray:
+        if flag in FLAGS:
+            return (flags & FLAGS[flag]) != 0
+        raise KeyError(f"Unknown flag: {flag}")
+
+    @staticmethod
+    def _durations(ts: np.ndarray) -> np.ndarray:
+        """Cât „durează” fiecare cadru (până la următorul), plafonat la MAX_GAP."""
+        if len(ts) < 2:
+            return np.zeros(len(ts))
+        dt = np.empty(len(ts))
+        dt[:-1] = np.minimum(np.diff(ts), MAX_GAP)
+        dt[-1] = np.median(dt[:-1])
+        return dt
+
+    def duration(self, flag: Optional[str] = None, seconds: Optional[float] = None,
+                 now: Optional[float] = None) -> float:
+        """Timpul (s) cu `flag` activ în fereastră (None = tot timpul înregistrat)."""
+        w = self.window(seconds, now)
+        dt = self._durations(w["ts"])
+        if flag is None:
+            return float(dt.sum())
+        return float(dt[self._flag(flag, w["flags"])].sum())
+
+    def fraction(self, flag: str, seconds: Optional[float] = None, now: Optional[float] = None,
+                 given: Optional[str] = None) -> float:
+        """Fracțiunea de timp cu `flag` activ; `given` = raportat doar la cadrele cu acel flag
+        (ex. fraction("smiling", 300, given="face") = zâmbet cât timp fața a fost vizibilă)."""
+        w = self.window(seconds, now)
+        dt = self._durations(w["ts"])
+        if given is not None:
+            dt = dt * self._flag(given, w["flags"])
+        total = dt.sum()
+        return float(dt[self._flag(flag, w["flags"])].sum() / total) if total > 0 else 0.0
+
+    def events(self, flag: str, seconds: Optional[float] = None, now: Optional[float] = None) -> int:
+        """Numărul de apariții (fronturi crescătoare) ale unui flag."""
+        on = self._flag(flag, self.column("flags", seconds, now)).astype(np.int8)
+        return int(np.count_nonzero(np.diff(on, prepend=0) == 1))
+
+    def mean(self, name: str, seconds: Optional[float] = None, now: Optional[float] = None) -> float:
+        vals = self.column(name, seconds, now).astype(np.float64)
+        vals = vals[np.isfinite(vals)]
+        return float(vals.mean()) if len(vals) else float("nan")
+
+    def gesture_counts(self, seconds: Optional[float] = None, now: Optional[float] = None) -> Dict[str, int]:
+        """Câte cadre a fost recunoscut fiecare gest din bibliotecă."""
+        g = self.column("gesture", seconds, now)
+        counts = np.bincount(g[g >= 0], minlength=len(self.gesture_names))
+        return {name: int(n) for name, n in zip(self.gesture_names, counts) if n}
+
+    def summary(self, seconds: Optional[float] = None) -> str:
+        if not self.size:
+            return "Session: no frames."
+        return (f"Session: {self.duration(seconds=seconds) / 60:.1f} min, "
+                f"face {self.fraction('face', seconds) * 100:.0f}%, "
+                f"smiling {self.fraction('smiling', seconds, given='face') * 100:.0f}%, "
+                f"eyebrow raises {self.events('eyebrow_raise', seconds)}, "
+                f"OK {self.events('ok', seconds)}, thumbs-up {self.events('thumbs_up', seconds)}")
+
+    # ---------- export ----------
+    def export_npz(self, path: str):
+        w = self.window()
+        np.savez_compressed(path, gesture_names=np.array(self.gesture_names, dtype=np.str_),
+                            flag_bits=np.array(list(FLAGS.items()), dtype=np.str_), **w)
+
+    def export_csv(self, path: str):
+        w = self.window()
+        names = self.gesture_names
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            out = csv.writer(f)
+            out.writerow(["ts", "gaze_x", "gaze_y", "smile_ratio", "brow_gap", "hand_x", "hand_y",
+                          "gesture"] + list(FLAGS))
+            bits = {k: self._flag(k, w["flags"]) for k in FLAGS}
+            for i in range(len(w["ts"])):
+                g = int(w["gesture"][i])
+                out.writerow([
+                    f"{w['ts'][i]:.3f}",
+                    *(f"{w[k][i]:.4f}" if np.isfinite(w[k][i]) else ""
+                      for k in ("gaze_x", "gaze_y", "smile_ratio", "brow_gap", "hand_x", "hand_y")),
+                    names[g] if g >= 0 else "",
+                    *(int(bits[k][i]) for k in FLAGS),
+                ])
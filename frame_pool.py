@@ -0,0 +1,70 @@
+"""
+Buffere de cadre prealocate + snapshot-uri copiate doar la cerere.
+
+`FramePool` păstrează câte un array per nume (flip, rgb, infer...) și îl
+refolosește cât timp forma/dtype-ul nu se schimbă; operațiile OpenCV scriu
+direct în el (`dst=`), deci bucla video nu mai alocă ~6 MB per operație la 1080p.
+
+`LazySnapshot` ține o referință la cadrul brut al sursei (nemodificat — sursele
+întorc un array nou la fiecare citire) și face flip-ul/copia doar când cineva
+chiar are nevoie de el (screenshot, comandă vocală).
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class FramePool:
+    """Un buffer refolosit per nume; realocă doar dacă se schimbă forma sau tipul."""
+
+    def __init__(self):
+        self._bufs: Dict[str, np.ndarray] = {}
+        self.allocations = 0
+
+    def get(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        buf = self._bufs.get(name)
+        if buf is None or buf.shape != tuple(shape) or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self._bufs[name] = buf
+            self.allocations += 1
+        return buf
+
+    def flip(self, src: np.ndarray, code: int = 1, name: str = "flip") -> np.ndarray:
+        return cv2.flip(src, code, dst=self.get(name, src.shape, src.dtype))
+
+    def cvt_color(self, src: np.ndarray, code: int, name: str, channels: int = 3) -> np.ndarray:
+        shape = src.shape[:2] + ((channels,) if channels > 1 else ())
+        return cv2.cvtColor(src, code, dst=self.get(name, shape, src.dtype))
+
+    def resize(self, src: np.ndarray, size: Tuple[int, int], name: str,
+               interpolation: int = cv2.INTER_AREA) -> np.ndarray:
+        w, h = size
+        dst = self.get(name, (h, w) + src.shape[2:], src.dtype)
+        return cv2.resize(src, (w, h), dst=dst, interpolation=interpolation)
+
+    def nbytes(self) -> int:
+        return sum(b.nbytes for b in self._bufs.values())
+
+    def clear(self):
+        self._bufs.clear()
+
+
+class LazySnapshot:
+    """Cadrul brut + transformarea lui, materializate (o singură dată) la prima cerere."""
+
+    def __init__(self, raw: np.ndarray, flip_code: Optional[int] = 1):
+        self._raw = raw
+        self._flip = flip_code
+        self._frame: Optional[np.ndarray] = None
+        self._lock = threading.Lock()  # comenzile vocale îl pot cere din alt thread
+
+    def get(self) -> np.ndarray:
+        with self._lock:
+            if self._frame is None:
+                if self._flip is None:
+                    self._frame = self._raw.copy()
+                else:
+                    self._frame = cv2.flip(self._raw, self._flip)
+            return self._frame
@@ -0,0 +1,195 @@
+"""
+Ieșiri pentru cadrul final (cu overlay-uri, HUD, avatar) către alte aplicații locale.
+
+`SharedMemorySink` publică fiecare cadru într-un ring în memorie partajată
+(`multiprocessing.shared_memory`, nume implicit "video_assistant_frames"):
+
+    antet global (64 B):  magic "VAFR", versiune u32, sloturi u32, octeți/slot u64,
+                          ultima secvență scrisă u64
+    slot i (antet 64 B):  seq_begin u64, ts f64, height u32, width u32, channels u32,
+                          nbytes u64, seq_end u64   + datele BGR (uint8, C-contiguous)
+
+Scrierea folosește un seqlock per slot: `seq_begin` se actualizează înainte de
+copierea pixelilor, `seq_end` după. Un cititor e consistent dacă
+seq_begin == seq_end == secvența așteptată; producătorul nu așteaptă niciodată
+după cititori (un cititor lent doar pierde cadre). Cititorii primesc o vedere
+numpy direct în memoria partajată (zero copii) — validă până când producătorul
+ajunge din nou la același slot (`slots - 1` cadre), verificabil cu `is_valid()`.
+"""
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+from multiprocessing import shared_memory
+
+MAGIC = b"VAFR"
+VERSION = 1
+HEADER_SIZE = 64
+SLOT_HEADER_SIZE = 64
+DEFAULT_NAME = "video_assistant_frames"
+
+_GLOBAL = struct.Struct("<4sIIQQ")         # magic, version, slots, slot_bytes, latest_seq
+_LATEST_OFF = 4 + 4 + 4 + 8                # offset-ul lui latest_seq
+_SLOT = struct.Struct("<QdIIIQQ")          # seq_begin, ts, h, w, c, nbytes, seq_end
+
+
+class FrameSink(ABC):
+    """Interfața comună: write(frame, ts) / close()."""
+
+    @abstractmethod
+    def write(self, frame: np.ndarray, ts: Optional[float] = None) -> bool:
+        ...
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Cititorul nu deține segmentul: nu-l înregistrăm la resource_tracker (care l-ar șterge
+    la ieșirea cititorului sau ar strica evidența producătorului când tracker-ul e comun)."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedMemorySink(FrameSink):
+    def __init__(self, name: str = DEFAULT_NAME, slots: int = 4,
+                 max_width: int = 1920, max_height: int = 1080, channels: int = 3):
+        self.name = name
+        self.slots = slots
+        self.max_shape = (max_height, max_width, channels)
+        self.slot_bytes = max_height * max_width * channels
+        self.stride = SLOT_HEADER_SIZE + self.slot_bytes
+        size = HEADER_SIZE + slots * self.stride
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # rămas de la o rulare întreruptă: îl înlocuim
+            stale = shared_memory.SharedMemory(name=name)
+            stale.unlink()
+            stale.close()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self.buf = self.shm.buf
+        _GLOBAL.pack_into(self.buf, 0, MAGIC, VERSION, slots, self.slot_bytes, 0)
+        for i in range(slots):
+            _SLOT.pack_into(self.buf, self._slot_off(i), 0, 0.0, 0, 0, 0, 0, 0)
+        self.seq = 0
+        self.resized = 0  # cadre mai mari decât slotul (scalate la scriere)
+
+    def _slot_off(self, i: int) -> int:
+        return HEADER_SIZE + i * self.stride
+
+    def write(self, frame: np.ndarray, ts: Optional[float] = None) -> bool:
+        if self.buf is None:
+            return False
+        ts = time.time() if ts is None else ts
+        h, w = frame.shape[:2]
+        c = frame.shape[2] if frame.ndim == 3 else 1
+        mh, mw, mc = self.max_shape
+        if c != mc:
+            return False
+        self.seq += 1
+        seq = self.seq
+        off = self._slot_off(seq % self.slots)
+        # seqlock: seq_begin înainte de pixeli, seq_end după
+        struct.pack_into("<Q", self.buf, off, seq)
+        if h > mh or w > mw:
+            s = min(mh / h, mw / w)
+            h, w = max(1, int(h * s)), max(1, int(w * s))
+            dst = np.ndarray((h, w, c), np.uint8, self.buf, off + SLOT_HEADER_SIZE)
+            cv2.resize(frame, (w, h), dst=dst, interpolation=cv2.INTER_AREA)
+            self.resized += 1
+        else:
+            dst = np.ndarray((h, w, c), np.uint8, self.buf, off + SLOT_HEADER_SIZE)
+            np.copyto(dst, frame.reshape(h, w, c))
+        _SLOT.pack_into(self.buf, off, seq, ts, h, w, c, h * w * c, seq)
+        struct.pack_into("<Q", self.buf, _LATEST_OFF, seq)
+        return True
+
+    def close(self):
+        if self.buf is None:
+            return
+        self.buf = None
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedMemoryReader:
+    """Citește cadrele unui `SharedMemorySink` din alt proces (vederi zero-copy)."""
+
+    def __init__(self, name: str = DEFAULT_NAME):
+        self.shm = _attach(name)
+        self.buf = self.shm.buf
+        magic, version, self.slots, self.slot_bytes, _ = _GLOBAL.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{name}: not a frame sink (magic={magic!r}, version={version})")
+        self.stride = SLOT_HEADER_SIZE + self.slot_bytes
+        self.torn = 0    # citiri invalidate de producător (suprascrise în timpul citirii)
+        self.missed = 0  # cadre sărite (cititorul a fost mai lent decât producătorul)
+        self._last = 0
+
+    def latest_seq(self) -> int:
+        return struct.unpack_from("<Q", self.buf, _LATEST_OFF)[0]
+
+    def _read(self, seq: int) -> Optional[Tuple[int, float, np.ndarray]]:
+        off = HEADER_SIZE + (seq % self.slots) * self.stride
+        begin, ts, h, w, c, nbytes, end = _SLOT.unpack_from(self.buf, off)
+        if begin != seq or end != seq:
+            self.torn += 1
+            return None
+        frame = np.ndarray((h, w, c), np.uint8, self.buf, off + SLOT_HEADER_SIZE)
+        return seq, ts, frame
+
+    def is_valid(self, seq: int) -> bool:
+        """Vederea întoarsă pentru `seq` e încă intactă (slotul n-a fost rescris)?"""
+        off = HEADER_SIZE + (seq % self.slots) * self.stride
+        return struct.unpack_from("<Q", self.buf, off)[0] == seq
+
+    def latest(self) -> Optional[Tuple[int, float, np.ndarray]]:
+        """(seq, ts, frame) pentru ultimul cadru complet, sau None."""
+        seq = self.latest_seq()
+        return self._read(seq) if seq else None
+
+    def next(self, timeout: float = 1.0, poll: float = 0.001) -> Optional[Tuple[int, float, np.ndarray]]:
+        """Așteaptă un cadru mai nou decât ultimul returnat (polling; fără lock-uri între procese)."""
+        deadline = time.perf_counter() + timeout
+        while True:
+            seq = self.latest_seq()
+            if seq > self._last:
+                item = self._read(seq)
+                if item is not None:
+                    if self._last:
+                        self.missed += seq - self._last - 1
+                    self._last = seq
+                    return item
+            if time.perf_counter() > deadline:
+                return None
+            time.sleep(poll)
+
+    def close(self):
+        if self.buf is not None:
+            self.buf = None
+            try:
+                self.shm.close()
+            except BufferError:
+                pass  # cadre (vederi) încă ținute de apelant; segmentul se eliberează la GC
@@ -0,0 +1,58 @@
+"""
+Cititor de referință pentru `SharedMemorySink` (cadrul adnotat, live, din alt proces).
+
+    python frame_sink_reader.py                  # statistici: FPS, latență, cadre pierdute
+    python frame_sink_reader.py --show           # și fereastră OpenCV
+    python frame_sink_reader.py --name altul --seconds 10
+
+Cadrul primit e o vedere direct în memoria partajată (fără copie). Dacă e
+folosit mai mult de câteva cadre (ex. trimis asincron mai departe), copiați-l
+sau verificați `reader.is_valid(seq)` după folosire.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from frame_sink import DEFAULT_NAME, SharedMemoryReader
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Shared-memory frame sink reader")
+    ap.add_argument("--name", default=DEFAULT_NAME)
+    ap.add_argument("--seconds", type=float, default=0.0, help="0 = până la Ctrl+C")
+    ap.add_argument("--show", action="store_true")
+    args = ap.parse_args()
+
+    reader = SharedMemoryReader(args.name)
+    print(f"attached to '{args.name}': {reader.slots} slots x {reader.slot_bytes / 1e6:.1f} MB")
+    if args.show:
+        import cv2
+    t0 = t_report = time.perf_counter()
+    frames, lat = 0, []
+    try:
+        while not args.seconds or time.perf_counter() - t0 < args.seconds:
+            item = reader.next(timeout=2.0)
+            if item is None:
+                print("no frames (producer stopped?)")
+                continue
+            seq, ts, frame = item
+            frames += 1
+            lat.append(time.time() - ts)
+            if args.show:
+                cv2.imshow(args.name, frame)
+                if cv2.waitKey(1) & 0xFF == 27:
+                    break
+            now = time.perf_counter()
+            if now - t_report >= 2.0:
+                print(f"seq {seq}: {frames / (now - t_report):.1f} fps, {frame.shape[1]}x{frame.shape[0]}, "
+                      f"latency p50 {np.median(lat) * 1000:.1f} ms, missed {reader.missed}, torn {reader.torn}")
+                frames, lat, t_report = 0, [], now
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Surse de cadre cu o interfață comună (cameră, fișier video, generator sintetic).
+
+Fiecare cadru vine cu timestamp-ul capturii (time.time()) și un număr de
+secvență. Camera e configurată pentru latență mică: format/rezoluție/FPS
+negociate explicit, buffer intern de 1 cadru și un thread care citește
+continuu și păstrează doar ultimul cadru (grab-latest-only), așa că
+GUI-ul nu consumă niciodată cadre vechi din coada driverului.
+"""
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+
+@dataclass
+class Frame:
+    image: np.ndarray
+    ts: float   # momentul capturii (time.time())
+    seq: int    # număr de secvență al sursei
+
+
+class FrameSource(ABC):
+    """Interfața comună: open() / read() -> Frame | None / release()."""
+
+    name = "source"
+
+    def __init__(self):
+        self.width = 0
+        self.height = 0
+        self.fps = 0.0
+        self._seq = 0
+
+    @abstractmethod
+    def open(self) -> bool:
+        ...
+
+    @abstractmethod
+    def read(self) -> Optional[Frame]:
+        ...
+
+    def release(self):
+        pass
+
+    def is_opened(self) -> bool:
+        return False
+
+    def describe(self) -> str:
+        return f"{self.name} {self.width}x{self.height}@{self.fps:.0f}"
+
+    def _next(self, image, ts: Optional[float] = None) -> Frame:
+        self._seq += 1
+        return Frame(image, time.time() if ts is None else ts, self._seq)
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def __iter__(self):
+        while True:
+            fr = self.read()
+            if fr is None:
+                return
+            yield fr
+
+
+class CameraSource(FrameSource):
+    name = "camera"
+
+    def __init__(self, index: int = 0, width: int = 1280, height: int = 720, fps: float = 30.0,
+                 fourcc: Optional[str] = "MJPG", buffer_size: int = 1, threaded: bool = True,
+                 backend: Optional[int] = None, read_timeout: float = 1.0):
+        super().__init__()
+        self.index = index
+        self.req = dict(width=width, height=height, fps=fps, fourcc=fourcc)
+        self.buffer_size = buffer_size
+        self.threaded = threaded
+        self.read_timeout = read_timeout
+        if backend is None:
+            # V4L2 direct pe Linux (controlul formatului / bufferului e respectat)
+            backend = cv2.CAP_V4L2 if sys.platform.startswith("linux") else cv2.CAP_ANY
+        self.backend = backend
+        self.fourcc = ""
+        self._cap = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._cond = threading.Condition()
+        self._latest: Optional[Frame] = None
+        self._returned_seq = 0
+        self.dropped = 0  # cadre suprascrise înainte de a fi citite
+
+    def open(self) -> bool:
+        cap = cv2.VideoCapture(self.index, self.backend)
+        if not cap.isOpened() and self.backend != cv2.CAP_ANY:
+            cap = cv2.VideoCapture(self.index)
+        if not cap.isOpened():
+            return False
+        # ordinea contează pe V4L2: FOURCC înainte de rezoluție/FPS
+        if self.req["fourcc"]:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.req["fourcc"]))
+        if self.req["width"]:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.req["width"])
+        if self.req["height"]:
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.req["height"])
+        if self.req["fps"]:
+            cap.set(cv2.CAP_PROP_FPS, self.req["fps"])
+        if self.buffer_size:
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+        # ce a acceptat efectiv driverul
+        self.width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = float(cap.get(cv2.CAP_PROP_FPS) or 0.0)
+        code = int(cap.get(cv2.CAP_PROP_FOURCC))
+        self.fourcc = "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00")
+        self._cap = cap
+        if self.threaded:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._reader, daemon=True)
+            self._thread.start()
+        return True
+
+    def describe(self) -> str:
+        return f"camera #{self.index} {self.width}x{self.height}@{self.fps:.0f} {self.fourcc or '?'}"
+
+    def is_opened(self) -> bool:
+        # thread-ul de citire se oprește doar când camera nu mai dă cadre (deconectată)
+        if self.threaded and self._thread is not None and self._stop.is_set():
+            return False
+        return self._cap is not None and self._cap.isOpened()
+
+    def _reader(self):
+        while not self._stop.is_set():
+            ok, img = self._cap.read()
+            ts = time.time()
+            if not ok:
+                with self._cond:
+                    self._latest = None
+                    self._stop.set()
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                if self._latest is not None and self._latest.seq > self._returned_seq:
+                    self.dropped += 1
+                self._latest = self._next(img, ts)
+                self._cond.notify_all()
+
+    def read(self) -> Optional[Frame]:
+        if self._cap is None:
+            return None
+        if not self.threaded:
+            ok, img = self._cap.read()
+            return self._next(img) if ok else None
+        with self._cond:
+            # așteaptă un cadru mai nou decât ultimul returnat
+            self._cond.wait_for(
+                lambda: self._stop.is_set() or (self._latest is not None and self._latest.seq > self._returned_seq),
+                timeout=self.read_timeout,
+            )
+            fr = self._latest
+            if fr is None or fr.seq <= self._returned_seq:
+                return None
+            self._returned_seq = fr.seq
+            return fr
+
+    def release(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=1.5)
+            self._thread = None
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+
+class VideoFileSource(FrameSource):
+    """Fișier video; `realtime=True` redă la FPS-ul fișierului, altfel cât de repede se poate."""
+
+    name = "file"
+
+    def __init__(self, path: str, realtime: bool = False, loop: bool = False):
+        super().__init__()
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self._cap = None
+        self._t0 = 0.0
+
+    def open(self) -> bool:
+        self._cap = cv2.VideoCapture(self.path)
+        if not self._cap.isOpened():
+            self._cap = None
+            return False
+        self.width = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = float(self._cap.get(cv2.CAP_PROP_FPS) or 30.0)
+        self._t0 = time.time()
+        return True
+
+    def describe(self) -> str:
+        return f"file {self.path} {self.width}x{self.height}@{self.fps:.0f}"
+
+    def is_opened(self) -> bool:
+        return self._cap is not None
+
+    def read(self) -> Optional[Frame]:
+        if self._cap is None:
+            return None
+        ok, img = self._cap.read()
+        if not ok and self.loop:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self._t0 = time.time()
+            ok, img = self._cap.read()
+        if not ok:
+            self.release()  # sfârșitul fișierului
+            return None
+        media_t = self._cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        if self.realtime:
+            delay = self._t0 + media_t - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            return self._next(img)
+        # timp media (determinist) ancorat la momentul deschiderii
+        return self._next(img, self._t0 + media_t)
+
+    def release(self):
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+
+def moving_dot(seq: int, t: float, width: int, height: int) -> np.ndarray:
+    """Generator implicit: fundal gri + un disc care se mișcă (mișcare previzibilă)."""
+    img = np.full((height, width, 3), 96, dtype=np.uint8)
+    x = int((0.5 + 0.4 * np.sin(t * 1.3)) * width)
+    y = int((0.5 + 0.3 * np.cos(t * 0.9)) * height)
+    cv2.circle(img, (x, y), max(4, height // 12), (40, 180, 240), -1)
+    return img
+
+
+class SyntheticSource(FrameSource):
+    """Cadre generate (fără cameră); `realtime=False` = cât de repede se poate (benchmark/soak)."""
+
+    name = "synthetic"
+
+    def __init__(self, width: int = 1280, height: int = 720, fps: float = 30.0,
+                 generator: Optional[Callable[[int, float, int, int], np.ndarray]] = None,
+                 realtime: bool = True, max_frames: Optional[int] = None):
+        super().__init__()
+        self.width, self.height, self.fps = int(width), int(height), float(fps)
+        self.generator = generator or moving_dot
+        self.realtime = realtime
+        self.max_frames = max_frames
+        self._opened = False
+        self._t0 = 0.0
+
+    def open(self) -> bool:
+        self._opened = True
+        self._seq = 0
+        self._t0 = time.time()
+        return True
+
+    def is_opened(self) -> bool:
+        return self._opened
+
+    def read(self) -> Optional[Frame]:
+        if not self._opened:
+            return None
+        if self.max_frames is not None and self._seq >= self.max_frames:
+            self._opened = False
+            return None
+        t = self._seq / self.fps
+        if self.realtime:
+            delay = self._t0 + t - time.time()
+            if delay > 0:
+                time.sleep(delay)
+        img = self.generator(self._seq + 1, t, self.width, self.height)
+        return self._next(img, time.time() if self.realtime else self._t0 + t)
+
+    def release(self):
+        self._opened = False
+
+
+def open_source(spec="0", realtime: Optional[bool] = None, **kwargs) -> Optional[FrameSource]:
+    """'0'/'1' -> cameră, 'synthetic' -> generator, altfel cale către fișier video.
+    Prefixul 'stamp:' (ex. 'stamp:synthetic') marchează cadrele pentru măsurarea latenței.
+    `realtime` se aplică fișierelor / generatorului (camera e mereu în timp real)."""
+    spec = str(spec if spec is not None else "0").strip()
+    if spec.lower().startswith("stamp:"):
+        from latency_probe import StampedSource
+        # latența se măsoară față de ceasul de perete: sursa interioară rulează mereu în timp real
+        inner = open_source(spec[len("stamp:"):], True, **kwargs)
+        src = StampedSource(inner) if inner is not None else None
+        return src if src is not None and src.open() else None
+    if spec.isdigit():
+        src = CameraSource(int(spec), **kwargs)
+    else:
+        if realtime is not None:
+            kwargs["realtime"] = realtime
+        if spec.lower() in ("synthetic", "synth", "test"):
+            src = SyntheticSource(**kwargs)
+        else:
+            src = VideoFileSource(spec, **kwargs)
+    return src if src.open() else None
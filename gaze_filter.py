@@ -0,0 +1,176 @@
+"""
+Filtru adaptiv + predictiv pentru gaze (One-Euro, cu extrapolare pe latență).
+
+- în fixație (viteză mică) cutoff-ul scade -> semnal stabil, fără jitter;
+- în mișcări rapide (sacade) cutoff-ul crește -> lag mic;
+- în urmăriri lente (smooth pursuit) ieșirea e extrapolată pe durata întârzierii
+  măsurate (captură -> ieșirea percepției) + lag-ul filtrului, cu viteza din
+  regresia liniară pe ultimele `pursuit_window` s. Sacadele (mai scurte decât
+  latența) nu sunt extrapolate: golesc fereastra. Câștigul predicției crește doar
+  când mișcarea e lentă dar consistentă (R² mare) și se schimbă lin, ca în
+  fixație jitter-ul să nu crească (vezi `bench_gaze.py`).
+"""
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+@dataclass
+class GazeFilterConfig:
+    min_cutoff: float = 1.0     # Hz, cutoff în repaus (mai mic = mai stabil)
+    beta: float = 4.0           # cât crește cutoff-ul cu viteza (mai mare = mai reactiv)
+    d_cutoff: float = 1.0       # Hz, cutoff pentru estimarea vitezei
+    predict: bool = True        # extrapolează înainte cu latența măsurată
+    extra_latency: float = 0.0  # s, latență adăugată după percepție (render/afișare)
+    max_lead: float = 0.12      # s, limită pentru extrapolarea pe latență
+    pursuit_window: float = 0.6  # s, fereastra regresiei pentru viteza de urmărire
+    predict_speed: float = 0.25  # unități/s; sub ~această viteză (fixație) nu se extrapolează
+    saccade_speed: float = 2.0  # unități/s (viteza One-Euro); peste = sacadă, fereastra se golește
+    min_r2: float = 0.85        # cât de liniară trebuie să fie mișcarea din fereastră
+    gain_tau: float = 0.3       # s, constanta de timp a câștigului predicției
+    delay_alpha: float = 0.1    # EMA pentru întârzierea măsurată
+
+
+class _LowPass:
+    def __init__(self):
+        self.y: Optional[float] = None
+
+    def __call__(self, x: float, alpha: float) -> float:
+        self.y = x if self.y is None else self.y + alpha * (x - self.y)
+        return self.y
+
+
+class OneEuroFilter:
+    """One-Euro pe o singură axă; `t` în secunde (timestamp real al cadrului)."""
+
+    def __init__(self, min_cutoff=1.0, beta=4.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self._x = _LowPass()
+        self._dx = _LowPass()
+        self._t: Optional[float] = None
+        self.velocity = 0.0
+        self.cutoff = min_cutoff  # ultimul cutoff folosit (lag-ul filtrului ≈ 1 / (2π·cutoff))
+
+    @staticmethod
+    def _alpha(cutoff: float, dt: float) -> float:
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def reset(self):
+        self._x = _LowPass()
+        self._dx = _LowPass()
+        self._t = None
+        self.velocity = 0.0
+        self.cutoff = self.min_cutoff
+
+    def __call__(self, x: float, t: float) -> float:
+        if self._t is None:
+            self._t = t
+            return self._x(x, 1.0)
+        dt = t - self._t
+        if dt <= 0.0:
+            return self._x.y  # timestamp duplicat / neordonat
+        self._t = t
+        prev = self._x.y
+        dx = (x - prev) / dt
+        self.velocity = self._dx(dx, self._alpha(self.d_cutoff, dt))
+        self.cutoff = self.min_cutoff + self.beta * abs(self.velocity)
+        return self._x(x, self._alpha(self.cutoff, dt))
+
+
+def _clamp(v: float) -> float:
+    return max(-1.0, min(1.0, v))
+
+
+class GazeFilter:
+    """Filtru 2D pentru gaze_offset (-1..1, -1..1)."""
+
+    def __init__(self, config: Optional[GazeFilterConfig] = None):
+        self.config = config or GazeFilterConfig()
+        self._fx = OneEuroFilter()
+        self._fy = OneEuroFilter()
+        self.delay = 0.0  # s, întârzierea medie captură -> ieșire
+        self._hist: deque = deque()  # (t, x, y) ieșirea filtrului de la ultima sacadă
+        self._t_reset = -math.inf
+        self.gain = 0.0              # câștigul curent al predicției (0..1)
+        self.configure(self.config)
+
+    def configure(self, config: GazeFilterConfig):
+        self.config = config
+        for f in (self._fx, self._fy):
+            f.min_cutoff = config.min_cutoff
+            f.beta = config.beta
+            f.d_cutoff = config.d_cutoff
+
+    def reset(self):
+        self._fx.reset()
+        self._fy.reset()
+        self.delay = 0.0
+        self._hist.clear()
+        self._t_reset = -math.inf
+        self.gain = 0.0
+
+    def observe_delay(self, delay: float):
+        if delay < 0:
+            return
+        a = self.config.delay_alpha
+        self.delay = delay if self.delay == 0.0 else self.delay + a * (delay - self.delay)
+
+    @property
+    def lead(self) -> float:
+        c = self.config
+        return min(c.max_lead, self.delay + c.extra_latency) if c.predict else 0.0
+
+    def _pursuit(self) -> Tuple[float, float, float]:
+        """(vx, vy, R²) din regresia liniară a ieșirii filtrate pe fereastra curentă."""
+        h = self._hist
+        n = len(h)
+        mt = sum(p[0] for p in h) / n
+        mx = sum(p[1] for p in h) / n
+        my = sum(p[2] for p in h) / n
+        stt = sum((p[0] - mt) ** 2 for p in h)
+        if stt <= 0.0:
+            return 0.0, 0.0, 0.0
+        vx = sum((p[0] - mt) * (p[1] - mx) for p in h) / stt
+        vy = sum((p[0] - mt) * (p[2] - my) for p in h) / stt
+        ss = sum((p[1] - mx) ** 2 + (p[2] - my) ** 2 for p in h)
+        res = sum((p[1] - mx - vx * (p[0] - mt)) ** 2 + (p[2] - my - vy * (p[0] - mt)) ** 2 for p in h)
+        return vx, vy, (1.0 - res / ss) if ss > 0.0 else 0.0
+
+    def update(self, gaze: Tuple[float, float], t: float) -> Tuple[float, float]:
+        c = self.config
+        prev_t = self._fx._t
+        gx = self._fx(gaze[0], t)
+        gy = self._fy(gaze[1], t)
+        lead = self.lead
+        if lead <= 0.0:
+            return (_clamp(gx), _clamp(gy))
+        # sacadă: se termină înainte ca latența să poată fi recuperată -> fereastra de la zero
+        if math.hypot(self._fx.velocity, self._fy.velocity) > c.saccade_speed:
+            self._hist.clear()
+            self._t_reset = t
+            self.gain = 0.0
+        h = self._hist
+        h.append((t, gx, gy))
+        while t - h[0][0] > c.pursuit_window:
+            h.popleft()
+        target, vx, vy = 0.0, 0.0, 0.0
+        if len(h) >= 5 and t - self._t_reset >= 0.5 * c.pursuit_window:
+            vx, vy, r2 = self._pursuit()
+            # în fixație viteza din regresie e doar zgomot, iar mișcarea trebuie să fie liniară
+            v0 = max(1e-6, c.predict_speed)
+            target = (min(1.0, max(0.0, math.hypot(vx, vy) / v0 - 1.0))
+                      * min(1.0, max(0.0, 2.0 * (r2 - c.min_r2) / max(1e-6, 1.0 - c.min_r2))))
+        # câștigul se schimbă lin: comutarea bruscă a extrapolării ar apărea ca jitter
+        dt = t - prev_t if prev_t is not None and t > prev_t else 0.0
+        self.gain += (target - self.gain) * (1.0 - math.exp(-dt / max(1e-6, c.gain_tau)))
+        if self.gain > 0.0:
+            # + lag-ul One-Euro la viteza curentă (pe o rampă ieșirea rămâne în urmă cu ~τ)
+            cutoff = c.min_cutoff + c.beta * math.hypot(self._fx.velocity, self._fy.velocity)
+            lead += 1.0 / (2.0 * math.pi * cutoff)
+            gx += vx * lead * self.gain
+            gy += vy * lead * self.gain
+        return (_clamp(gx), _clamp(gy))
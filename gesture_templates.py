@@ -0,0 +1,255 @@
+"""
+Bibliotecă de gesturi pe bază de șabloane (template matching vectorizat).
+
+Fiecare gest e un set de 21 de landmark-uri normalizat:
+    - translație: centrat pe centroid
+    - scară: norma Frobenius = 1
+    - rotație: axa încheietură -> MCP deget mijlociu aliniată în sus
+și, ca să meargă pentru ambele mâini, fiecare șablon e stocat și în oglindă.
+Clasificarea e o singură operație matriceală (distanțe față de toate
+șabloanele deodată), deci costul rămâne practic constant cu zeci de gesturi.
+Șabloane noi se pot înregistra din camera live (`TemplateRecorder`) și sunt
+salvate separat (.npz) față de cele implicite.
+"""
+import os
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+WRIST, MIDDLE_MCP = 0, 9
+N_POINTS = 21
+
+
+def normalize(pts: np.ndarray) -> np.ndarray:
+    """(..., 21, 2) -> (..., 42) invariant la translație, scară și rotație."""
+    p = np.asarray(pts, dtype=np.float32)
+    p = p - p.mean(axis=-2, keepdims=True)
+    axis = p[..., MIDDLE_MCP, :] - p[..., WRIST, :]
+    ang = np.arctan2(axis[..., 0], -axis[..., 1])  # unghiul față de "în sus" (0, -1)
+    c, s = np.cos(ang)[..., None], np.sin(ang)[..., None]
+    x, y = p[..., 0], p[..., 1]
+    rot = np.stack((x * c + y * s, -x * s + y * c), axis=-1)
+    flat = rot.reshape(rot.shape[:-2] + (N_POINTS * 2,))
+    norm = np.linalg.norm(flat, axis=-1, keepdims=True)
+    return flat / np.maximum(norm, 1e-6)
+
+
+def mirror(pts: np.ndarray) -> np.ndarray:
+    p = np.array(pts, dtype=np.float32)
+    p[..., 0] *= -1.0
+    return p
+
+
+# ---------- șabloane implicite (schelet sintetic, palma spre cameră, y în jos) ----------
+_MCP = {1: (0.30, -0.20), 5: (0.32, -0.95), 9: (0.0, -1.0), 13: (-0.28, -0.95), 17: (-0.52, -0.82)}
+_LEN = {1: (0.28, 0.26, 0.24), 5: (0.40, 0.25, 0.22), 9: (0.45, 0.28, 0.24),
+        13: (0.42, 0.26, 0.22), 17: (0.32, 0.20, 0.18)}
+_DIR = {1: (0.62, -0.78), 5: (0.12, -1.0), 9: (0.0, -1.0), 13: (-0.12, -1.0), 17: (-0.25, -1.0)}
+
+
+def _finger(base: int, state: str, spread: float = 0.0) -> List[Tuple[float, float]]:
+    m = np.array(_MCP[base])
+    d = np.array(_DIR[base]) + (spread, 0.0)
+    d = d / np.linalg.norm(d)
+    l1, l2, l3 = _LEN[base]
+    if base == 1:  # degetul mare: CMC, MCP, IP, TIP
+        if state == "ext":
+            j1 = m + d * l1; j2 = j1 + d * l2; j3 = j2 + d * l3
+        else:  # pliat peste palmă
+            j1 = m + d * l1; j2 = j1 + np.array((-0.22, -0.12)); j3 = j2 + np.array((-0.22, -0.02))
+        return [tuple(m), tuple(j1), tuple(j2), tuple(j3)]
+    if state == "ext":
+        j1 = m + d * l1; j2 = j1 + d * l2; j3 = j2 + d * l3
+    elif state == "half":  # curbat (OK / cerc)
+        j1 = m + d * l1 * 0.9
+        j2 = j1 + np.array((0.20, 0.10)) * np.sign(_MCP[base][0] + 1e-3)
+        j3 = j2 + np.array((0.10, 0.18))
+    else:  # pliat (pumn)
+        j1 = m + d * l1 * 0.55; j2 = m + d * l1 * 0.25 + (0.0, 0.08); j3 = m + (0.0, 0.16)
+    return [tuple(m), tuple(j1), tuple(j2), tuple(j3)]
+
+
+def synth_hand(thumb="fold", index="fold", middle="fold", ring="fold", pinky="fold",
+               spread: float = 0.0) -> np.ndarray:
+    pts = [(0.0, 0.0)]
+    pts += _finger(1, thumb)
+    pts += _finger(5, index, spread)
+    pts += _finger(9, middle)
+    pts += _finger(13, ring, -spread * 0.5)
+    pts += _finger(17, pinky, -spread)
+    return np.array(pts, dtype=np.float32)
+
+
+def _ok_hand() -> np.ndarray:
+    p = synth_hand("ext", "half", "ext", "ext", "ext")
+    # vârful degetului mare atinge vârful arătătorului
+    p[4] = p[8] = (p[4] + p[8]) * 0.5
+    return p
+
+
+def default_templates() -> Dict[str, List[np.ndarray]]:
+    return {
+        "stop_palm": [synth_hand("ext", "ext", "ext", "ext", "ext")],
+        "fist": [synth_hand()],
+        "point": [synth_hand(index="ext")],
+        "peace": [synth_hand(index="ext", middle="ext", spread=0.25)],
+        "thumbs_up": [synth_hand(thumb="ext")],
+        "ok": [_ok_hand()],
+        "rock": [synth_hand(index="ext", pinky="ext")],
+        "call_me": [synth_hand(thumb="ext", pinky="ext")],
+    }
+
+
+class GestureLibrary:
+    """Șabloane normalizate într-o singură matrice (K, 42) + numele lor."""
+
+    def __init__(self, threshold: float = 0.30):
+        self.threshold = threshold  # distanța euclidiană maximă (vectori de normă 1)
+        self.names: List[str] = []
+        self._rows: List[np.ndarray] = []
+        self._matrix = np.zeros((0, N_POINTS * 2), dtype=np.float32)
+        self._sq = np.zeros(0, dtype=np.float32)
+        self._row_names: List[str] = []
+        self._custom: List[bool] = []  # rânduri înregistrate de utilizator (se salvează)
+
+    @classmethod
+    def default(cls, path: Optional[str] = None, **kw) -> "GestureLibrary":
+        lib = cls(**kw)
+        for name, samples in default_templates().items():
+            for pts in samples:
+                lib.add(name, pts, rebuild=False)
+        if path and os.path.exists(path):
+            lib.load(path, rebuild=False)
+        lib.rebuild()
+        return lib
+
+    def add(self, name: str, pts: np.ndarray, rebuild: bool = True, with_mirror: bool = True,
+            custom: bool = False):
+        """Adaugă un șablon din landmark-uri brute (pixeli sau normalizate, 21x2)."""
+        pts = np.asarray(pts, dtype=np.float32).reshape(N_POINTS, 2)
+        variants = [pts, mirror(pts)] if with_mirror else [pts]
+        for v in variants:
+            self._row_names.append(name)
+            self._rows.append(normalize(v))
+            self._custom.append(custom)
+        if rebuild:
+            self.rebuild()
+
+    def remove(self, name: str):
+        keep = [i for i, n in enumerate(self._row_names) if n != name]
+        self._row_names = [self._row_names[i] for i in keep]
+        self._rows = [self._rows[i] for i in keep]
+        self._custom = [self._custom[i] for i in keep]
+        self.rebuild()
+
+    def rebuild(self):
+        """Reface matricea după `add(..., rebuild=False)` / `load(..., rebuild=False)` în lot."""
+        self.names = sorted(set(self._row_names))
+        if self._rows:
+            self._matrix = np.stack(self._rows).astype(np.float32)
+        else:
+            self._matrix = np.zeros((0, N_POINTS * 2), dtype=np.float32)
+        self._sq = (self._matrix ** 2).sum(axis=1)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def rows(self) -> int:
+        """Rânduri-șablon în matrice (variante + oglinzi), nu gesturi distincte."""
+        return len(self._matrix)
+
+    # ---------- clasificare ----------
+    def distances(self, hands: np.ndarray) -> np.ndarray:
+        """(H, 21, 2) -> (H, K) distanțe față de toate rândurile-șablon, un singur GEMM."""
+        x = normalize(hands)
+        d2 = (x ** 2).sum(axis=1, keepdims=True) + self._sq[None, :] - 2.0 * x @ self._matrix.T
+        return np.sqrt(np.maximum(d2, 0.0))
+
+    def classify_many(self, hands: np.ndarray) -> List[Tuple[str, float]]:
+        if not len(self._matrix) or not len(hands):
+            return [("", float("inf"))] * len(hands)
+        d = self.distances(hands)
+        best = d.argmin(axis=1)
+        out = []
+        for h, k in enumerate(best):
+            dist = float(d[h, k])
+            out.append((self._row_names[k] if dist <= self.threshold else "", dist))
+        return out
+
+    def classify(self, pts: np.ndarray) -> Tuple[str, float]:
+        """Un singur set 21x2 -> (nume gest sau "", distanță)."""
+        return self.classify_many(np.asarray(pts, dtype=np.float32)[None])[0]
+
+    # ---------- persistență ----------
+    def save(self, path: str):
+        """Salvează doar șabloanele înregistrate de utilizator (cele implicite se regenerează)."""
+        rows = [(n, r) for n, r, c in zip(self._row_names, self._rows, self._custom) if c]
+        names = np.array([n for n, _ in rows], dtype=np.str_)
+        data = np.stack([r for _, r in rows]) if rows else np.zeros((0, N_POINTS * 2), np.float32)
+        np.savez_compressed(path, names=names, data=data)
+
+    def load(self, path: str, rebuild: bool = True):
+        with np.load(path, allow_pickle=False) as z:
+            for name, row in zip(z["names"], z["data"]):
+                self._row_names.append(str(name))
+                self._rows.append(row.astype(np.float32))  # deja normalizat (+ oglindă salvată)
+                self._custom.append(True)
+        if rebuild:
+            self.rebuild()
+
+
+class TemplateRecorder:
+    """Strânge N cadre cu mâna vizibilă și le mediază într-un șablon."""
+
+    def __init__(self, name: str, frames: int = 20):
+        self.name = name
+        self.frames = frames
+        self._samples: List[np.ndarray] = []
+
+    @property
+    def done(self) -> bool:
+        return len(self._samples) >= self.frames
+
+    def feed(self, hand_pts: Optional[np.ndarray]) -> bool:
+        if hand_pts is not None and not self.done:
+            self._samples.append(normalize(hand_pts).reshape(N_POINTS, 2))
+        return self.done
+
+    def template(self) -> Optional[np.ndarray]:
+        if not self._samples:
+            return None
+        return np.mean(self._samples, axis=0)
+
+
+class WaveTracker:
+    """'wave' = palmă deschisă + oscilații laterale ale centrului mâinii (≥2 schimbări de sens)."""
+
+    def __init__(self, window: float = 1.2, min_swing: float = 0.25, reversals: int = 2):
+        self.window = window
+        self.min_swing = min_swing  # amplitudine minimă, raportată la mărimea palmei
+        self.reversals = reversals
+        self._hist = deque()
+
+    def update(self, ts: float, cx: float, palm: float, open_palm: bool) -> bool:
+        if not open_palm:
+            self._hist.clear()
+            return False
+        self._hist.append((ts, cx))
+        while self._hist and ts - self._hist[0][0] > self.window:
+            self._hist.popleft()
+        xs = np.array([x for _, x in self._hist], dtype=np.float32)
+        if len(xs) < 4:
+            return False
+        thr = self.min_swing * max(palm, 1.0)
+        count, direction, anchor = 0, 0, xs[0]
+        for x in xs[1:]:
+            step = x - anchor
+            if abs(step) < thr:
+                continue
+            d = 1 if step > 0 else -1
+            if direction and d != direction:
+                count += 1
+            direction, anchor = d, x
+        return count >= self.reversals
@@ -1,21 +1,25 @@
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 import math
+import time
 import numpy as np
 
 import cv2
-import mediapipe as mp
+try:
+    import mediapipe as mp
+    mp_hands = mp.solutions.hands
+    mp_face_mesh = mp.solutions.face_mesh
+except Exception:
+    # fără MediaPipe: doar analiza pe landmark-uri (replay / benchmark), fără inferență
+    mp = mp_hands = mp_face_mesh = None
 import theme  # paleta de culori (BGR) + accent
-
-mp_hands = mp.solutions.hands
-mp_face_mesh = mp.solutions.face_mesh
-mp_drawing = mp.solutions.drawing_utils
-
-# drawing_styles nu există în toate versiunile MediaPipe — fallback la stiluri implicite
-if hasattr(mp.solutions, "drawing_styles"):
-    mp_styles = mp.solutions.drawing_styles
-else:
-    mp_styles = None
+from landmark_render import LandmarkRenderer, LOD_FULL, LOD_NONE
+from gaze_filter import GazeFilter, GazeFilterConfig
+from gesture_templates import GestureLibrary, WaveTracker
+from frame_pool import FramePool
+from face_tracker import FaceTracker, boxes, face_metrics, primary_index
+from motion_gate import MotionGate
+from text_render import emoji, measure, put_text
 
 
 @dataclass
@@ -23,6 +27,8 @@ class HandState:
     ok_gesture: bool = False
     thumbs_up: bool = False
     hand_center: Tuple[int, int] = (0, 0)
+    gesture: str = ""          # gestul din biblioteca de șabloane ("peace", "stop_palm", "wave", ...)
+    gesture_dist: float = 0.0  # distanța față de șablon (mai mic = mai sigur)
 
 
 @dataclass
@@ -31,175 +37,316 @@ class FaceState:
     eyebrow_raise: bool = False
     mouth_center: Tuple[int, int] = (0, 0)
     gaze_offset: Tuple[float, float] = (0.0, 0.0)  # (-1..1, -1..1)
+    smile_ratio: float = 0.0  # lățime / înălțime gură (zâmbet > 1.8)
+    brow_gap: float = 0.0     # distanța maximă sprânceană-ochi (px)
+    face_id: int = 0          # ID stabil între cadre (FaceTracker)
+    mouth_open: float = 0.0   # deschiderea buzelor / lățimea gurii (vorbit = variază rapid)
+
+
+# ---------- profile: ce modele + ce detecții rulează ----------
+FEAT_OK = "ok"
+FEAT_THUMBS_UP = "thumbs_up"
+FEAT_SMILE = "smile"
+FEAT_EYEBROW = "eyebrow"
+FEAT_GAZE = "gaze"
+FEAT_GESTURE = "gesture"  # clasificare pe șabloane (GestureLibrary)
+HAND_FEATURES = frozenset({FEAT_OK, FEAT_THUMBS_UP, FEAT_GESTURE})
+FACE_FEATURES = frozenset({FEAT_SMILE, FEAT_EYEBROW, FEAT_GAZE})
+ALL_FEATURES = HAND_FEATURES | FACE_FEATURES
+
+
+@dataclass(frozen=True)
+class PerceptionProfile:
+    name: str
+    hands: bool                  # modelul Hands
+    face: bool                   # modelul FaceMesh
+    refine: bool                 # refine_landmarks (iris) — necesar doar pt. gaze
+    features: FrozenSet[str]     # detecțiile calculate
+
+    def describe(self) -> str:
+        models = "+".join(m for m, on in (("hands", self.hands), ("face", self.face)) if on) or "no models"
+        if self.face and self.refine:
+            models += "(iris)"
+        return f"{self.name}: {models} [{', '.join(sorted(self.features)) or '-'}]"
+
+
+PROFILES: Dict[str, PerceptionProfile] = {
+    "full": PerceptionProfile("full", True, True, True, ALL_FEATURES),
+    "gaze-only": PerceptionProfile("gaze-only", False, True, True, frozenset({FEAT_GAZE})),
+    "gestures-only": PerceptionProfile("gestures-only", True, False, False, HAND_FEATURES),
+    "minimal": PerceptionProfile("minimal", False, True, False, frozenset({FEAT_SMILE, FEAT_EYEBROW})),
+    "off": PerceptionProfile("off", False, False, False, frozenset()),
+}
+
+
+def profile_for(features: Iterable[str]) -> PerceptionProfile:
+    """Cel mai ieftin profil care acoperă exact detecțiile cerute."""
+    feats = frozenset(features) & ALL_FEATURES
+    for p in PROFILES.values():
+        if p.features == feats:
+            return p
+    return PerceptionProfile(
+        "auto", bool(feats & HAND_FEATURES), bool(feats & FACE_FEATURES), FEAT_GAZE in feats, feats
+    )
 
 
 class Perception:
-    def __init__(self):
-        self.hands = mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-        )
-        self.face = mp_face_mesh.FaceMesh(
-            static_image_mode=False,
-            max_num_faces=1,
-            refine_landmarks=True,  # necesar pt. iris/gaze
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5,
-        )
-        # smoothing pentru gaze (mai natural)
-        self.gaze_ema = (0.0, 0.0)
-        self.gaze_alpha = 0.35
+    def __init__(self, lod: str = LOD_FULL, gaze_config: Optional[GazeFilterConfig] = None,
+                 load_models: bool = True, profile: Union[str, PerceptionProfile] = "full",
+                 gesture_templates: Optional[str] = None, motion_gate: bool = True,
+                 max_faces: int = 1):
+        # sare peste inferență pe scene statice (refolosește landmark-urile/stările anterioare)
+        self.motion_gate: Optional[MotionGate] = MotionGate() if motion_gate else None
+        self._last_states: Optional[Tuple[Optional[HandState], Optional[FaceState]]] = None
+        self.hands = self.face = None
+        self._face_refine = None
+        self._face_max = None
+        self.max_faces = max(1, int(max_faces))
+        self.load_models = load_models
+        self.profile = PROFILES["full"]
+        # consumatori (GUI, avatar, feedback vocal, subscriberi) -> detecțiile de care au nevoie
+        self._consumers: Dict[str, FrozenSet[str]] = {}
+        self.auto_profile = False
+        self.set_profile(profile)
+        # gesturi pe șabloane (implicite + cele înregistrate în `gesture_templates` .npz)
+        self.gesture_templates_path = gesture_templates
+        self.gesture_lib = GestureLibrary.default(gesture_templates)
+        self._wave = WaveTracker()
+        # smoothing adaptiv + predictiv pentru gaze (One-Euro, pe timestamp-uri reale), câte unul per față
+        self.gaze_config = gaze_config or GazeFilterConfig()
+        self.gaze_filter = GazeFilter(self.gaze_config)  # al feței principale
+        self._gaze_filters: Dict[int, GazeFilter] = {}
+        self.gaze_smoothed = (0.0, 0.0)
+        # mai multe fețe: ID-uri stabile între cadre (IoU pe bounding box-uri)
+        self.face_tracker = FaceTracker()
+        self.face_states: List[FaceState] = []
+        # landmark-uri ultimului cadru (pixeli, float32) — desenarea e separată de inferență
+        self.renderer = LandmarkRenderer(lod)
+        self.last_hand_pts: Optional[np.ndarray] = None   # (21, 2)
+        self.last_face_pts: Optional[np.ndarray] = None   # (468|478, 2) — fața principală
+        self.last_faces_pts: Optional[np.ndarray] = None  # (F, 468|478, 2) — toate fețele
+        self.face_ids: List[int] = []
+        # scalarea cadrului dat modelelor (<1.0 = inferență mai ieftină; landmark-urile sunt normalizate)
+        self.infer_scale = 1.0
+        self.pool = FramePool()  # buffere refolosite pentru resize / BGR->RGB
+
+    def set_lod(self, lod: str):
+        self.renderer.set_lod(lod)
+
+    def add_gesture_template(self, name: str, pts: np.ndarray):
+        """Adaugă un șablon de gest (ex. înregistrat din cameră) și îl salvează pe disc."""
+        self.gesture_lib.add(name, pts, custom=True)
+        if self.gesture_templates_path:
+            self.gesture_lib.save(self.gesture_templates_path)
+
+    # ---------- profile ----------
+    def set_profile(self, profile: Union[str, PerceptionProfile]) -> PerceptionProfile:
+        """Schimbă profilul la runtime (fără restart cameră); 'auto' = din consumatorii activi."""
+        if isinstance(profile, str):
+            self.auto_profile = profile == "auto"
+            profile = self._auto() if self.auto_profile else PROFILES.get(profile, PROFILES["full"])
+        else:
+            self.auto_profile = False
+        self.profile = profile
+        self._apply_models()
+        return profile
+
+    def set_consumer(self, name: str, features: Optional[Iterable[str]]) -> PerceptionProfile:
+        """Înregistrează (sau șterge, cu None) detecțiile folosite de un consumator."""
+        if features is None:
+            self._consumers.pop(name, None)
+        else:
+            self._consumers[name] = frozenset(features)
+        if self.auto_profile:
+            self.profile = self._auto()
+            self._apply_models()
+        return self.profile
+
+    def set_max_faces(self, n: int):
+        """Numărul maxim de fețe urmărite (recreează FaceMesh la nevoie)."""
+        self.max_faces = max(1, int(n))
+        self._apply_models()
+
+    def _auto(self) -> PerceptionProfile:
+        needed = frozenset().union(*self._consumers.values()) if self._consumers else frozenset()
+        return profile_for(needed)
+
+    def _apply_models(self):
+        """Creează/închide modelele MediaPipe după profil (lazy)."""
+        if self.motion_gate is not None:
+            self.motion_gate.reset()  # modele noi -> inferență la următorul cadru
+        if not self.load_models:
+            return
+        p = self.profile
+        if p.hands and self.hands is None:
+            self.hands = mp_hands.Hands(
+                static_image_mode=False,
+                max_num_hands=2,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5,
+            )
+        elif not p.hands and self.hands is not None:
+            self.hands.close()
+            self.hands = None
+        if self.face is not None and (not p.face or self._face_refine != p.refine
+                                      or self._face_max != self.max_faces):
+            self.face.close()
+            self.face = None
+        if p.face and self.face is None:
+            self.face = mp_face_mesh.FaceMesh(
+                static_image_mode=False,
+                max_num_faces=self.max_faces,
+                refine_landmarks=p.refine,  # necesar pt. iris/gaze
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5,
+            )
+            self._face_refine = p.refine
+            self._face_max = self.max_faces
 
     # ---------- helpers ----------
     @staticmethod
     def _norm_dist(p1, p2):
         return math.hypot(p1[0] - p2[0], p1[1] - p2[1])
 
-    def _detect_ok(self, pts):
-        # deget mare (4) atinge arătător (8), raportat la lățimea palmei
-        thumb_tip = pts[4]
-        index_tip = pts[8]
-        wrist = pts[0]
-        middle_mcp = pts[9]
-        palm = max(1, self._norm_dist(wrist, middle_mcp))
-        ok_distance = self._norm_dist(thumb_tip, index_tip) / palm
-        return ok_distance < 0.5
-
-    def _detect_thumbs_up(self, pts):
-        # 👍: policul sus, restul degetelor îndoite
-        thumb_tip = pts[4]; thumb_mcp = pts[2]
-        index_tip, index_pip = pts[8], pts[6]
-        middle_tip, middle_pip = pts[12], pts[10]
-        ring_tip, ring_pip = pts[16], pts[14]
-        pinky_tip, pinky_pip = pts[20], pts[18]
-
-        thumb_up = thumb_tip[1] < thumb_mcp[1] - 6
-        index_folded = index_tip[1] > index_pip[1]
-        middle_folded = middle_tip[1] > middle_pip[1]
-        ring_folded = ring_tip[1] > ring_pip[1]
-        pinky_folded = pinky_tip[1] > pinky_pip[1]
-        return thumb_up and index_folded and middle_folded and ring_folded and pinky_folded
-
-    def _detect_smile(self, lm, w, h):
-        def pt(i): return (int(lm[i].x * w), int(lm[i].y * h))
-        left_mouth = pt(61); right_mouth = pt(291)
-        upper_lip = pt(13); lower_lip = pt(14)
-        width = self._norm_dist(left_mouth, right_mouth)
-        height = self._norm_dist(upper_lip, lower_lip)
-        ratio = width / max(1.0, height)
-        smiling = ratio > 1.8
-        center = (int((left_mouth[0] + right_mouth[0]) / 2),
-                  int((upper_lip[1] + lower_lip[1]) / 2))
-        return smiling, center
-
-    def _detect_eyebrow_raise(self, lm, w, h):
-        def pt(i): return (int(lm[i].x * w), int(lm[i].y * h))
-        left_eye_center_y = (pt(33)[1] + pt(133)[1]) / 2.0
-        right_eye_center_y = (pt(263)[1] + pt(362)[1]) / 2.0
-        left_brow_y = pt(105)[1]
-        right_brow_y = pt(334)[1]
-        left_gap = max(1.0, left_eye_center_y - left_brow_y)
-        right_gap = max(1.0, right_eye_center_y - right_brow_y)
-        asymmetry = left_gap / right_gap if right_gap > 0 else 1.0
-        asymmetry_inv = right_gap / left_gap if left_gap > 0 else 1.0
-        eyebrow_raise = (asymmetry > 1.2 and left_gap > 8) or (asymmetry_inv > 1.2 and right_gap > 8)
-        return eyebrow_raise
-
-    def _detect_gaze(self, lm, w, h):
-        # calculează offset (-1..1) pentru privire, medie între ochi
-        try:
-            def pt(i): return (lm[i].x * w, lm[i].y * h)
-            # ochi stâng
-            lx0, ly0 = pt(33); lx1, ly1 = pt(133)
-            lcx = (lx0 + lx1) / 2.0; lcy = (ly0 + ly1) / 2.0
-            lix = np.mean([pt(i)[0] for i in [468, 469, 470, 471, 472]])
-            liy = np.mean([pt(i)[1] for i in [468, 469, 470, 471, 472]])
-            lw = abs(lx1 - lx0) + 1e-5
-            lh = abs(ly1 - ly0) + 1e-5
-            lgx = (lix - lcx) / (lw * 0.5)
-            lgy = (liy - lcy) / (lh * 0.5)
-            # ochi drept
-            rx0, ry0 = pt(263); rx1, ry1 = pt(362)
-            rcx = (rx0 + rx1) / 2.0; rcy = (ry0 + ry1) / 2.0
-            rix = np.mean([pt(i)[0] for i in [473, 474, 475, 476, 477]])
-            riy = np.mean([pt(i)[1] for i in [473, 474, 475, 476, 477]])
-            rw = abs(rx1 - rx0) + 1e-5
-            rh = abs(ry1 - ry0) + 1e-5
-            rgx = (rix - rcx) / (rw * 0.5)
-            rgy = (riy - rcy) / (rh * 0.5)
-            # medie + limitare
-            gx = float(max(-1.0, min(1.0, (lgx + rgx) * 0.5)))
-            gy = float(max(-1.0, min(1.0, (lgy + rgy) * 0.5)))
-            return (gx, gy)
-        except Exception:
-            return (0.0, 0.0)
+    @staticmethod
+    def _to_pixels(landmarks, w, h) -> np.ndarray:
+        arr = np.array([(l.x, l.y) for l in landmarks.landmark], dtype=np.float32)
+        arr *= (w, h)
+        return arr
 
     # ---------- pipeline ----------
-    def process(self, frame_bgr):
-        h, w = frame_bgr.shape[:2]
-        frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
-
+    def analyze(self, hand_pts: Optional[np.ndarray], face_pts: Optional[np.ndarray],
+                ts: Optional[float] = None, delay: Optional[float] = None):
+        """
+        Detecțiile (OK, 👍, zâmbet, sprânceană, gaze) din landmark-uri în pixeli — fără modele.
+        Folosit de `process` și de replay-ul de landmark-uri (teste / benchmark).
+        `delay` = întârzierea captură -> acum (implicit măsurată din `ts`).
+        """
+        ts = time.time() if ts is None else ts
         hand_state: Optional[HandState] = None
         face_state: Optional[FaceState] = None
-
-        # Hands
-        hand_results = self.hands.process(frame_rgb)
-        if hand_results.multi_hand_landmarks:
-            for hand_landmarks in hand_results.multi_hand_landmarks:
-                pts = [(int(l.x * w), int(l.y * h)) for l in hand_landmarks.landmark]
-                cx = int(sum(p[0] for p in pts) / len(pts))
-                cy = int(sum(p[1] for p in pts) / len(pts))
-                ok_detected = self._detect_ok(pts)
-                thumbs_up = self._detect_thumbs_up(pts)
-                hand_state = HandState(ok_gesture=ok_detected, thumbs_up=thumbs_up, hand_center=(cx, cy))
-
-                if mp_styles:
-                    mp_drawing.draw_landmarks(
-                        frame_bgr, hand_landmarks, mp_hands.HAND_CONNECTIONS,
-                        mp_styles.get_default_hand_landmarks_style(),
-                        mp_styles.get_default_hand_connections_style()
-                    )
-                else:
-                    mp_drawing.draw_landmarks(frame_bgr, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                break  # doar prima mână pentru reacție
-
-        # Face
-        face_results = self.face.process(frame_rgb)
-        if face_results.multi_face_landmarks:
-            lm = face_results.multi_face_landmarks[0].landmark
-            smiling, center = self._detect_smile(lm, w, h)
-            eyebrow_raise = self._detect_eyebrow_raise(lm, w, h)
-            gaze = self._detect_gaze(lm, w, h)
-
-            # EMA smoothing
-            gx = self.gaze_ema[0] * (1 - self.gaze_alpha) + gaze[0] * self.gaze_alpha
-            gy = self.gaze_ema[1] * (1 - self.gaze_alpha) + gaze[1] * self.gaze_alpha
-            self.gaze_ema = (gx, gy)
-
-            face_state = FaceState(
-                smiling=smiling,
-                eyebrow_raise=eyebrow_raise,
-                mouth_center=center,
-                gaze_offset=self.gaze_ema
+        self.last_hand_pts = hand_pts
+        # face_pts: o față (N, 2) sau toate fețele (F, N, 2)
+        faces = None if face_pts is None or not len(face_pts) else (
+            face_pts[None] if face_pts.ndim == 2 else face_pts)
+        self.last_faces_pts = faces
+        self.face_ids = self.face_tracker.update(
+            np.zeros((0, 4)) if faces is None else boxes(faces)).tolist()
+        main = primary_index(self.face_ids) if self.face_ids else 0
+        self.last_face_pts = None if faces is None else faces[main]
+        self.face_states = []
+
+        feats = self.profile.features
+
+        if hand_pts is not None and feats & HAND_FEATURES:
+            pts = hand_pts.astype(np.int32)
+            cx = int(pts[:, 0].sum() / len(pts))
+            cy = int(pts[:, 1].sum() / len(pts))
+            # OK / 👍 vin tot din clasificator (pragul lui e poarta de încredere)
+            name, dist = self.gesture_lib.classify(hand_pts)
+            hand_state = HandState(
+                ok_gesture=FEAT_OK in feats and name == "ok",
+                thumbs_up=FEAT_THUMBS_UP in feats and name == "thumbs_up",
+                hand_center=(cx, cy),
             )
-
-            if mp_styles:
-                mp_drawing.draw_landmarks(
-                    frame_bgr, face_results.multi_face_landmarks[0],
-                    mp_face_mesh.FACEMESH_TESSELATION,
-                    mp_styles.get_default_face_mesh_tesselation_style(),
-                    mp_styles.get_default_face_mesh_tesselation_style()
-                )
-            else:
-                mp_drawing.draw_landmarks(
-                    frame_bgr, face_results.multi_face_landmarks[0],
-                    mp_face_mesh.FACEMESH_TESSELATION
-                )
-
+            if FEAT_GESTURE in feats:
+                palm = self._norm_dist(pts[0], pts[9])
+                if self._wave.update(ts, cx, palm, name == "stop_palm"):
+                    name = "wave"
+                hand_state.gesture, hand_state.gesture_dist = name, dist
+
+        if faces is not None and feats & FACE_FEATURES:
+            m = face_metrics(faces)
+            smile, brow, gaze = FEAT_SMILE in feats, FEAT_EYEBROW in feats, FEAT_GAZE in feats
+            if gaze:
+                delay = time.time() - ts if delay is None else delay
+                # filtrele pistelor încă vii rămân (ocluzie scurtă), cele ale fețelor pierdute se șterg
+                self._gaze_filters = {fid: self._gaze_filters.get(fid) or GazeFilter(self.gaze_config)
+                                      for fid in self.face_tracker.ids}
+            for i, fid in enumerate(self.face_ids):
+                offset = (0.0, 0.0)
+                if gaze:
+                    # One-Euro + extrapolare în urmăriri lente cu întârzierea captură -> acum (filtru per față)
+                    f = self._gaze_filters[fid]
+                    f.observe_delay(delay)
+                    offset = f.update((float(m["gaze"][i, 0]), float(m["gaze"][i, 1])), ts)
+                self.face_states.append(FaceState(
+                    smiling=smile and bool(m["smiling"][i]),
+                    eyebrow_raise=brow and bool(m["eyebrow_raise"][i]),
+                    mouth_center=tuple(int(v) for v in m["mouth_center"][i]) if smile else (0, 0),
+                    gaze_offset=offset,
+                    smile_ratio=float(m["smile_ratio"][i]) if smile else 0.0,
+                    mouth_open=float(m["mouth_open"][i]) if smile else 0.0,
+                    brow_gap=float(m["brow_gap"][i]) if brow else 0.0,
+                    face_id=fid,
+                ))
+            face_state = self.face_states[main]
+            if gaze:
+                self.gaze_filter = self._gaze_filters[face_state.face_id]
+                self.gaze_smoothed = face_state.gaze_offset
+        return hand_state, face_state
+
+    def infer(self, frame_bgr):
+        """Rulează modelele MediaPipe; întoarce (hand_pts (21, 2), faces_pts (F, N, 2)) în pixeli sau None."""
+        h, w = frame_bgr.shape[:2]
+        src = frame_bgr
+        if self.infer_scale < 1.0:
+            src = self.pool.resize(frame_bgr, (int(w * self.infer_scale), int(h * self.infer_scale)),
+                                   "infer_small")
+        frame_rgb = self.pool.cvt_color(src, cv2.COLOR_BGR2RGB, "infer_rgb")
+
+        hand_pts = face_pts = None
+        if self.hands is not None:
+            hand_results = self.hands.process(frame_rgb)
+            if hand_results.multi_hand_landmarks:
+                # doar prima mână pentru reacție
+                hand_pts = self._to_pixels(hand_results.multi_hand_landmarks[0], w, h)
+        if self.face is not None:
+            face_results = self.face.process(frame_rgb)
+            if face_results.multi_face_landmarks:
+                face_pts = np.stack([self._to_pixels(lm, w, h)
+                                     for lm in face_results.multi_face_landmarks[:self.max_faces]])
+        return hand_pts, face_pts
+
+    def process(self, frame_bgr, draw: bool = True, ts: Optional[float] = None):
+        """
+        Inferență + (opțional) desenarea landmark-urilor; draw=False pentru headless/înregistrare.
+        `ts` = momentul capturii (time.time()); folosit de filtrul de gaze pentru dt și latență.
+        """
+        gate = self.motion_gate
+        if (gate is not None and self._last_states is not None
+                and not gate.should_infer(frame_bgr, self._rois(), ts)):
+            hand_state, face_state = self._last_states
+        else:
+            t0 = time.perf_counter()
+            hand_pts, face_pts = self.infer(frame_bgr)
+            if gate is not None:
+                gate.observe_infer((time.perf_counter() - t0) * 1000.0)
+            hand_state, face_state = self.analyze(hand_pts, face_pts, ts)
+            self._last_states = (hand_state, face_state)
+        if draw:
+            self.draw_landmarks(frame_bgr)
         return frame_bgr, hand_state, face_state
 
+    def _rois(self):
+        if self.last_faces_pts is None:
+            return (self.last_hand_pts,)
+        return (self.last_hand_pts, *self.last_faces_pts)
+
+    def draw_landmarks(self, frame_bgr):
+        """Desenează landmark-urile ultimului `process` (LOD din renderer); ID-ul fiecărei fețe dacă sunt mai multe."""
+        self.renderer.draw(frame_bgr, self.last_hand_pts, self.last_face_pts)
+        faces = self.last_faces_pts
+        if faces is None or len(faces) < 2 or self.renderer.lod == LOD_NONE:
+            return frame_bgr
+        main = primary_index(self.face_ids)
+        for i, (pts, fid) in enumerate(zip(faces, self.face_ids)):
+            if i != main:
+                self.renderer.draw_face(frame_bgr, pts)
+            x, y = pts.min(axis=0).astype(int)
+            put_text(frame_bgr, f"#{fid}", (x, max(20, y - 8)), 18, theme.COLORS['accent'], bold=True)
+        return frame_bgr
+
     # ---------- overlays ----------
     @staticmethod
     def draw_assistant_reactions(frame, hand_state: Optional[HandState], face_state: Optional[FaceState]):
@@ -207,27 +354,28 @@ class Perception:
         if hand_state:
             if hand_state.ok_gesture:
                 x, y = hand_state.hand_center
-                cv2.putText(frame, "Assistant: OK!", (x - 60, y - 40),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 0), 2)
+                put_text(frame, "Assistant: OK!", (x - 60, y - 40), 28, (0, 255, 0), bold=True)
                 cv2.circle(frame, (x, y), 22, (0, 255, 0), 3)
                 cv2.line(frame, (x + 10, y + 8), (x + 22, y + 20), (0, 255, 0), 3)
             if hand_state.thumbs_up:
                 x, y = hand_state.hand_center
-                cv2.putText(frame, "Assistant: 👍", (x - 60, y - 70),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 200, 255), 2)
+                put_text(frame, "Assistant: " + emoji("👍", "+1"), (x - 60, y - 70), 28, (0, 200, 255), bold=True)
                 cv2.rectangle(frame, (x - 10, y - 10), (x + 25, y + 25), (0, 200, 255), 2)
                 cv2.rectangle(frame, (x + 25, y - 5), (x + 35, y + 10), (0, 200, 255), 2)
+            # eticheta doar dacă gestul n-a fost deja desenat ca reacție OK/👍
+            if hand_state.gesture and not (hand_state.ok_gesture or hand_state.thumbs_up):
+                x, y = hand_state.hand_center
+                put_text(frame, f"Gesture: {hand_state.gesture}", (x - 60, y + 60), 24,
+                         theme.COLORS['accent'], bold=True)
 
         if face_state:
             if face_state.smiling:
                 x, y = face_state.mouth_center
-                cv2.putText(frame, "Assistant: :)", (x - 50, y - 30),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 215, 255), 2)
+                put_text(frame, "Assistant: " + emoji("🙂", ":)"), (x - 50, y - 30), 28, (0, 215, 255), bold=True)
                 cv2.ellipse(frame, (x, y + 10), (35, 18), 0, 10, 170, (0, 215, 255), 3)
             if face_state.eyebrow_raise:
                 h, _w = frame.shape[:2]
-                cv2.putText(frame, "Assistant: 🤨", (20, h - 20),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 200, 0), 2)
+                put_text(frame, "Assistant: " + emoji("🤨", "?!"), (20, h - 20), 28, (255, 200, 0), bold=True)
 
     @staticmethod
     def draw_hud(frame, lang, tts_on, help_on):
@@ -237,12 +385,10 @@ class Perception:
         # fundal HUD (pentru lizibilitate)
         cv2.rectangle(frame, (8, 8), (w - 8, 60), theme.COLORS['hud_bg'], -1)
 
-        font = cv2.FONT_HERSHEY_SIMPLEX
-        title_scale, title_th = 0.9, 2
-        line_scale, line_th = 0.7, 2
+        title_size, line_size = 28, 21  # px; textul e rasterizat o dată și refolosit (text_render)
 
         status = f"Lang: {lang.upper()} | Voice: {'ON' if tts_on else 'OFF'} | H: help"
-        cv2.putText(frame, status, (20, 40), font, title_scale, theme.COLORS['accent'], title_th)
+        put_text(frame, status, (20, 40), title_size, theme.COLORS['accent'], bold=True)
         cv2.line(frame, (8, 60), (w - 8, 60), theme.COLORS['accent'], 3)  # accent underline
 
         if not help_on:
@@ -260,6 +406,6 @@ class Perception:
             "Theme: theme dark/light | Accent: accent #RRGGBB",
         ]
         for line in lines:
-            (tw, th), base = cv2.getTextSize(line, font, line_scale, line_th)
-            cv2.putText(frame, line, (20, y), font, line_scale, theme.COLORS['hud_text'], line_th)
-            y += th + base + pad  # distanță dinamică
+            _tw, th, _base = measure(line, line_size, bold=True)
+            put_text(frame, line, (20, y), line_size, theme.COLORS['hud_text'], bold=True)
+            y += th + pad  # distanță dinamică
@@ -0,0 +1,133 @@
+"""
+Frame governor: ține bucla de cadre în bugetul de latență ales de utilizator.
+
+Măsoară costul pe etape (perception, overlays, avatar, display ...) și coboară
+calitatea pas cu pas când media depășește bugetul:
+    L0 full -> L1 percepție la 1 din 2 cadre -> L2 + inferență la 0.75x
+    -> L3 1 din 3 cadre, 0.5x, doar contururi -> L4 1 din 4 cadre, fără landmark-uri
+și revine treptat când apare din nou rezervă (cu histerezis, ca să nu oscileze).
+Pe cadrele sărite GUI-ul refolosește ultimele HandState / FaceState.
+"""
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    name: str
+    perceive_every: int = 1     # percepție la 1 din N cadre
+    infer_scale: float = 1.0    # scalarea cadrului dat modelelor MediaPipe
+    lod_cap: str = "full"       # LOD maxim pentru landmark-uri (full / contours / none)
+
+
+LEVELS = (
+    QualityLevel("full"),
+    QualityLevel("skip2", perceive_every=2),
+    QualityLevel("skip2-lowres", perceive_every=2, infer_scale=0.75),
+    QualityLevel("skip3-lowres", perceive_every=3, infer_scale=0.5, lod_cap="contours"),
+    QualityLevel("minimal", perceive_every=4, infer_scale=0.5, lod_cap="none"),
+)
+
+_LOD_ORDER = {"none": 0, "contours": 1, "full": 2}
+
+
+def cap_lod(user_lod: str, cap: str) -> str:
+    """LOD-ul efectiv: cel mai mic dintre alegerea utilizatorului și plafonul governor-ului."""
+    return user_lod if _LOD_ORDER.get(user_lod, 2) <= _LOD_ORDER.get(cap, 2) else cap
+
+
+class FrameGovernor:
+    def __init__(self, target_fps: Optional[float] = 30.0, budget_ms: Optional[float] = None,
+                 log_fn: Optional[Callable[[str], None]] = None,
+                 alpha: float = 0.1, degrade_after: int = 15, restore_after: int = 90,
+                 headroom: float = 0.7):
+        self.log_fn = log_fn
+        self.alpha = alpha
+        self.degrade_after = degrade_after    # cadre consecutive peste buget
+        self.restore_after = restore_after    # cadre consecutive cu rezervă
+        self.headroom = headroom              # revenire doar sub headroom * buget
+        self.level_idx = 0
+        self.enabled = True
+        self.budget_ms = 0.0
+        self.set_target(target_fps, budget_ms)
+        self.stage_ms: Dict[str, float] = {}  # EMA per etapă (doar când rulează)
+        self.frame_ms = 0.0                   # EMA cost total / cadru
+        self._frame_idx = 0
+        self._frame_t0 = 0.0
+        self._over = 0
+        self._under = 0
+        self.skipped = 0
+
+    # ---------- config ----------
+    def set_target(self, target_fps: Optional[float] = None, budget_ms: Optional[float] = None):
+        """Buget explicit (ms) sau derivat din FPS-ul țintă; None/0 pentru ambele = dezactivat."""
+        if budget_ms:
+            self.budget_ms = float(budget_ms)
+        elif target_fps:
+            self.budget_ms = 1000.0 / float(target_fps)
+        else:
+            self.budget_ms = 0.0
+        self.enabled = self.budget_ms > 0.0
+        if not self.enabled and self.level_idx:
+            self._set_level(0, "governor off")
+
+    @property
+    def level(self) -> QualityLevel:
+        return LEVELS[self.level_idx]
+
+    # ---------- per-frame ----------
+    def begin_frame(self) -> bool:
+        """Începe un cadru; întoarce True dacă pe acest cadru trebuie rulată percepția."""
+        self._frame_idx += 1
+        self._frame_t0 = time.perf_counter()
+        run = (self._frame_idx % self.level.perceive_every) == 0
+        if not run:
+            self.skipped += 1
+        return run
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - t0) * 1000.0
+            prev = self.stage_ms.get(name)
+            self.stage_ms[name] = ms if prev is None else prev + self.alpha * (ms - prev)
+
+    def end_frame(self):
+        cost = (time.perf_counter() - self._frame_t0) * 1000.0
+        self.frame_ms = cost if self.frame_ms == 0.0 else self.frame_ms + self.alpha * (cost - self.frame_ms)
+        if not self.enabled:
+            return
+        if self.frame_ms > self.budget_ms:
+            self._over += 1
+            self._under = 0
+        elif self.frame_ms < self.budget_ms * self.headroom:
+            self._under += 1
+            self._over = 0
+        else:
+            self._over = self._under = 0
+
+        if self._over >= self.degrade_after and self.level_idx < len(LEVELS) - 1:
+            self._set_level(self.level_idx + 1, "degrade")
+        elif self._under >= self.restore_after and self.level_idx > 0:
+            self._set_level(self.level_idx - 1, "restore")
+
+    def _set_level(self, idx: int, why: str):
+        old = self.level
+        self.level_idx = idx
+        self._over = self._under = 0
+        if self.log_fn:
+            stages = ", ".join(f"{k} {v:.1f}ms" for k, v in sorted(self.stage_ms.items()))
+            self.log_fn(
+                f"Governor: {why} {old.name} -> L{idx} {self.level.name} "
+                f"(frame {self.frame_ms:.1f}ms / budget {self.budget_ms:.1f}ms; {stages})"
+            )
+
+    def summary(self) -> str:
+        stages = ", ".join(f"{k} {v:.1f}ms" for k, v in sorted(self.stage_ms.items()))
+        return (f"L{self.level_idx} {self.level.name} | frame {self.frame_ms:.1f}ms"
+                f" / {self.budget_ms:.1f}ms | skipped {self.skipped} | {stages}")
@@ -0,0 +1,191 @@
+"""
+Înregistrare / replay compact de landmark-uri (fără cameră, fără modele).
+
+Format: un director `<nume>.lmk/` cu
+    meta.json    – versiune, nr. cadre, nr. puncte față/mână
+    index.bin    – un record per cadru: ts, w, h, rândul mâinii, primul rând de față
+                   (-1 = lipsă), nr. de fețe (rândurile fețelor unui cadru sunt consecutive)
+    hands.bin    – float32 (H, 21, 2), coordonate normalizate 0..1
+    faces.bin    – float32 (F, 478, 2), normalizate; fără iris (468 pct.) restul e NaN
+    face_ids.bin – int32 (F,), ID-ul de tracker al fiecărui rând din faces.bin
+
+Se înregistrează toate fețele detectate (nu doar cea principală); la replay,
+`LandmarkFrame.face_pts` e fața principală (ID-ul cel mai mic), iar `faces_pts`
+/ `face_ids` le conțin pe toate. Înregistrările v1 (o singură față) se citesc în
+continuare.
+
+Fișierele .bin sunt scrise incremental (memorie constantă la înregistrare) și
+citite cu `np.memmap`, deci replay-ul nu încarcă nimic în plus în RAM și poate
+rula detecțiile `Perception.analyze` la mii de cadre pe secundă.
+"""
+import json
+import os
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from face_tracker import primary_index
+
+VERSION = 2
+HAND_POINTS = 21
+FACE_POINTS = 478
+
+INDEX_DTYPE = np.dtype([
+    ("ts", "<f8"),
+    ("w", "<i4"),
+    ("h", "<i4"),
+    ("hand", "<i4"),
+    ("face", "<i4"),
+    ("n_faces", "<i4"),
+])
+INDEX_DTYPE_V1 = np.dtype([
+    ("ts", "<f8"),
+    ("w", "<i4"),
+    ("h", "<i4"),
+    ("hand", "<i4"),
+    ("face", "<i4"),
+])
+
+
+@dataclass
+class LandmarkFrame:
+    ts: float
+    w: int
+    h: int
+    hand_pts: Optional[np.ndarray]   # (21, 2) pixeli
+    face_pts: Optional[np.ndarray]   # (468|478, 2) pixeli — fața principală
+    faces_pts: Optional[np.ndarray] = None   # (F, 468|478, 2) pixeli — toate fețele
+    face_ids: Optional[List[int]] = None     # ID-urile de tracker, aliniate cu faces_pts
+
+
+class LandmarkRecorder:
+    """Scrie landmark-urile cadru cu cadru; `close()` finalizează meta.json."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._index = open(os.path.join(path, "index.bin"), "wb")
+        self._hands = open(os.path.join(path, "hands.bin"), "wb")
+        self._faces = open(os.path.join(path, "faces.bin"), "wb")
+        self._face_ids = open(os.path.join(path, "face_ids.bin"), "wb")
+        self.frames = 0
+        self.n_hands = 0
+        self.n_faces = 0
+        self._face_buf = np.full((FACE_POINTS, 2), np.nan, dtype=np.float32)
+        self._rec = np.zeros(1, dtype=INDEX_DTYPE)
+
+    def write(self, ts: float, w: int, h: int,
+              hand_pts: Optional[np.ndarray] = None, face_pts: Optional[np.ndarray] = None,
+              face_ids: Optional[List[int]] = None):
+        """`face_pts`: (468|478, 2) sau (F, 468|478, 2) pixeli; `face_ids` aliniate cu fețele
+        (implicit 0..F-1)."""
+        scale = np.array((w, h), dtype=np.float32)
+        hand_row = face_row = -1
+        n_faces = 0
+        if hand_pts is not None:
+            self._hands.write((np.asarray(hand_pts, dtype=np.float32)[:HAND_POINTS] / scale).tobytes())
+            hand_row = self.n_hands
+            self.n_hands += 1
+        if face_pts is not None and len(face_pts):
+            faces = np.asarray(face_pts, dtype=np.float32)
+            if faces.ndim == 2:
+                faces = faces[None]
+            n_faces = len(faces)
+            ids = np.arange(n_faces) if face_ids is None else face_ids
+            n = min(faces.shape[1], FACE_POINTS)
+            buf = self._face_buf
+            for face in faces:
+                buf[:n] = face[:n] / scale
+                buf[n:] = np.nan
+                self._faces.write(buf.tobytes())
+            self._face_ids.write(np.asarray(ids, dtype="<i4").tobytes())
+            face_row = self.n_faces
+            self.n_faces += n_faces
+        rec = self._rec
+        rec[0] = (ts, w, h, hand_row, face_row, n_faces)
+        self._index.write(rec.tobytes())
+        self.frames += 1
+
+    def close(self):
+        for f in (self._index, self._hands, self._faces, self._face_ids):
+            f.close()
+        meta = {
+            "version": VERSION,
+            "frames": self.frames,
+            "hands": self.n_hands,
+            "faces": self.n_faces,
+            "hand_points": HAND_POINTS,
+            "face_points": FACE_POINTS,
+        }
+        with open(os.path.join(self.path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _memmap(path: str, dtype, shape):
+    if not shape[0]:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+class LandmarkReplay:
+    """Citește o înregistrare `.lmk` (memory-mapped) și o redă cadru cu cadru."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        version = self.meta.get("version")
+        if version not in (1, VERSION):
+            raise ValueError(f"Unsupported landmark log version: {version}")
+        self.index = _memmap(os.path.join(path, "index.bin"),
+                             INDEX_DTYPE if version == VERSION else INDEX_DTYPE_V1,
+                             (self.meta["frames"],))
+        self.hands = _memmap(os.path.join(path, "hands.bin"), np.float32,
+                             (self.meta["hands"], self.meta["hand_points"], 2))
+        self.faces = _memmap(os.path.join(path, "faces.bin"), np.float32,
+                             (self.meta["faces"], self.meta["face_points"], 2))
+        # v1: o singură față per cadru, fără ID-uri de tracker
+        self.face_ids = (_memmap(os.path.join(path, "face_ids.bin"), np.int32, (self.meta["faces"],))
+                         if version == VERSION else np.zeros(self.meta["faces"], dtype=np.int32))
+        self._multi = version == VERSION
+
+    def __len__(self):
+        return len(self.index)
+
+    def duration(self) -> float:
+        return float(self.index["ts"][-1] - self.index["ts"][0]) if len(self.index) > 1 else 0.0
+
+    def frame(self, i: int) -> LandmarkFrame:
+        rec = self.index[i]
+        w, h = int(rec["w"]), int(rec["h"])
+        scale = np.array((w, h), dtype=np.float32)
+        hand = face = faces = ids = None
+        if rec["hand"] >= 0:
+            hand = self.hands[rec["hand"]] * scale
+        if rec["face"] >= 0:
+            i0 = int(rec["face"])
+            i1 = i0 + (int(rec["n_faces"]) if self._multi else 1)
+            faces = self.faces[i0:i1]
+            if np.isnan(faces[0, -1, 0]):  # fără iris
+                faces = faces[:, :468]
+            faces = faces * scale
+            ids = self.face_ids[i0:i1].tolist()
+            face = faces[primary_index(ids)]
+        return LandmarkFrame(float(rec["ts"]), w, h, hand, face, faces, ids)
+
+    def __iter__(self) -> Iterator[LandmarkFrame]:
+        for i in range(len(self.index)):
+            yield self.frame(i)
+
+    def run(self, perception, delay: float = 0.0):
+        """Trece fiecare cadru prin `Perception.analyze`; yield (frame, hand_state, face_state)."""
+        for fr in self:
+            hand_state, face_state = perception.analyze(fr.hand_pts, fr.faces_pts, fr.ts, delay=delay)
+            yield fr, hand_state, face_state
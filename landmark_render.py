@@ -0,0 +1,105 @@
+"""
+Vectorized landmark renderer (level-of-detail).
+
+Conexiunile MediaPipe sunt convertite o singură dată în array-uri de indici
+(E, 2); la fiecare cadru toate muchiile se desenează cu un singur apel
+`cv2.polylines`, direct din array-ul de landmark-uri (N, 2) în pixeli.
+"""
+import numpy as np
+import cv2
+try:
+    import mediapipe as mp
+    mp_hands = mp.solutions.hands
+    mp_face_mesh = mp.solutions.face_mesh
+except Exception:
+    # fără MediaPipe nu avem tabelele de conexiuni -> nimic de desenat
+    mp = mp_hands = mp_face_mesh = None
+
+LOD_FULL = "full"          # toată tesselația feței
+LOD_CONTOURS = "contours"  # contur, buze, ochi, sprâncene + iris
+LOD_NONE = "none"          # nimic desenat
+LOD_MODES = (LOD_FULL, LOD_CONTOURS, LOD_NONE)
+
+MESH_COLOR = (192, 192, 192)
+CONTOUR_COLOR = (230, 230, 230)
+IRIS_COLOR = (48, 255, 48)
+HAND_EDGE_COLOR = (224, 224, 224)
+HAND_POINT_COLOR = (48, 48, 255)
+
+
+def _edges(connections) -> np.ndarray:
+    """frozenset{(a, b)} -> array int32 (E, 2), ordonat (determinist)."""
+    if not connections:
+        return np.zeros((0, 2), dtype=np.int32)
+    return np.array(sorted(connections), dtype=np.int32).reshape(-1, 2)
+
+
+class LandmarkRenderer:
+    """Desenează mâini + față din array-uri numpy, fără bucle per conexiune."""
+
+    def __init__(self, lod: str = LOD_FULL):
+        self.lod = LOD_FULL
+        self.set_lod(lod)
+        if mp_hands is None:
+            self._hand_edges = _edges(None)
+            self._face_edges = {mode: [] for mode in LOD_MODES}
+            self._fit_cache = {}
+            return
+        self._hand_edges = _edges(mp_hands.HAND_CONNECTIONS)
+        self._face_edges = {
+            LOD_FULL: [(_edges(mp_face_mesh.FACEMESH_TESSELATION), MESH_COLOR)],
+            LOD_CONTOURS: [
+                (_edges(mp_face_mesh.FACEMESH_CONTOURS), CONTOUR_COLOR),
+                (_edges(getattr(mp_face_mesh, "FACEMESH_IRISES", frozenset())), IRIS_COLOR),
+            ],
+            LOD_NONE: [],
+        }
+        # cache pe (lod, nr. landmark-uri): fără iris (468 pct.) se elimină muchiile 468..477
+        self._fit_cache = {}
+
+    def set_lod(self, lod: str):
+        lod = (lod or LOD_FULL).lower()
+        self.lod = lod if lod in LOD_MODES else LOD_FULL
+
+    def _face_layers(self, n_points: int):
+        key = (self.lod, n_points)
+        layers = self._fit_cache.get(key)
+        if layers is None:
+            layers = []
+            for edges, color in self._face_edges[self.lod]:
+                if len(edges):
+                    edges = edges[edges.max(axis=1) < n_points]
+                if len(edges):
+                    layers.append((edges, color))
+            self._fit_cache[key] = layers
+        return layers
+
+    @staticmethod
+    def _polylines(frame, pts, edges, color, thickness=1):
+        # (E, 2) indici -> (E, 2, 2) segmente în pixeli, un singur apel OpenCV
+        if not len(edges):
+            return
+        segs = np.rint(pts[edges]).astype(np.int32)
+        cv2.polylines(frame, segs, False, color, thickness, cv2.LINE_AA)
+
+    def draw_face(self, frame, face_pts):
+        if face_pts is None or self.lod == LOD_NONE:
+            return frame
+        for edges, color in self._face_layers(len(face_pts)):
+            self._polylines(frame, face_pts, edges, color, 1)
+        return frame
+
+    def draw_hand(self, frame, hand_pts):
+        if hand_pts is None or self.lod == LOD_NONE:
+            return frame
+        self._polylines(frame, hand_pts, self._hand_edges, HAND_EDGE_COLOR, 2)
+        for x, y in np.rint(hand_pts).astype(np.int32):
+            cv2.circle(frame, (int(x), int(y)), 3, HAND_POINT_COLOR, -1)
+        return frame
+
+    def draw(self, frame, hand_pts=None, face_pts=None):
+        if self.lod == LOD_NONE:
+            return frame
+        self.draw_hand(frame, hand_pts)
+        self.draw_face(frame, face_pts)
+        return frame
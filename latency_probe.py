@@ -0,0 +1,193 @@
+"""
+Măsurarea latenței „glass-to-glass” (captură -> percepție -> randare -> afișare).
+
+`StampedSource` împachetează o sursă (sintetică / fișier / cameră) și desenează
+în colțul de jos al fiecărui cadru un cod de blocuri alb/negru cu numărul de
+secvență (24 biți + checksum), ținând minte momentul capturii. `LatencyProbe`
+citește codul din cadrul care ajunge la o etapă (după percepție, după randare,
+în imaginea dată display-ului / sink-ului) și adună distribuția latențelor.
+Codul e citit în ambele orientări, deci merge și după flip-ul oglindă.
+
+    python main_tk2.py stamp:synthetic        # GUI: sumar în log la Stop Camera
+    python latency_tool.py --configs default,no-governor,half-res
+
+Notă: cu o cameră reală se măsoară de la citirea cadrului, nu de la lumina din
+scenă; pentru capătul „glass” fizic e nevoie de filmarea ecranului.
+"""
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+
+from frame_source import Frame, FrameSource
+
+BITS = 24
+CHECK_BITS = 4
+GUARD = (1, 1, 0)  # alb, alb, negru — marchează începutul (și orientarea) codului
+N_BLOCKS = len(GUARD) + BITS + CHECK_BITS
+
+
+def _block(h: int) -> int:
+    return max(4, h // 60)
+
+
+def _checksum(seq: int) -> int:
+    return (seq ^ (seq >> 4) ^ (seq >> 8) ^ (seq >> 12) ^ (seq >> 16) ^ (seq >> 20)) & 0xF
+
+
+def _bits(seq: int):
+    seq &= (1 << BITS) - 1
+    code = [(seq >> (BITS - 1 - i)) & 1 for i in range(BITS)]
+    chk = _checksum(seq)
+    return list(GUARD) + code + [(chk >> (CHECK_BITS - 1 - i)) & 1 for i in range(CHECK_BITS)]
+
+
+def stamp(img: np.ndarray, seq: int) -> np.ndarray:
+    """Desenează codul lui `seq` în colțul stânga-jos (in-place)."""
+    h = img.shape[0]
+    b = _block(h)
+    y0 = h - 2 * b
+    for i, bit in enumerate(_bits(seq)):
+        x0 = b + i * b
+        img[y0:y0 + b, x0:x0 + b] = 255 if bit else 0
+    return img
+
+
+def _read_strip(img: np.ndarray, mirrored: bool) -> Optional[int]:
+    h, w = img.shape[:2]
+    b = _block(h)
+    y0 = h - 2 * b
+    n = N_BLOCKS
+    if mirrored:
+        x1 = w - b
+        strip = img[y0:y0 + b, x1 - n * b:x1][:, ::-1]
+    else:
+        strip = img[y0:y0 + b, b:b + n * b]
+    if strip.shape[1] != n * b:
+        return None
+    # media pe interiorul fiecărui bloc (margini ignorate: robust la resize / JPEG)
+    m = max(1, b // 4)
+    inner = strip.reshape(b, n, b, -1)[m:b - m, :, m:b - m]
+    levels = inner.mean(axis=(0, 2, 3))
+    white, black = levels[:2].mean(), levels[2]
+    if white - black < 60:
+        return None
+    bits = levels[3:] > (white + black) * 0.5
+    seq = 0
+    for bit in bits[:BITS]:
+        seq = (seq << 1) | int(bit)
+    chk = 0
+    for bit in bits[BITS:]:
+        chk = (chk << 1) | int(bit)
+    return seq if chk == _checksum(seq) else None
+
+
+def read_code(img: np.ndarray) -> Optional[int]:
+    """Numărul de secvență din cadru sau None (cod lipsă / acoperit)."""
+    seq = _read_strip(img, mirrored=False)
+    return seq if seq is not None else _read_strip(img, mirrored=True)
+
+
+class StampedSource(FrameSource):
+    """Sursă care marchează fiecare cadru cu secvența lui și reține momentul capturii.
+
+    Sursa interioară trebuie să fie în timp real (Frame.ts = time.time() la citire);
+    `open_source('stamp:...')` o deschide așa."""
+
+    def __init__(self, inner: FrameSource, history: int = 4096):
+        super().__init__()
+        self.inner = inner
+        self.name = f"stamped {inner.name}"
+        self._ts = np.zeros(history)
+        self._seqs = np.zeros(history, dtype=np.int64)
+
+    def open(self) -> bool:
+        ok = self.inner.is_opened() or self.inner.open()
+        self.width, self.height, self.fps = self.inner.width, self.inner.height, self.inner.fps
+        return ok
+
+    def is_opened(self) -> bool:
+        return self.inner.is_opened()
+
+    def describe(self) -> str:
+        return f"stamped {self.inner.describe()}"
+
+    def read(self) -> Optional[Frame]:
+        fr = self.inner.read()
+        if fr is None:
+            return None
+        seq = fr.seq & ((1 << BITS) - 1)
+        stamp(fr.image, seq)
+        i = seq % len(self._ts)
+        self._ts[i], self._seqs[i] = fr.ts, seq
+        return fr
+
+    def capture_ts(self, seq: int) -> Optional[float]:
+        i = seq % len(self._ts)
+        return float(self._ts[i]) if self._seqs[i] == seq else None
+
+    def release(self):
+        self.inner.release()
+
+
+class LatencyProbe:
+    """Latența per etapă = momentul în care cadrul cu codul `seq` ajunge acolo - captura lui."""
+
+    def __init__(self, source: StampedSource, max_samples: int = 10000):
+        self.source = source
+        self.samples: Dict[str, deque] = {}
+        self.missing: Dict[str, int] = {}   # cod ilizibil (acoperit de overlay, scalat prea mult)
+        self.repeats: Dict[str, int] = {}   # același cadru ajuns din nou (conținut învechit)
+        self._last: Dict[str, int] = {}
+        self.max_samples = max_samples
+        self.stages = []
+
+    def mark(self, stage: str, frame: np.ndarray, t: Optional[float] = None) -> Optional[float]:
+        t = time.time() if t is None else t
+        if stage not in self.samples:
+            self.samples[stage] = deque(maxlen=self.max_samples)
+            self.missing[stage] = self.repeats[stage] = 0
+            self.stages.append(stage)
+        seq = read_code(frame)
+        if seq is None:
+            self.missing[stage] += 1
+            return None
+        if self._last.get(stage) == seq:
+            self.repeats[stage] += 1
+        self._last[stage] = seq
+        t_cap = self.source.capture_ts(seq)
+        if t_cap is None:
+            self.missing[stage] += 1
+            return None
+        lat = t - t_cap
+        self.samples[stage].append(lat)
+        return lat
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        out = {}
+        for stage in self.stages:
+            a = np.asarray(self.samples[stage]) * 1000.0
+            if not len(a):
+                continue
+            p50, p90, p99 = np.percentile(a, (50, 90, 99))
+            out[stage] = {"count": len(a), "p50": float(p50), "p90": float(p90), "p99": float(p99),
+                          "max": float(a.max()), "missing": self.missing[stage],
+                          "repeats": self.repeats[stage]}
+        return out
+
+    def summary(self) -> str:
+        st = self.stats()
+        if not st:
+            return "Latency probe: no samples."
+        return "Latency from capture (p50/p90/p99 ms): " + ", ".join(
+            f"{k} {v['p50']:.1f}/{v['p90']:.1f}/{v['p99']:.1f}"
+            + (f" [{v['missing']} unreadable]" if v["missing"] else "")
+            for k, v in st.items())
+
+    def reset(self):
+        for d in self.samples.values():
+            d.clear()
+        for k in self.missing:
+            self.missing[k] = self.repeats[k] = 0
+        self._last.clear()
@@ -0,0 +1,160 @@
+"""
+Compară configurații ale pipeline-ului după latența captură -> afișare.
+
+    python latency_tool.py                                   # config "default", 10 s
+    python latency_tool.py --configs default,no-governor,half-res,no-motion-gate --seconds 8
+    python latency_tool.py --source video.mp4 --configs default,contours
+
+Rulează aceeași buclă ca GUI-ul (flip, percepție cu governor, landmark-uri,
+reacții + HUD, avatar, sink, conversia pentru display) fără Tk, pe o sursă
+marcată (`StampedSource`), și raportează pentru fiecare configurație
+distribuția latenței la fiecare etapă + FPS-ul obținut.
+"""
+import argparse
+import time
+
+import cv2
+
+from avatar import Avatar
+from avatar_renderer import AvatarRenderer
+from frame_pool import FramePool
+from frame_source import SyntheticSource, VideoFileSource
+from gestures import Perception
+from governor import FrameGovernor, cap_lod
+from latency_probe import LatencyProbe, StampedSource
+
+BASE = {
+    "width": 1280, "height": 720, "fps": 30.0,
+    "target_fps": 30.0,     # governor (None = dezactivat)
+    "motion_gate": True,
+    "infer_scale": 1.0,     # plafon peste cel ales de governor
+    "lod": "full",
+    "avatar": True,
+    "avatar_fps": 15.0,     # randare pe thread propriu (None = desen sincron în buclă)
+    "sink": False,
+}
+
+CONFIGS = {
+    "default": {},
+    "no-governor": {"target_fps": None},
+    "half-res": {"infer_scale": 0.5},
+    "no-motion-gate": {"motion_gate": False},
+    "contours": {"lod": "contours"},
+    "no-avatar": {"avatar": False},
+    "avatar-sync": {"avatar_fps": None},
+    "sink": {"sink": True},
+    "480p": {"width": 854, "height": 480},
+    "1080p": {"width": 1920, "height": 1080},
+}
+
+
+def _open(source: str, cfg: dict):
+    if source == "synthetic":
+        inner = SyntheticSource(cfg["width"], cfg["height"], cfg["fps"], realtime=True)
+    else:
+        inner = VideoFileSource(source, realtime=True, loop=True)
+    src = StampedSource(inner)
+    return src if src.open() else None
+
+
+def run(name: str, source: str, seconds: float) -> dict:
+    cfg = dict(BASE, **CONFIGS[name])
+    src = _open(source, cfg)
+    if src is None:
+        raise SystemExit(f"cannot open source {source!r}")
+    probe = LatencyProbe(src)
+    perc = Perception(lod=cfg["lod"], motion_gate=cfg["motion_gate"])
+    gov = FrameGovernor(target_fps=cfg["target_fps"])
+    pool = FramePool()
+    avatar = Avatar() if cfg["avatar"] else None
+    renderer = AvatarRenderer(avatar, fps=cfg["avatar_fps"]) if avatar and cfg["avatar_fps"] else None
+    sink = None
+    if cfg["sink"]:
+        from frame_sink import SharedMemorySink
+        sink = SharedMemorySink(f"vafr_latency_{int(time.time())}")
+    states = (None, None)
+    frames = 0
+    t0 = time.perf_counter()
+    try:
+        while time.perf_counter() - t0 < seconds:
+            fr = src.read()
+            if fr is None:
+                break
+            run_perception = gov.begin_frame()
+            level = gov.level
+            frame = pool.flip(fr.image, 1)
+            with gov.stage("perception"):
+                if run_perception:
+                    perc.infer_scale = min(level.infer_scale, cfg["infer_scale"])
+                    frame, hand_state, face_state = perc.process(frame, draw=False, ts=fr.ts)
+                    states = (hand_state, face_state)
+                else:
+                    hand_state, face_state = states
+            probe.mark("perception", frame)
+            with gov.stage("landmarks"):
+                perc.set_lod(cap_lod(cfg["lod"], level.lod_cap))
+                perc.draw_landmarks(frame)
+            with gov.stage("overlays"):
+                perc.draw_assistant_reactions(frame, hand_state, face_state)
+                perc.draw_hud(frame, "en", tts_on=False, help_on=False)
+            if avatar is not None:
+                with gov.stage("avatar"):
+                    H, W = frame.shape[:2]
+                    pw, ph = int(W * 0.28), int(H * 0.50)
+                    state = {
+                        "smile": bool(face_state and face_state.smiling),
+                        "eyebrow_raise": bool(face_state and face_state.eyebrow_raise),
+                        "ok": bool(hand_state and hand_state.ok_gesture),
+                        "thumbs_up": bool(hand_state and hand_state.thumbs_up),
+                        "gaze": face_state.gaze_offset if face_state else (0.0, 0.0),
+                        "speech": "",
+                    }
+                    if renderer is not None:
+                        renderer.update((pw, ph), state)
+                    if renderer is None or not renderer.composite(frame, W - pw - 12, 12):
+                        avatar.draw(frame, W - pw - 12, 12, pw, ph, state)
+            probe.mark("render", frame)
+            if sink is not None:
+                with gov.stage("output"):
+                    sink.write(frame, fr.ts)
+                probe.mark("sink", frame)
+            with gov.stage("display"):
+                rgb = pool.cvt_color(frame, cv2.COLOR_BGR2RGB, "display")
+            probe.mark("display", rgb)
+            gov.end_frame()
+            frames += 1
+    finally:
+        src.release()
+        if renderer is not None:
+            renderer.stop()
+        if sink is not None:
+            sink.close()
+        perc.set_profile("off")
+    elapsed = time.perf_counter() - t0
+    return {"name": name, "fps": frames / max(elapsed, 1e-9), "stats": probe.stats(),
+            "level": gov.level.name}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Glass-to-glass latency comparison")
+    ap.add_argument("--source", default="synthetic", help="'synthetic' sau cale către un fișier video")
+    ap.add_argument("--configs", default="default", help=f"listă separată prin virgulă: {', '.join(CONFIGS)}")
+    ap.add_argument("--seconds", type=float, default=10.0)
+    args = ap.parse_args()
+
+    names = [n.strip() for n in args.configs.split(",") if n.strip()]
+    unknown = [n for n in names if n not in CONFIGS]
+    if unknown:
+        raise SystemExit(f"unknown config(s): {', '.join(unknown)}")
+    results = [run(n, args.source, args.seconds) for n in names]
+
+    print(f"{'config':16s} {'fps':>6s} {'level':>13s}  stage: p50 / p90 / p99 ms")
+    for r in results:
+        parts = [f"{stage} {s['p50']:.1f}/{s['p90']:.1f}/{s['p99']:.1f}"
+                 + (f" ({s['missing']} unreadable)" if s["missing"] else "")
+                 for stage, s in r["stats"].items()]
+        print(f"{r['name']:16s} {r['fps']:6.1f} {r['level']:>13s}  " + ", ".join(parts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Poartă pentru recunoașterea vocală: doar frazele „adresate” asistentului ajung la recognizer.
+
+Moduri:
+    always   — toate frazele (comportamentul vechi)
+    gesture  — un gest ținut `hold` secunde (sprânceană ridicată / OK) deschide
+               o fereastră de ascultare de `window` secunde
+    mouth    — gura (FaceMesh) trebuie să se miște în timpul frazei; vorbele din
+               fundal / sunetul de la celălalt capăt al apelului sunt ignorate
+
+`observe()` e apelat din bucla video (la fiecare cadru cu percepție), `allow()`
+din thread-ul de recunoaștere cu intervalul frazei (timp real, time.time()).
+"""
+import threading
+from collections import deque
+from typing import Optional, Tuple
+
+import numpy as np
+
+MODES = ("always", "gesture", "mouth")
+
+
+class ListenGate:
+    def __init__(self, mode: str = "always", hold: float = 0.5, window: float = 5.0,
+                 gestures: Tuple[str, ...] = ("eyebrow_raise", "ok"), mouth_motion: float = 0.06,
+                 allow_without_video: bool = True, history: float = 30.0):
+        self.mode = mode if mode in MODES else "always"
+        self.hold = hold                    # cât trebuie ținut gestul (s)
+        self.window = window                # cât rămâne deschisă ascultarea (s)
+        self.gestures = gestures
+        self.mouth_motion = mouth_motion    # p90 - p10 al deschiderii gurii în timpul frazei
+        self.allow_without_video = allow_without_video  # fără cadre recente: nu blocăm vocea
+        self.history = history
+        self._lock = threading.Lock()
+        self._mouth: deque = deque()        # (ts, mouth_open) ; NaN = fără față
+        self._windows: deque = deque()      # (deschis, închis)
+        self._held_since: Optional[float] = None
+        self._last_frame = 0.0
+        self.passed = self.rejected = 0
+
+    def set_mode(self, mode: str):
+        with self._lock:
+            self.mode = mode if mode in MODES else "always"
+            self._windows.clear()
+            self._held_since = None
+
+    def features(self):
+        """Detecțiile de care are nevoie modul curent (pentru `Perception.set_consumer`)."""
+        if self.mode == "gesture":
+            names = {"eyebrow_raise": "eyebrow", "ok": "ok", "thumbs_up": "thumbs_up"}
+            return {names.get(g, "gesture") for g in self.gestures}
+        if self.mode == "mouth":
+            return {"smile"}  # deschiderea gurii se calculează împreună cu zâmbetul
+        return None
+
+    # ---------- din bucla video ----------
+    def observe(self, ts: float, hand_state=None, face_state=None) -> bool:
+        """Adaugă cadrul curent; True dacă tocmai s-a deschis o fereastră de ascultare."""
+        opened = False
+        with self._lock:
+            self._last_frame = ts
+            if self.mode == "mouth":
+                self._mouth.append((ts, face_state.mouth_open if face_state is not None else np.nan))
+                while self._mouth and self._mouth[0][0] < ts - self.history:
+                    self._mouth.popleft()
+            elif self.mode == "gesture":
+                if self._gesture_active(hand_state, face_state):
+                    if self._held_since is None:
+                        self._held_since = ts
+                    elif ts - self._held_since >= self.hold and not self._open_at(ts):
+                        self._windows.append((ts, ts + self.window))
+                        opened = True
+                    elif self._open_at(ts):
+                        # gestul ținut în continuare prelungește fereastra
+                        start, _ = self._windows[-1]
+                        self._windows[-1] = (start, ts + self.window)
+                else:
+                    self._held_since = None
+                while self._windows and self._windows[0][1] < ts - self.history:
+                    self._windows.popleft()
+        return opened
+
+    def _gesture_active(self, hand_state, face_state) -> bool:
+        for g in self.gestures:
+            if g == "eyebrow_raise" and face_state is not None and face_state.eyebrow_raise:
+                return True
+            if g == "ok" and hand_state is not None and hand_state.ok_gesture:
+                return True
+            if g == "thumbs_up" and hand_state is not None and hand_state.thumbs_up:
+                return True
+            if hand_state is not None and hand_state.gesture == g:
+                return True
+        return False
+
+    def _open_at(self, ts: float) -> bool:
+        return bool(self._windows) and self._windows[-1][0] <= ts <= self._windows[-1][1]
+
+    def remaining(self, now: float) -> float:
+        """Secunde rămase din fereastra de ascultare (0 = închisă); pentru HUD."""
+        with self._lock:
+            if self.mode != "gesture" or not self._open_at(now):
+                return 0.0
+            return self._windows[-1][1] - now
+
+    # ---------- din thread-ul de recunoaștere ----------
+    def allow(self, start: float, end: float) -> Tuple[bool, str]:
+        """Fraza [start, end] merge la recognizer? (decizie, motiv)."""
+        with self._lock:
+            ok, reason = self._decide(start, end)
+            if ok:
+                self.passed += 1
+            else:
+                self.rejected += 1
+        return ok, reason
+
+    def _decide(self, start: float, end: float) -> Tuple[bool, str]:
+        if self.mode == "always":
+            return True, "always"
+        if self._last_frame < start - 2.0:
+            return self.allow_without_video, "no video"
+        if self.mode == "gesture":
+            hit = any(a <= end and b >= start for a, b in self._windows)
+            return hit, "gesture window" if hit else "no gesture"
+        vals = np.array([m for t, m in self._mouth if start <= t <= end], dtype=np.float64)
+        vals = vals[~np.isnan(vals)]
+        if len(vals) < 3:
+            return False, "no face"
+        p10, p90 = np.percentile(vals, (10, 90))
+        moving = bool(p90 - p10 >= self.mouth_motion)
+        return moving, "mouth moving" if moving else "mouth still"
+
+    def summary(self) -> str:
+        with self._lock:
+            return f"Listen gate ({self.mode}): {self.passed} phrase(s) recognized, {self.rejected} ignored"
@@ -1,4 +1,6 @@
+import io
 import os
+import threading
 import time
 import random
 import cv2
@@ -6,32 +8,65 @@ from PIL import Image, ImageTk
 import tkinter as tk
 from tkinter import ttk
 
-from gestures import Perception
+from gestures import Perception, PROFILES, ALL_FEATURES, HAND_FEATURES, FEAT_SMILE, FEAT_EYEBROW
 from speech import SpeechListener
 from tts import TTS
 from commands import CommandCenter
+from dispatcher import CommandDispatcher, UIChannel
 from avatar import Avatar
+from avatar_renderer import AvatarRenderer
+from replay_buffer import ReplayBuffer
+from governor import FrameGovernor, cap_lod
+from frame_source import open_source
+from latency_probe import LatencyProbe, StampedSource
+from landmark_log import LandmarkRecorder
+from gesture_templates import TemplateRecorder
+from frame_pool import FramePool, LazySnapshot
+from feature_store import FeatureStore
+from event_server import EventServer
+from frame_sink import SharedMemorySink
+from tracing import Tracer
+from listen_gate import ListenGate, MODES as LISTEN_MODES
+from text_render import measure, put_text
 import theme
 
 EN_REPLIES = ["Hello!", "Hi!", "Hey there!"]
 RO_REPLIES = ["Salut!", "Bună!", "Salutare!"]
+EVENT_SERVER_PORT = int(os.environ.get("ASSISTANT_EVENT_PORT", "8765"))  # doar pe 127.0.0.1
+AVATAR_FPS = 15.0     # rata de randare a avatarului, independentă de FPS-ul camerei
+LOG_MAX_LINES = 2000  # log-ul din GUI e trunchiat (sesiuni de 8h+ fără creștere nelimitată)
 
 
 class VideoAssistantGUI:
-    def __init__(self, root):
+    def __init__(self, root, source_spec="0"):
         self.root = root
         root.title("Video Call Assistant — RO/EN (Tkinter)")
         root.geometry("1120x780")
 
         self.base_dir = os.path.dirname(os.path.abspath(__file__))
-        self.cap = None
-        self.perc = Perception()
+        self.source_spec = source_spec  # "0" cameră, "synthetic", sau cale fișier video
+        self.source = None
+        self.perc = Perception(
+            profile="auto", gesture_templates=os.path.join(self.base_dir, "gesture_templates.npz")
+        )
+        self.tracer = Tracer(max_traces=500)  # latență voce -> acțiune, per frază
+        self.probe = None  # LatencyProbe când sursa e 'stamp:...'
+        self.frame_sink = None  # SharedMemorySink: cadrul final pentru alte aplicații locale
+        self.events = None  # EventServer local de evenimente (opțional)
+        self.features = FeatureStore()  # serii de timp ale semnalelor, pe sesiune (ring fix, ~8 MB)
+        self.template_rec = None  # TemplateRecorder activ (gest nou din cameră)
+        self.landmark_rec = None  # LandmarkRecorder activ (checkbox "Record landmarks")
+        self.landmark_rec_started = 0.0
+        self._export_thread = None  # exportul FeatureStore la Stop Camera (CSV/NPZ pe worker)
+        self.listen_gate = ListenGate()  # ce fraze ajung la recognizer (gest / gură în mișcare)
         self.tts = TTS(enabled=True)
 
         # inițializează tema (dark + accent brand)
         theme.set_theme("dark", accent_hex="#0066FF")
 
         self.avatar = Avatar()
+        # avatarul se desenează pe thread-ul lui la AVATAR_FPS; bucla de cadre doar îl copiază în panou
+        self.avatar_renderer = AvatarRenderer(self.avatar, fps=AVATAR_FPS)
         self.avatar_enabled = tk.BooleanVar(value=True)
         self.avatar_width_pct = tk.DoubleVar(value=28.0)
         self.last_avatar_text = ""
@@ -43,58 +78,76 @@ class VideoAssistantGUI:
         self.recording = False
         self.video_writer = None
         self.frame_size = None
-        self.last_frame = None
+        self._snapshot = None  # LazySnapshot al ultimului cadru brut (copiat doar la cerere)
+        self.pool = FramePool()
+        # instant replay: ultimele 30 s ca JPEG în memorie (mărime limitată)
+        self.replay = ReplayBuffer(seconds=30.0, fps=15.0)
+        # governor: sare percepția / scade rezoluția ca să țină FPS-ul țintă
+        self.governor = FrameGovernor(target_fps=30.0, log_fn=self.log)
+        self._last_states = (None, None)
 
         # TTS -> animă gura avatarului
         def _on_tts_state(speaking: bool):
             self.avatar.set_speaking(bool(speaking))
         self.tts.on_state = _on_tts_state
+        self.tts.on_word = self.avatar.on_word  # progres real (limite de cuvânt) din procesul TTS
 
         self.build_ui()
+        self.update_perception_consumers()
+
+        # singurul canal thread-uri de fundal -> Tk (log, istoric, temă, capturi)
+        self.ui = UIChannel(self.root)
 
-        # CommandCenter cu callback-uri pentru controlul temei prin voce
+        # CommandCenter cu callback-uri pentru controlul temei prin voce (rulate pe thread-ul Tk)
         self.cmd = CommandCenter(
             self.base_dir,
-            on_theme_change=self.apply_theme_from_voice,
-            on_accent_change=self.apply_accent_from_voice,
+            on_theme_change=self.ui.wrap(self.apply_theme_from_voice),
+            on_accent_change=self.ui.wrap(self.apply_accent_from_voice),
+            on_capture_saved=self.on_capture_saved,
         )
+        # acțiunile rulează în workeri (cu timeout), nu pe thread-ul microfonului
+        self.dispatcher = CommandDispatcher(self.cmd, ui_post=self.ui.post)
+        self.refresh_captures()
 
-        # STT
+        # STT (pe thread-ul de speech: doar parsare + programare, apoi ascultă din nou)
         def on_phrase(text, lang):
-            # istoric intrare
-            self.add_history(f"User said: {text}")
+            self.ui.post(self.add_history, f"User said: {text}")
+            self.publish_event("phrase", text=text, lang=lang)
 
-            # log wrapper -> history + log
+            # log wrapper -> history + log (apelat pe thread-ul Tk)
             def _cmd_log(m):
                 self.log(m)
                 self.add_history(m)
+                self.publish_event("command", text=text, message=m)
 
             # întâi, comenzi (screenshot, youtube, google, open site, theme/accent)
-            if self.cmd.parse_and_run(
-                text, frame_bgr=self.last_frame, log_fn=_cmd_log, lang_hint=lang
-            ):
-                return
-
-            # salut -> wave
-            if any(k in text.lower() for k in ["salut", "bună", "buna", "hello", "hi", "hei", "hey"]):
-                self.avatar.start_wave(2.0)
-
-            # small talk
-            self.current_lang = lang
-            reply = random.choice(RO_REPLIES if lang == "ro" else EN_REPLIES)
-            if self.voice_on.get():
-                self.tts.speak(reply)
-            self.last_avatar_text = reply
-            self.add_history(f"Assistant: {reply}")
-            self.log(f"[{lang.upper()}] User: {text} -> Assistant: {reply}")
-
-        self.speech = SpeechListener(phrase_handler=on_phrase)
+            handled = self.dispatcher.submit(
+                text, lang_hint=lang, frame_bgr=self.snapshot_frame, log_fn=_cmd_log, replay=self.replay
+            )
+            if not handled:
+                self.ui.post(self.small_talk, text, lang)
+
+        self.speech = SpeechListener(phrase_handler=on_phrase, tracer=self.tracer,
+                                     utterance_filter=self.listen_gate.allow)
         if self.speech.is_available():
             self.speech.start()
             self.log("Speech: started (Google recognizer).")
         else:
             self.log("Speech: microphone not available; running without STT.")
 
+    def small_talk(self, text: str, lang: str):
+        # salut -> wave
+        if any(k in text.lower() for k in ["salut", "bună", "buna", "hello", "hi", "hei", "hey"]):
+            self.avatar.start_wave(2.0)
+
+        self.current_lang = lang
+        reply = random.choice(RO_REPLIES if lang == "ro" else EN_REPLIES)
+        if self.voice_on.get():
+            self.tts.speak(reply)
+        self.last_avatar_text = reply
+        self.add_history(f"Assistant: {reply}")
+        self.log(f"[{lang.upper()}] User: {text} -> Assistant: {reply}")
+
     # ---------- UI ----------
     def build_ui(self):
         top = ttk.Frame(self.root, padding=8)
@@ -104,10 +157,13 @@ class VideoAssistantGUI:
         self.btn_stop = ttk.Button(top, text="Stop Camera", command=self.stop_camera, state=tk.DISABLED)
         self.btn_ss = ttk.Button(top, text="Screenshot", command=self.on_screenshot, state=tk.DISABLED)
         self.btn_rec = ttk.Button(top, text="Start Recording", command=self.toggle_recording, state=tk.DISABLED)
+        self.btn_replay = ttk.Button(top, text="Save Last 30s", command=self.on_save_replay, state=tk.DISABLED)
         self.btn_start.pack(side=tk.LEFT, padx=4)
         self.btn_stop.pack(side=tk.LEFT, padx=4)
         self.btn_ss.pack(side=tk.LEFT, padx=4)
         self.btn_rec.pack(side=tk.LEFT, padx=4)
+        self.btn_replay.pack(side=tk.LEFT, padx=4)
+        ttk.Button(top, text="Export Voice Trace", command=self.on_export_trace).pack(side=tk.LEFT, padx=4)
 
         ttk.Separator(self.root, orient="horizontal").pack(fill=tk.X, pady=4)
 
@@ -125,11 +181,21 @@ class VideoAssistantGUI:
         lang_combo.pack(side=tk.LEFT, padx=6)
         lang_combo.bind("<<ComboboxSelected>>", self.on_language_change)
 
+        ttk.Label(options, text="Listen:").pack(side=tk.LEFT, padx=(8, 0))
+        self.listen_mode = tk.StringVar(value="always")
+        listen_combo = ttk.Combobox(
+            options, textvariable=self.listen_mode, values=list(LISTEN_MODES), width=8, state="readonly"
+        )
+        listen_combo.pack(side=tk.LEFT, padx=6)
+        listen_combo.bind("<<ComboboxSelected>>", self.on_listen_mode_change)
+
         ttk.Checkbutton(options, text="Voice", variable=self.voice_on, command=self.on_voice_toggle).pack(
             side=tk.LEFT, padx=8
         )
         ttk.Checkbutton(options, text="Help overlay", variable=self.help_on).pack(side=tk.LEFT, padx=8)
-        ttk.Checkbutton(options, text="Avatar", variable=self.avatar_enabled).pack(side=tk.LEFT, padx=8)
+        ttk.Checkbutton(
+            options, text="Avatar", variable=self.avatar_enabled, command=self.update_perception_consumers
+        ).pack(side=tk.LEFT, padx=8)
 
         ttk.Label(options, text="Avatar width %").pack(side=tk.LEFT, padx=(16, 4))
         ttk.Scale(
@@ -151,6 +217,71 @@ class VideoAssistantGUI:
         self.accent_entry.pack(side=tk.LEFT)
         ttk.Button(options, text="Apply", command=self.apply_accent).pack(side=tk.LEFT, padx=4)
 
+        # Performanță / percepție
+        perf = ttk.Frame(self.root, padding=(8, 0, 8, 0))
+        perf.pack(side=tk.TOP, fill=tk.X)
+        ttk.Label(perf, text="Profile:").pack(side=tk.LEFT, padx=(0, 4))
+        self.profile_var = tk.StringVar(value="auto")
+        profile_combo = ttk.Combobox(
+            perf, textvariable=self.profile_var, values=["auto"] + list(PROFILES), width=13, state="readonly"
+        )
+        profile_combo.pack(side=tk.LEFT)
+        profile_combo.bind("<<ComboboxSelected>>", self.on_profile_change)
+
+        self.reactions_on = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            perf, text="Reactions", variable=self.reactions_on, command=self.update_perception_consumers
+        ).pack(side=tk.LEFT, padx=8)
+
+        ttk.Label(perf, text="Mesh:").pack(side=tk.LEFT, padx=(8, 4))
+        self.mesh_lod = tk.StringVar(value="full")
+        lod_combo = ttk.Combobox(
+            perf, textvariable=self.mesh_lod, values=["full", "contours", "none"], width=9, state="readonly"
+        )
+        lod_combo.pack(side=tk.LEFT)
+        lod_combo.bind("<<ComboboxSelected>>", self.on_lod_change)
+
+        ttk.Label(perf, text="Faces:").pack(side=tk.LEFT, padx=(8, 4))
+        self.max_faces = tk.StringVar(value="1")
+        faces_combo = ttk.Combobox(
+            perf, textvariable=self.max_faces, values=[str(n) for n in range(1, 7)], width=3, state="readonly"
+        )
+        faces_combo.pack(side=tk.LEFT)
+        faces_combo.bind("<<ComboboxSelected>>", self.on_max_faces_change)
+
+        ttk.Label(perf, text="Target FPS:").pack(side=tk.LEFT, padx=(8, 4))
+        self.target_fps = tk.StringVar(value="30")
+        fps_combo = ttk.Combobox(
+            perf, textvariable=self.target_fps, values=["off", "10", "15", "20", "30"], width=5, state="readonly"
+        )
+        fps_combo.pack(side=tk.LEFT)
+        fps_combo.bind("<<ComboboxSelected>>", self.on_target_fps_change)
+
+        self.motion_gate_on = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            perf, text="Motion gate", variable=self.motion_gate_on, command=self.on_motion_gate_toggle
+        ).pack(side=tk.LEFT, padx=8)
+
+        self.record_landmarks = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            perf, text="Record landmarks", variable=self.record_landmarks, command=self.on_landmarks_toggle
+        ).pack(side=tk.LEFT, padx=8)
+
+        self.event_server_on = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            perf, text="Event server", variable=self.event_server_on, command=self.on_event_server_toggle
+        ).pack(side=tk.LEFT, padx=8)
+
+        self.shm_out_on = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            perf, text="Shared memory out", variable=self.shm_out_on, command=self.on_shm_out_toggle
+        ).pack(side=tk.LEFT, padx=8)
+
+        ttk.Label(perf, text="New gesture:").pack(side=tk.LEFT, padx=(8, 4))
+        self.gesture_name_entry = ttk.Entry(perf, width=12)
+        self.gesture_name_entry.pack(side=tk.LEFT)
+        ttk.Button(perf, text="Record", command=self.on_record_gesture).pack(side=tk.LEFT, padx=4)
+
         self.video_label = ttk.Label(self.root)
         self.video_label.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
 
@@ -167,6 +298,17 @@ class VideoAssistantGUI:
         self.history_list = tk.Listbox(hist_frame, height=6)
         self.history_list.pack(fill=tk.X)
 
+        # Captures (din catalog, fără scanarea directorului)
+        cap_frame = ttk.Frame(self.root, padding=(8, 0, 8, 8))
+        cap_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        ttk.Label(cap_frame, text="Captures (recent):").pack(anchor="w")
+        self.captures_thumb = ttk.Label(cap_frame)
+        self.captures_thumb.pack(side=tk.RIGHT, padx=(8, 0))
+        self.captures_list = tk.Listbox(cap_frame, height=5)
+        self.captures_list.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.captures_list.bind("<<ListboxSelect>>", self.on_capture_select)
+        self._capture_entries = []
+
         self.root.bind("<Escape>", lambda e: self.on_quit())
         self.root.protocol("WM_DELETE_WINDOW", self.on_quit)
 
@@ -177,8 +319,29 @@ class VideoAssistantGUI:
         if self.history_list.size() > 20:
             self.history_list.delete(0)
 
+    def refresh_captures(self):
+        self._capture_entries = self.cmd.catalog.recent(20)
+        self.captures_list.delete(0, tk.END)
+        for entry in self._capture_entries:
+            self.captures_list.insert(tk.END, entry.label())
+
+    def on_capture_select(self, _evt=None):
+        sel = self.captures_list.curselection()
+        if not sel or sel[0] >= len(self._capture_entries):
+            return
+        thumb = self.cmd.catalog.thumbnail(self._capture_entries[sel[0]].id)
+        if not thumb:
+            self.captures_thumb.config(image="")
+            return
+        imgtk = ImageTk.PhotoImage(image=Image.open(io.BytesIO(thumb)))
+        self.captures_thumb.imgtk = imgtk
+        self.captures_thumb.config(image=imgtk)
+
     def log(self, msg):
         self.log_text.insert(tk.END, time.strftime("[%H:%M:%S] ") + msg + "\n")
+        extra = int(self.log_text.index("end-1c").split(".")[0]) - 1 - LOG_MAX_LINES
+        if extra > 0:
+            self.log_text.delete("1.0", f"{extra + 1}.0")
         self.log_text.see(tk.END)
 
     def refresh_gui_colors(self):
@@ -196,8 +359,110 @@ class VideoAssistantGUI:
             self.speech.set_language_lock(self.lang_lock)
         self.log(f"Language lock: {self.lang_lock or 'auto'}")
 
+    def on_listen_mode_change(self, _evt=None):
+        gate = self.listen_gate
+        gate.set_mode(self.listen_mode.get())
+        self.perc.set_consumer("listen_gate", gate.features())
+        hints = {
+            "always": "every phrase is recognized",
+            "gesture": f"raise an eyebrow or hold OK for {gate.hold:.1f}s to listen for {gate.window:.0f}s",
+            "mouth": "only phrases spoken while your mouth moves",
+        }
+        self.log(f"Listen: {gate.mode} ({hints[gate.mode]})")
+
+    def on_lod_change(self, _evt=None):
+        self.perc.set_lod(self.mesh_lod.get())
+        self.log(f"Mesh LOD: {self.mesh_lod.get()}")
+
+    def on_max_faces_change(self, _evt=None):
+        self.perc.set_max_faces(int(self.max_faces.get()))
+        self.log(f"Max faces: {self.perc.max_faces} (primary = longest tracked)")
+
+    def on_target_fps_change(self, _evt=None):
+        sel = self.target_fps.get()
+        self.governor.set_target(None if sel == "off" else float(sel))
+        self.log(f"Target FPS: {sel} ({self.governor.summary()})")
+
+    def on_motion_gate_toggle(self):
+        gate = self.perc.motion_gate
+        if gate is not None:
+            gate.enabled = self.motion_gate_on.get()
+            gate.reset()
+            self.log(f"Motion gate: {'on' if gate.enabled else 'off'}")
+
+    def _log_motion_gate(self, now: float, force: bool = False):
+        """Rata de skip + timpul de inferență economisit, periodic (și la oprirea camerei)."""
+        gate = self.perc.motion_gate
+        if gate is None or not gate.checked:
+            return
+        if force or now - getattr(self, "last_gate_log", now) > 30.0:
+            self.log(gate.summary())
+            gate.reset_stats()
+            self.last_gate_log = now
+        elif not hasattr(self, "last_gate_log"):
+            self.last_gate_log = now
+
+    def on_event_server_toggle(self):
+        if self.event_server_on.get():
+            srv = EventServer(
+                port=EVENT_SERVER_PORT,
+                on_clients=self.ui.wrap(self._on_event_clients),
+                log_fn=self.ui.wrap(self.log),  # pornire / oprire / clienți, din thread-ul serverului
+            )
+            if not srv.start():
+                self.event_server_on.set(False)
+                return
+            self.events = srv
+        elif self.events is not None:
+            self.events.stop()
+            self.events = None
+            self.perc.set_consumer("event_server", None)
+
+    def on_shm_out_toggle(self):
+        if self.shm_out_on.get():
+            try:
+                self.frame_sink = SharedMemorySink()
+            except OSError as e:
+                self.log(f"Shared memory out: failed ({e}).")
+                self.shm_out_on.set(False)
+                return
+            self.log(f"Shared memory out: '{self.frame_sink.name}' "
+                     f"(reader: python frame_sink_reader.py)")
+        elif self.frame_sink is not None:
+            self.frame_sink.close()
+            self.frame_sink = None
+            self.log("Shared memory out: off.")
+
+    def _on_event_clients(self, n: int):
+        # clienții conectați primesc toate detecțiile -> profilul 'auto' le pornește
+        self.perc.set_consumer("event_server", ALL_FEATURES if n else None)
+        self.log(f"Event server: {n} client(s) connected.")
+
+    def publish_event(self, topic: str, **fields):
+        if self.events is not None:
+            self.events.publish(topic, **fields)
+
+    def on_capture_saved(self, entry):
+        self.ui.post(self.refresh_captures)
+        self.publish_event("capture", kind=entry.kind, path=entry.path, trigger=entry.trigger)
+
     def on_voice_toggle(self):
         self.tts.set_enabled(self.voice_on.get())
+        self.update_perception_consumers()
+
+    def update_perception_consumers(self):
+        """Spune percepției ce detecții sunt folosite (profilul 'auto' pornește doar modelele necesare)."""
+        gestures = HAND_FEATURES | {FEAT_SMILE, FEAT_EYEBROW}
+        before = self.perc.profile
+        self.perc.set_consumer("avatar", ALL_FEATURES if self.avatar_enabled.get() else None)
+        self.perc.set_consumer("voice_feedback", gestures if self.voice_on.get() else None)
+        self.perc.set_consumer("reactions", gestures if self.reactions_on.get() else None)
+        if self.perc.profile != before:
+            self.log(f"Perception profile -> {self.perc.profile.describe()}")
+
+    def on_profile_change(self, _evt=None):
+        profile = self.perc.set_profile(self.profile_var.get())
+        self.log(f"Perception profile -> {profile.describe()}")
 
     def on_theme_change(self, _evt=None):
         theme.set_theme(self.theme_mode.get())
@@ -253,34 +518,70 @@ class VideoAssistantGUI:
     def start_camera(self):
         if self.running:
             return
-        self.cap = cv2.VideoCapture(0)
-        if not self.cap.isOpened():
-            self.log("ERROR: Could not open camera.")
+        # fișierele se redau în timp real: Frame.ts = momentul citirii, nu timpul din fișier
+        self.source = open_source(self.source_spec, realtime=True)
+        if self.source is None:
+            self.log(f"ERROR: Could not open frame source '{self.source_spec}'.")
             return
+        self.log(f"Source: {self.source.describe()}")
+        # sursă marcată ('stamp:...'): latența captură -> percepție -> randare -> afișare
+        self.probe = LatencyProbe(self.source) if isinstance(self.source, StampedSource) else None
         self.running = True
         self.btn_start.config(state=tk.DISABLED)
         self.btn_stop.config(state=tk.NORMAL)
         self.btn_ss.config(state=tk.NORMAL)
         self.btn_rec.config(state=tk.NORMAL)
+        self.btn_replay.config(state=tk.NORMAL)
         self.last_ok_spoken = 0.0
         self.last_smile_spoken = 0.0
         self.last_thumb_spoken = 0.0
         self.last_brow_spoken = 0.0
+        self._last_states = (None, None)
         self.update_frame()
 
     def stop_camera(self):
         self.running = False
+        self._log_motion_gate(time.time(), force=True)
+        if self.listen_gate.mode != "always":
+            self.log(self.listen_gate.summary())
+        self._export_session()
+        if getattr(self, "probe", None) is not None:
+            self.log(self.probe.summary())
+            self.probe = None
         if self.recording:
             self._stop_recording()
         self.btn_start.config(state=tk.NORMAL)
         self.btn_stop.config(state=tk.DISABLED)
         self.btn_ss.config(state=tk.DISABLED)
         self.btn_rec.config(state=tk.DISABLED)
-        if self.cap:
-            self.cap.release()
-            self.cap = None
+        self.btn_replay.config(state=tk.DISABLED)
+        if self.source:
+            self.source.release()
+            self.source = None
         self.video_label.config(image="")
 
+    def _export_session(self):
+        """La oprirea camerei: sumar în log + seriile de timp în captures/session_*.npz/.csv (pe un worker)."""
+        if not len(self.features):
+            return
+        # copie cronologică: store-ul live se golește imediat și poate primi o sesiune nouă
+        store = FeatureStore.from_columns(self.features.window(), self.features.gesture_names)
+        self.features.clear()
+        base = os.path.join(self.base_dir, "captures", time.strftime("session_%Y%m%d_%H%M%S"))
+
+        def _run():
+            self.ui.post(self.log, store.summary())
+            try:
+                os.makedirs(os.path.dirname(base), exist_ok=True)
+                store.export_npz(base + ".npz")
+                store.export_csv(base + ".csv")
+                self.ui.post(self.log, f"Session features -> {base}.npz/.csv")
+            except OSError as e:
+                self.ui.post(self.log, f"Session export failed: {e}")
+
+        self._export_thread = threading.Thread(target=_run, name="session-export", daemon=True)
+        self._export_thread.start()
+
     def _start_recording(self):
         fourcc = cv2.VideoWriter_fourcc(*"mp4v")
         os.makedirs(os.path.join(self.base_dir, "captures"), exist_ok=True)
@@ -289,6 +590,9 @@ class VideoAssistantGUI:
         )
         size = self.frame_size if self.frame_size else (640, 480)
         self.video_writer = cv2.VideoWriter(path, fourcc, 30.0, size)
+        self.record_path = path
+        self.record_started = time.time()
+        self.record_first_frame = None
         self.recording = True
         self.btn_rec.config(text="Stop Recording")
         self.log(f"Recording started: {path}")
@@ -297,41 +601,152 @@ class VideoAssistantGUI:
         if self.video_writer:
             self.video_writer.release()
             self.video_writer = None
+            if self.record_first_frame is not None:
+                self.cmd.register_recording(
+                    self.record_path, self.record_first_frame,
+                    duration=time.time() - self.record_started, trigger="button",
+                )
         self.recording = False
         self.btn_rec.config(text="Start Recording")
         self.log("Recording stopped.")
 
+    def on_landmarks_toggle(self):
+        if self.record_landmarks.get() and self.landmark_rec is None:
+            path = os.path.join(self.cmd.captures_dir, time.strftime("landmarks_%Y%m%d_%H%M%S.lmk"))
+            self.landmark_rec = LandmarkRecorder(path)
+            self.landmark_rec_started = time.time()
+            self.log(f"Landmark recording started: {path}")
+        elif not self.record_landmarks.get() and self.landmark_rec is not None:
+            rec, self.landmark_rec = self.landmark_rec, None
+            rec.close()
+            w, h = self.frame_size if self.frame_size else (0, 0)
+            self.cmd.catalog.add("landmarks", rec.path, w, h, time.time() - self.landmark_rec_started, "button")
+            self.refresh_captures()
+            self.log(f"Landmark recording stopped: {rec.frames} frames -> {rec.path}")
+
+    def on_record_gesture(self):
+        name = self.gesture_name_entry.get().strip().lower().replace(" ", "_")
+        if not name:
+            self.log("Gesture: enter a name first.")
+            return
+        self.template_rec = TemplateRecorder(name, frames=20)
+        self.log(f"Gesture '{name}': hold the pose in front of the camera...")
+
+    def _feed_template_recorder(self):
+        if self.template_rec is None or not self.template_rec.feed(self.perc.last_hand_pts):
+            return
+        rec, self.template_rec = self.template_rec, None
+        self.perc.add_gesture_template(rec.name, rec.template())
+        self.log(f"Gesture '{rec.name}' recorded ({len(self.perc.gesture_lib)} gestures in library).")
+        self.add_history(f"Gesture template: {rec.name}")
+
     def toggle_recording(self):
         if not self.recording:
             self._start_recording()
         else:
             self._stop_recording()
 
+    def snapshot_frame(self):
+        """Ultimul cadru (oglindit, fără overlay-uri); materializat doar la cerere."""
+        snap = self._snapshot
+        return snap.get() if snap is not None else None
+
     def on_screenshot(self):
-        if self.last_frame is None:
+        frame = self.snapshot_frame()
+        if frame is None:
             self.log("No frame to capture.")
             return
-        path = self.cmd.take_screenshot(self.last_frame)
+        path = self.cmd.take_screenshot(frame, trigger="button")
         self.log(f"Screenshot salvat: {path}")
         self.add_history(f"Screenshot -> {path}")
 
-    def update_frame(self):
-        if not self.running or not self.cap:
+    def on_export_trace(self, quiet: bool = False):
+        """Percentile per etapă în log + trace Chrome (chrome://tracing / Perfetto) în captures/."""
+        if not self.tracer.traces:
+            if not quiet:
+                self.log("Voice trace: no phrases yet.")
             return
+        self.log(self.tracer.summary())
+        path = os.path.join(self.base_dir, "captures", time.strftime("voice_trace_%Y%m%d_%H%M%S.json"))
+        try:
+            self.tracer.export_chrome(path)
+            self.log(f"Voice trace -> {path}")
+        except OSError as e:
+            self.log(f"Voice trace export failed: {e}")
+
+    def on_save_replay(self):
+        def _done(path):
+            msg = f"Replay salvat: {path}" if path else "Replay: save failed."
+            self.ui.post(self.log, msg)
+            self.ui.post(self.add_history, msg)
+
+        path = self.cmd.save_replay(self.replay, on_done=_done, trigger="button")
+        if path:
+            self.log(f"Replay: salvez ultimele {int(self.replay.seconds)}s -> {path}")
+        else:
+            self.log("Replay: buffer empty.")
 
-        ok, frame = self.cap.read()
-        if not ok:
-            self.stop_camera()
+    def update_frame(self):
+        if not self.running or not self.source:
             return
 
-        frame = cv2.flip(frame, 1)
-        self.last_frame = frame.copy()
-        frame, hand_state, face_state = self.perc.process(frame)
+        captured = self.source.read()
+        if captured is None:
+            if self.source.is_opened():
+                # niciun cadru nou în read_timeout (sughiț al camerei): se sare doar tick-ul
+                self.root.after(10, self.update_frame)
+            else:
+                self.stop_camera()  # camera deconectată / sfârșitul fișierului
+            return
+        frame, capture_ts = captured.image, captured.ts
+
+        gov = self.governor
+        run_perception = gov.begin_frame()
+        level = gov.level
+
+        # sursele întorc un array nou la fiecare citire: cadrul brut rămâne neatins,
+        # iar flip-ul se face într-un buffer refolosit (fără copie per cadru)
+        self._snapshot = LazySnapshot(frame, flip_code=1)
+        frame = self.pool.flip(frame, 1)
+        with gov.stage("perception"):
+            if run_perception:
+                self.perc.infer_scale = level.infer_scale
+                frame, hand_state, face_state = self.perc.process(frame, draw=False, ts=capture_ts)
+                self._last_states = (hand_state, face_state)
+                if self.landmark_rec is not None:
+                    self.landmark_rec.write(capture_ts, frame.shape[1], frame.shape[0],
+                                            self.perc.last_hand_pts, self.perc.last_faces_pts,
+                                            self.perc.face_ids)
+                self._feed_template_recorder()
+            else:
+                # cadru sărit de governor: refolosim ultimele stări
+                hand_state, face_state = self._last_states
         self.frame_size = (frame.shape[1], frame.shape[0])
+        self.features.append(capture_ts, hand_state, face_state)
+        if self.listen_gate.observe(capture_ts, hand_state, face_state):
+            self.log(f"Listening for {self.listen_gate.window:.0f}s...")
+        probe = self.probe
+        if probe is not None:
+            probe.mark("perception", frame)
+        if self.events is not None:
+            self.events.publish_frame(capture_ts, hand_state, face_state)
+
+        with gov.stage("landmarks"):
+            self.perc.set_lod(cap_lod(self.mesh_lod.get(), level.lod_cap))
+            self.perc.draw_landmarks(frame)
 
         working_lang = self.lang_lock or self.current_lang or "en"
-        self.perc.draw_assistant_reactions(frame, hand_state, face_state)
-        self.perc.draw_hud(frame, working_lang, tts_on=self.voice_on.get(), help_on=self.help_on.get())
+        with gov.stage("overlays"):
+            if self.reactions_on.get():
+                self.perc.draw_assistant_reactions(frame, hand_state, face_state)
+            self.perc.draw_hud(frame, working_lang, tts_on=self.voice_on.get(), help_on=self.help_on.get())
+            listening = self.listen_gate.remaining(capture_ts)
+            if listening > 0:
+                # în bara HUD, aliniat la dreapta: colțul de jos e rezervat codului de latență (stamp:)
+                text = f"Listening {listening:.1f}s"
+                tw, _th, _base = measure(text, 24, bold=True)
+                put_text(frame, text, (frame.shape[1] - 20 - tw, 40), 24,
+                         theme.COLORS['accent'], bold=True)
 
         # Spoken feedback (rate-limited)
         now = time.time()
@@ -353,33 +768,63 @@ class VideoAssistantGUI:
             self.last_smile_spoken = now
             self.add_history("Gesture: Smile")
 
+        gesture = hand_state.gesture if hand_state else ""
+        if gesture and gesture not in ("ok", "thumbs_up") and (
+            gesture != getattr(self, "last_template_gesture", "")
+            or now - getattr(self, "last_template_gesture_t", 0) > 3.0
+        ):
+            self.last_template_gesture, self.last_template_gesture_t = gesture, now
+            self.add_history(f"Gesture: {gesture}")
+
         if face_state and face_state.eyebrow_raise and (now - getattr(self, "last_brow_spoken", 0) > 3.0):
             if self.voice_on.get():
                 self.tts.speak("Hmm?" if working_lang != "ro" else "Interesant!")
             self.last_brow_spoken = now
             self.add_history("Gesture: Eyebrow raise")
 
+        self._log_motion_gate(now)
+
         # Avatar panel
         if self.avatar_enabled.get():
-            H, W = frame.shape[:2]
-            panel_w = int(W * (self.avatar_width_pct.get() / 100.0))
-            state = {
-                "smile": bool(face_state and face_state.smiling),
-                "eyebrow_raise": bool(face_state and face_state.eyebrow_raise),
-                "ok": bool(hand_state and hand_state.ok_gesture),
-                "thumbs_up": bool(hand_state and hand_state.thumbs_up),
-                "gaze": (face_state.gaze_offset if face_state else (0.0, 0.0)),
-                "speech": self.last_avatar_text,
-            }
-            self.avatar.draw(frame, W - panel_w - 12, 12, panel_w, int(H * 0.50), state)
-
-        if self.recording and self.video_writer:
-            self.video_writer.write(frame)
-
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        imgtk = ImageTk.PhotoImage(image=Image.fromarray(rgb))
-        self.video_label.imgtk = imgtk
-        self.video_label.configure(image=imgtk)
+            with gov.stage("avatar"):
+                H, W = frame.shape[:2]
+                panel_w = int(W * (self.avatar_width_pct.get() / 100.0))
+                panel_h = int(H * 0.50)
+                state = {
+                    "smile": bool(face_state and face_state.smiling),
+                    "eyebrow_raise": bool(face_state and face_state.eyebrow_raise),
+                    "ok": bool(hand_state and hand_state.ok_gesture),
+                    "thumbs_up": bool(hand_state and hand_state.thumbs_up),
+                    "gaze": (face_state.gaze_offset if face_state else (0.0, 0.0)),
+                    "speech": self.last_avatar_text,
+                }
+                self.avatar_renderer.update((panel_w, panel_h), state)
+                if not self.avatar_renderer.composite(frame, W - panel_w - 12, 12):
+                    # primul cadru / panou redimensionat: desen sincron până vine cadrul randat
+                    self.avatar.draw(frame, W - panel_w - 12, 12, panel_w, panel_h, state)
+
+        if probe is not None:
+            probe.mark("render", frame)
+
+        with gov.stage("output"):
+            if self.recording and self.video_writer:
+                self.video_writer.write(frame)
+                if self.record_first_frame is None:
+                    self.record_first_frame = frame.copy()
+            self.replay.push(frame, capture_ts)
+            if self.frame_sink is not None:
+                self.frame_sink.write(frame, capture_ts)
+                if probe is not None:
+                    probe.mark("sink", frame)
+
+        with gov.stage("display"):
+            rgb = self.pool.cvt_color(frame, cv2.COLOR_BGR2RGB, "display")
+            imgtk = ImageTk.PhotoImage(image=Image.fromarray(rgb))
+            self.video_label.imgtk = imgtk
+            self.video_label.configure(image=imgtk)
+            if probe is not None:
+                probe.mark("display", rgb)
+        gov.end_frame()
 
         self.root.after(10, self.update_frame)
 
@@ -388,19 +833,61 @@ class VideoAssistantGUI:
             self.stop_camera()
         except Exception:
             pass
+        if self._export_thread is not None:
+            self._export_thread.join(timeout=10.0)  # fișierele sesiunii se scriu până la capăt
+        try:
+            if self.landmark_rec is not None:
+                self.record_landmarks.set(False)
+                self.on_landmarks_toggle()
+        except Exception:
+            pass
         try:
             if self.speech:
                 self.speech.stop()
         except Exception:
             pass
+        try:
+            self.on_export_trace(quiet=True)
+        except Exception:
+            pass
         try:
             self.tts.stop()
         except Exception:
             pass
+        try:
+            self.avatar_renderer.stop()
+        except Exception:
+            pass
+        try:
+            self.replay.close()
+        except Exception:
+            pass
+        try:
+            if self.events is not None:
+                self.events.stop()
+        except Exception:
+            pass
+        try:
+            if self.frame_sink is not None:
+                self.frame_sink.close()
+        except Exception:
+            pass
+        try:
+            self.log(self.dispatcher.summary())
+            self.dispatcher.shutdown()
+            self.ui.close()
+        except Exception:
+            pass
+        try:
+            self.cmd.close()  # așteaptă scrierea replay-ului în curs înainte de a închide catalogul
+        except Exception:
+            pass
         self.root.destroy()
 
 
 if __name__ == "__main__":
+    import sys
     root = tk.Tk()
-    app = VideoAssistantGUI(root)
+    # python main_tk2.py [0|1|synthetic|video.mp4]
+    app = VideoAssistantGUI(root, source_spec=sys.argv[1] if len(sys.argv) > 1 else "0")
     root.mainloop()
@@ -0,0 +1,117 @@
+"""
+Motion gate: sare peste inferența MediaPipe când scena e statică.
+
+Cadrul e redus la o imagine gri mică (ex. 160 px lățime) și comparat cu
+imaginea de la ultima inferență (nu cu cadrul precedent, ca mișcările lente
+să se acumuleze și să declanșeze totuși). Decizia:
+    - diferența medie în ROI-urile mâinii / feței (extinse cu o margine) > `roi_threshold`
+    - sau fracțiunea de pixeli schimbați în tot cadrul > `global_fraction`
+      (o mână care intră în cadru nu e încă în niciun ROI)
+    - sau a trecut `refresh_every` de la ultima inferență (împotriva drift-ului)
+Pe cadrele sărite `Perception` refolosește landmark-urile și stările anterioare.
+"""
+import time
+from typing import Iterable, Optional
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    def __init__(self, width: int = 160, roi_threshold: float = 3.0, pixel_threshold: int = 18,
+                 global_fraction: float = 0.01, refresh_every: float = 0.5, roi_margin: float = 0.25):
+        self.width = width
+        self.roi_threshold = roi_threshold      # diferență medie (0..255) în ROI-uri
+        self.pixel_threshold = pixel_threshold  # un pixel "s-a schimbat" peste acest prag
+        self.global_fraction = global_fraction
+        self.refresh_every = refresh_every      # inferență forțată cel puțin la atâtea secunde
+        self.roi_margin = roi_margin            # extinderea bbox-ului, raportată la mărimea lui
+        self.enabled = True
+        self._ref: Optional[np.ndarray] = None  # gri mic de la ultima inferență
+        self._small: Optional[np.ndarray] = None
+        self._gray: Optional[np.ndarray] = None
+        self._diff: Optional[np.ndarray] = None
+        self._last_infer = 0.0
+        # statistici
+        self.checked = 0
+        self.skipped = 0
+        self.infer_ms = 0.0  # EMA a costului unei inferențe (pentru timpul economisit)
+        self.last_score = 0.0
+
+    def reset(self):
+        """Forțează inferența la următorul cadru (ex. după schimbarea profilului)."""
+        self._ref = None
+
+    def _downsample(self, frame_bgr: np.ndarray) -> np.ndarray:
+        h, w = frame_bgr.shape[:2]
+        sw = min(self.width, w)
+        sh = max(1, int(round(h * sw / w)))
+        if self._small is None or self._small.shape[:2] != (sh, sw):
+            self._small = np.empty((sh, sw, 3), dtype=np.uint8)
+            self._gray = np.empty((sh, sw), dtype=np.uint8)
+            self._diff = np.empty((sh, sw), dtype=np.uint8)
+        cv2.resize(frame_bgr, (sw, sh), dst=self._small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        return self._gray
+
+    def _roi_score(self, diff: np.ndarray, rois: Iterable[np.ndarray], scale: float) -> float:
+        h, w = diff.shape
+        total, area = 0.0, 0
+        for pts in rois:
+            if pts is None or not len(pts):
+                continue
+            lo = np.nanmin(pts, axis=0) * scale
+            hi = np.nanmax(pts, axis=0) * scale
+            pad = (hi - lo) * self.roi_margin + 2
+            x0, y0 = np.clip(np.floor(lo - pad), 0, (w, h)).astype(int)
+            x1, y1 = np.clip(np.ceil(hi + pad), 0, (w, h)).astype(int)
+            if x1 <= x0 or y1 <= y0:
+                continue
+            patch = diff[y0:y1, x0:x1]
+            total += float(patch.sum())
+            area += patch.size
+        return total / area if area else 0.0
+
+    def should_infer(self, frame_bgr: np.ndarray, rois: Iterable[Optional[np.ndarray]] = (),
+                     now: Optional[float] = None) -> bool:
+        """`rois` = landmark-urile ultimei inferențe (pixeli, pe cadrul întreg)."""
+        now = time.time() if now is None else now
+        if not self.enabled:
+            return True
+        gray = self._downsample(frame_bgr)
+        self.checked += 1
+        if self._ref is None or now - self._last_infer >= self.refresh_every:
+            return self._accept(gray, now)
+        cv2.absdiff(gray, self._ref, dst=self._diff)
+        scale = gray.shape[1] / frame_bgr.shape[1]
+        self.last_score = self._roi_score(self._diff, rois, scale)
+        if self.last_score > self.roi_threshold:
+            return self._accept(gray, now)
+        changed = np.count_nonzero(self._diff > self.pixel_threshold) / self._diff.size
+        if changed > self.global_fraction:
+            return self._accept(gray, now)
+        self.skipped += 1
+        return False
+
+    def _accept(self, gray: np.ndarray, now: float) -> bool:
+        if self._ref is None or self._ref.shape != gray.shape:
+            self._ref = gray.copy()
+        else:
+            self._ref[...] = gray
+        self._last_infer = now
+        return True
+
+    def observe_infer(self, ms: float, alpha: float = 0.1):
+        self.infer_ms = ms if not self.infer_ms else (1 - alpha) * self.infer_ms + alpha * ms
+
+    def skip_rate(self) -> float:
+        return self.skipped / self.checked if self.checked else 0.0
+
+    def summary(self) -> str:
+        saved = self.skipped * self.infer_ms / 1000.0
+        return (f"Motion gate: skipped {self.skipped}/{self.checked} frames "
+                f"({self.skip_rate() * 100:.0f}%), saved ~{saved:.1f}s of inference "
+                f"(~{self.infer_ms:.0f} ms each)")
+
+    def reset_stats(self):
+        self.checked = self.skipped = 0
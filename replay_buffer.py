@@ -0,0 +1,143 @@
+"""
+Instant replay: ultimele N secunde de cadre adnotate, ținute ca JPEG în memorie.
+
+- `push` e apelat din bucla de cadre și nu blochează: cadrul e copiat/micșorat
+  și predat unui thread de encodare (coadă de 1 — dacă encoderul e ocupat,
+  cadrul e sărit);
+- ring-ul e limitat atât în timp (`seconds`) cât și în bytes (`max_bytes`);
+- `snapshot` + `write_mp4` decodează ring-ul și scriu un MP4 (apelat de
+  `CommandCenter.save_replay` pe un thread separat).
+"""
+import threading
+import queue
+import time
+from collections import deque
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class ReplayBuffer:
+    def __init__(self, seconds: float = 30.0, fps: float = 15.0, quality: int = 70,
+                 max_width: int = 960, max_bytes: int = 64 * 1024 * 1024):
+        self.seconds = float(seconds)
+        self.fps = float(fps)
+        self.quality = int(quality)
+        self.max_width = int(max_width)
+        self.max_bytes = int(max_bytes)
+        self._ring = deque()  # (ts, jpeg_bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._in = queue.Queue(maxsize=1)
+        self._last_push = 0.0
+        self.dropped = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._encode_loop, daemon=True)
+        self._thread.start()
+
+    # ---------- producer (UI thread) ----------
+    def push(self, frame_bgr, ts: Optional[float] = None):
+        ts = time.time() if ts is None else ts
+        if ts - self._last_push < 0.9 / self.fps:  # toleranță pentru jitter-ul camerei
+            return
+        if self._in.full():
+            self.dropped += 1
+            return
+        h, w = frame_bgr.shape[:2]
+        if w > self.max_width:
+            scale = self.max_width / float(w)
+            small = cv2.resize(frame_bgr, (self.max_width, int(h * scale)), interpolation=cv2.INTER_AREA)
+        else:
+            small = frame_bgr.copy()
+        try:
+            self._in.put_nowait((ts, small))
+            self._last_push = ts
+        except queue.Full:
+            self.dropped += 1
+
+    # ---------- encoder thread ----------
+    def _encode_loop(self):
+        params = [int(cv2.IMWRITE_JPEG_QUALITY), self.quality]
+        while not self._stop.is_set():
+            try:
+                item = self._in.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+            ts, frame = item
+            ok, buf = cv2.imencode(".jpg", frame, params)
+            if not ok:
+                continue
+            data = buf.tobytes()
+            with self._lock:
+                self._ring.append((ts, data))
+                self._bytes += len(data)
+                self._evict(ts)
+
+    def _evict(self, now: float):
+        ring = self._ring
+        while ring and (now - ring[0][0] > self.seconds or self._bytes > self.max_bytes):
+            _, old = ring.popleft()
+            self._bytes -= len(old)
+
+    # ---------- stats ----------
+    @property
+    def memory_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self):
+        return len(self._ring)
+
+    def duration(self) -> float:
+        with self._lock:
+            return self._ring[-1][0] - self._ring[0][0] if len(self._ring) > 1 else 0.0
+
+    def clear(self):
+        with self._lock:
+            self._ring.clear()
+            self._bytes = 0
+
+    # ---------- flush ----------
+    def snapshot(self, seconds: Optional[float] = None):
+        """Copie (ts, jpeg) a ultimelor `seconds` secunde (referințe la bytes, fără re-encodare)."""
+        with self._lock:
+            items = list(self._ring)
+        if seconds and items:
+            t_end = items[-1][0]
+            items = [it for it in items if t_end - it[0] <= seconds]
+        return items
+
+    @staticmethod
+    def write_mp4(items, path: str) -> Optional[str]:
+        if not items:
+            return None
+        first = cv2.imdecode(_as_array(items[0][1]), cv2.IMREAD_COLOR)
+        if first is None:
+            return None
+        h, w = first.shape[:2]
+        span = items[-1][0] - items[0][0]
+        fps = (len(items) - 1) / span if span > 0 else 15.0
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), max(1.0, fps), (w, h))
+        try:
+            writer.write(first)
+            for _, data in items[1:]:
+                img = cv2.imdecode(_as_array(data), cv2.IMREAD_COLOR)
+                if img is not None:
+                    writer.write(img)
+        finally:
+            writer.release()
+        return path
+
+    def close(self):
+        self._stop.set()
+        try:
+            self._in.put_nowait(None)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=1.5)
+
+
+def _as_array(data: bytes):
+    return np.frombuffer(data, dtype=np.uint8)
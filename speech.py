@@ -1,5 +1,7 @@
 
 import threading, time, queue
+from tracing import activate, span
+from vad import VAD, VADConfig
 try:
     import speech_recognition as sr
 except Exception:
@@ -9,12 +11,26 @@ class SpeechListener:
     """
     Background speech recognizer using SpeechRecognition (Google Web Speech API).
     Calls phrase_handler(text:str, lang:str) with 'ro' or 'en' best guess.
+    With a `tracing.Tracer`, every phrase gets a trace: endpointing -> recognize -> on_phrase (-> actions).
+    Endpointing uses the local NumPy VAD (`vad.py`, adaptive noise floor, ~300 ms hangover) on a capture
+    thread, so the microphone keeps listening while the previous phrase is recognized; use_vad=False falls back
+    to SpeechRecognition's energy threshold + pause_threshold.
+    `utterance_filter(start, end) -> (ok, reason)` (wall-clock speech interval, e.g. `ListenGate.allow`)
+    decides which phrases are sent to the recognizer at all.
     """
-    def __init__(self, phrase_handler=None, energy_threshold=300, pause_threshold=0.75):
+    def __init__(self, phrase_handler=None, energy_threshold=300, pause_threshold=0.75, tracer=None,
+                 use_vad=True, vad_config: VADConfig | None = None, utterance_filter=None):
         self.phrase_handler = phrase_handler
+        self.tracer = tracer
         self.energy_threshold = energy_threshold
         self.pause_threshold = pause_threshold
+        self.vad_config = (vad_config or VADConfig()) if use_vad else None
+        self.vad = None  # VAD activ (noise_db, discarded) când rulează
+        self.utterance_filter = utterance_filter
+        self.ignored = 0  # fraze oprite de filtru (nu au ajuns la recognizer)
+        self._utterances = queue.Queue(maxsize=8)
         self._thread = None
+        self._recognizer_thread = None
         self._stop = threading.Event()
         self._lang_lock = None  # 'ro' / 'en' / None
 
@@ -41,7 +57,13 @@ class SpeechListener:
         if not self.is_available() or self._thread:
             return
         self._stop.clear()
-        self._thread = threading.Thread(target=self._loop, daemon=True)
+        if self.vad_config is not None:
+            self._thread = threading.Thread(target=self._capture_loop, name="speech-capture", daemon=True)
+            self._recognizer_thread = threading.Thread(target=self._recognize_loop, name="speech-recognize",
+                                                       daemon=True)
+            self._recognizer_thread.start()
+        else:
+            self._thread = threading.Thread(target=self._loop, daemon=True)
         self._thread.start()
 
     def stop(self):
@@ -49,6 +71,82 @@ class SpeechListener:
         if self._thread:
             self._thread.join(timeout=1.5)
             self._thread = None
+        if self._recognizer_thread:
+            self._recognizer_thread.join(timeout=1.5)
+            self._recognizer_thread = None
+
+    def _recognize(self, r, audio, trace):
+        """Google recognizer: limba blocată sau 'ro', apoi fallback en-US; apelează handler-ul."""
+        text = ""
+        try:
+            lang = self._lang_lock or "ro"
+            with span(f"recognize:{lang}", trace):
+                text = r.recognize_google(audio, language=lang)
+        except Exception:
+            with span("recognize:en-US", trace):
+                text = r.recognize_google(audio, language="en-US")
+        if text and self.phrase_handler:
+            lang_detected = self._detect_lang(text)
+            with activate(trace), span("on_phrase", trace):
+                self.phrase_handler(text, lang_detected)
+        return text
+
+    def _accept(self, start: float, end: float) -> bool:
+        if self.utterance_filter is None:
+            return True
+        try:
+            ok, _reason = self.utterance_filter(start, end)
+        except Exception:
+            ok = True
+        if not ok:
+            self.ignored += 1
+        return ok
+
+    def _capture_loop(self):
+        """Citește continuu microfonul (cadre de 20 ms) și pune frazele închise de VAD în coadă."""
+        cfg = self.vad_config
+        try:
+            mic = sr.Microphone(sample_rate=cfg.sample_rate, chunk_size=cfg.frame_len)
+        except Exception:
+            return
+        self.vad = vad = VAD(cfg)
+        with mic as source:
+            while not self._stop.is_set():
+                try:
+                    data = source.stream.read(source.CHUNK)
+                except Exception:
+                    break
+                now = time.time()
+                for utt in vad.feed(data):
+                    # ceasul fluxului -> timp real: cadrul curent s-a terminat acum
+                    speech_end = now - (vad.time - utt.end)
+                    item = (utt, speech_end, now, source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+                    try:
+                        self._utterances.put_nowait(item)
+                    except queue.Full:
+                        pass  # recunoașterea e în urmă: fraza se pierde, captura nu se oprește
+
+    def _recognize_loop(self):
+        r = sr.Recognizer()
+        while not self._stop.is_set():
+            try:
+                utt, speech_end, t_heard, rate, width = self._utterances.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if not self._accept(speech_end - (utt.end - utt.start), speech_end):
+                continue
+            trace = None
+            text = ""
+            if self.tracer:
+                trace = self.tracer.begin("utterance", t0=speech_end, vad=True, forced=utt.forced)
+                trace.add("endpointing", speech_end, t_heard)
+            try:
+                text = self._recognize(r, sr.AudioData(utt.pcm.tobytes(), rate, width), trace)
+            except Exception:
+                pass
+            finally:
+                if trace is not None:
+                    self.tracer.finish(trace, ok=bool(text), text=text)
 
     def _loop(self):
         r = sr.Recognizer()
@@ -61,20 +159,27 @@ class SpeechListener:
         with mic as source:
             r.adjust_for_ambient_noise(source, duration=0.6)
         while not self._stop.is_set():
+            trace = None
+            text = ""
             try:
                 with mic as source:
+                    t_listen = time.time()
                     audio = r.listen(source, timeout=3, phrase_time_limit=6)
-                try:
-                    # prefer Romanian when likely; use lang lock if set
-                    lang = self._lang_lock or "ro"
-                    text = r.recognize_google(audio, language=lang)
-                except Exception:
-                    # fallback to English
-                    text = r.recognize_google(audio, language="en-US")
-                if text and self.phrase_handler:
-                    lang_detected = self._detect_lang(text)
-                    self.phrase_handler(text, lang_detected)
+                t_heard = time.time()
+                duration = len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+                if not self._accept(t_heard - duration, t_heard - self.pause_threshold):
+                    continue
+                if self.tracer:
+                    # vorbirea s-a terminat cu ~pause_threshold înainte ca listen() să întoarcă
+                    speech_end = max(t_listen, t_heard - self.pause_threshold)
+                    trace = self.tracer.begin("utterance", t0=speech_end)
+                    trace.add("endpointing", speech_end, t_heard)
+                # prefer Romanian when likely (lang lock if set), fallback to English
+                text = self._recognize(r, audio, trace)
             except Exception:
                 # timeout or recognition issue; continue
                 pass
+            finally:
+                if trace is not None:
+                    self.tracer.finish(trace, ok=bool(text), text=text)
     
\ No newline at end of file
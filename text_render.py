@@ -0,0 +1,282 @@
+"""
+Text TrueType (Pillow) pentru overlay-uri: diacritice RO + emoji, rasterizat o singură dată.
+
+`cv2.putText` (fonturi Hershey) știe doar ASCII: „Frumos zâmbet!” și „👍” ies
+cu semne de întrebare. Aici fiecare șir e rasterizat cu Pillow (fontul de text
++ un font de emoji pentru secvențele emoji) într-un bitmap BGR + alfa, ținut
+într-un cache LRU după (text, mărime, culoare, bold). Pe cadrele următoare
+desenarea înseamnă doar amestecarea bitmap-ului cu cadrul (un multiply + un
+add OpenCV pe un dreptunghi mic). Fără Pillow / fără font: fallback pe `cv2.putText`.
+
+    put_text(frame, "Bună! 👍", (20, 40), 28, (0, 200, 255))   # org = stânga, linia de bază
+    lines = wrap_text("text lung ...", 19, max_width=300)
+    put_text(frame, "Assistant: " + emoji("🙂", ":)"), ...)   # fără font de emoji: ASCII
+
+Fonturi: primele găsite din `TEXT_FONTS` / `EMOJI_FONTS` (Windows: Segoe UI +
+Segoe UI Emoji, macOS: Arial + Apple Color Emoji, Linux: DejaVu + Noto Color
+Emoji) sau variabilele de mediu ASSISTANT_FONT / ASSISTANT_EMOJI_FONT.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except Exception:
+    Image = ImageDraw = ImageFont = None
+
+TEXT_FONTS = (
+    "segoeui.ttf", "arial.ttf", "DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    "/System/Library/Fonts/Supplemental/Arial.ttf",
+    "/Library/Fonts/Arial.ttf",
+)
+BOLD_FONTS = (
+    "segoeuib.ttf", "arialbd.ttf", "DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+    "/Library/Fonts/Arial Bold.ttf",
+)
+EMOJI_FONTS = (
+    "seguiemj.ttf",
+    "/System/Library/Fonts/Apple Color Emoji.ttc",
+    "/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf",
+    "/usr/share/fonts/noto/NotoColorEmoji.ttf",
+    "/usr/share/fonts/google-noto-emoji/NotoColorEmoji.ttf",
+)
+_EMOJI_BITMAP_SIZE = 109  # fonturile emoji bitmap (Noto / Apple) există doar la mărimea asta
+
+
+def _is_emoji(ch: str) -> bool:
+    c = ord(ch)
+    return (0x1F000 <= c <= 0x1FAFF or 0x2600 <= c <= 0x27BF or 0x2B00 <= c <= 0x2BFF
+            or c in (0x200D, 0xFE0F, 0x20E3))
+
+
+def _runs(text: str) -> List[Tuple[bool, str]]:
+    """Împarte textul în secvențe (emoji?, text) — fiecare merge la fontul ei."""
+    out: List[Tuple[bool, str]] = []
+    for ch in text:
+        e = _is_emoji(ch)
+        if out and out[-1][0] == e:
+            out[-1] = (e, out[-1][1] + ch)
+        else:
+            out.append((e, ch))
+    return out
+
+
+class _Bitmap:
+    """Șir rasterizat: culoarea premultiplicată cu alfa + (255 - alfa), gata de amestecat."""
+    __slots__ = ("fg", "inv", "baseline", "width", "height")
+
+    def __init__(self, rgba: np.ndarray, baseline: int):
+        a = rgba[:, :, 3:4].astype(np.uint16)
+        fg = rgba[:, :, 2::-1].astype(np.uint16) * a   # RGB -> BGR, premultiplicat
+        self.fg = ((fg + 127) // 255).astype(np.uint8)
+        self.inv = np.repeat((255 - a).astype(np.uint8), 3, axis=2)
+        self.baseline = baseline
+        self.height, self.width = rgba.shape[:2]
+
+
+class TextRenderer:
+    def __init__(self, max_entries: int = 512, font_path: Optional[str] = None,
+                 bold_font_path: Optional[str] = None, emoji_font_path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.font_path = font_path or os.environ.get("ASSISTANT_FONT") or self._find(TEXT_FONTS)
+        self.bold_font_path = bold_font_path or self._find(BOLD_FONTS) or self.font_path
+        self.emoji_font_path = emoji_font_path or os.environ.get("ASSISTANT_EMOJI_FONT") or self._find(EMOJI_FONTS)
+        self._fonts = {}
+        self._cache: "OrderedDict[tuple, _Bitmap]" = OrderedDict()
+        self._wraps: "OrderedDict[tuple, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()  # avatarul se desenează pe alt thread
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def _find(candidates) -> Optional[str]:
+        if ImageFont is None:
+            return None
+        for path in candidates:
+            try:
+                ImageFont.truetype(path, 12)
+                return path
+            except OSError:
+                continue
+        return None
+
+    @property
+    def available(self) -> bool:
+        if ImageFont is None:
+            return False
+        if self.font_path is None and self._font(12)[0] is None:
+            return False  # Pillow < 10.1 fără fonturi TrueType: fallback pe Hershey
+        return True
+
+    def _font(self, size: int, bold: bool = False, emoji: bool = False):
+        """(font, scale): fonturile emoji bitmap se încarcă la mărimea lor și se scalează."""
+        key = (size, bold, emoji)
+        font = self._fonts.get(key)
+        if font is None:
+            path = self.emoji_font_path if emoji else (self.bold_font_path if bold else self.font_path)
+            font = (None, 1.0)
+            if path:
+                try:
+                    font = (ImageFont.truetype(path, size), 1.0)
+                except OSError:
+                    if emoji:
+                        try:
+                            font = (ImageFont.truetype(path, _EMOJI_BITMAP_SIZE), size / _EMOJI_BITMAP_SIZE)
+                        except OSError:
+                            pass
+            if font[0] is None and not emoji:
+                try:
+                    font = (ImageFont.load_default(size), 1.0)  # Pillow >= 10.1: font scalabil inclus
+                except TypeError:
+                    pass
+            self._fonts[key] = font
+        return font
+
+    # ---------- rasterizare ----------
+    def _rasterize(self, text: str, size: int, color, bold: bool) -> _Bitmap:
+        rgb = (int(color[2]), int(color[1]), int(color[0]))
+        ascent = descent = 1
+        pieces = []
+        for emoji, chunk in _runs(text):
+            font, scale = self._font(size, bold, emoji)
+            if font is None:  # fără font de emoji: secvența cu fontul de text
+                font, scale = self._font(size, bold)
+            l, t, r, b = font.getbbox(chunk, anchor="ls")
+            img = Image.new("RGBA", (max(1, r - l), max(1, b - t)), (0, 0, 0, 0))
+            ImageDraw.Draw(img).text((-l, -t), chunk, font=font, fill=rgb + (255,), anchor="ls",
+                                     embedded_color=emoji)
+            up, down = -t, b
+            if scale != 1.0:
+                img = img.resize((max(1, round(img.width * scale)), max(1, round(img.height * scale))),
+                                 Image.LANCZOS)
+                up, down = round(up * scale), round(down * scale)
+            pieces.append((img, up, max(0, l)))
+            ascent, descent = max(ascent, up), max(descent, down)
+        width = sum(img.width + pad for img, _, pad in pieces)
+        canvas = Image.new("RGBA", (max(1, width), ascent + descent), (0, 0, 0, 0))
+        x = 0
+        for img, up, pad in pieces:
+            x += pad
+            canvas.alpha_composite(img, (x, ascent - up))
+            x += img.width
+        return _Bitmap(np.asarray(canvas), ascent)
+
+    def bitmap(self, text: str, size: int, color=(255, 255, 255), bold: bool = False) -> _Bitmap:
+        key = (text, int(size), tuple(int(c) for c in color), bold)
+        with self._lock:
+            bmp = self._cache.get(key)
+            if bmp is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return bmp
+            self.misses += 1
+        bmp = self._rasterize(text, int(size), color, bold)
+        with self._lock:
+            self._cache[key] = bmp
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return bmp
+
+    # ---------- API ----------
+    def measure(self, text: str, size: int, bold: bool = False) -> Tuple[int, int, int]:
+        """(lățime, înălțime, linia de bază de la marginea de sus) în pixeli."""
+        if not self.available:
+            (w, h), base = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, size / 30.0, 2)
+            return w, h + base, h
+        bmp = self.bitmap(text, size, bold=bold)
+        return bmp.width, bmp.height, bmp.baseline
+
+    def put_text(self, frame, text: str, org: Tuple[int, int], size: int, color, bold: bool = False):
+        """Ca `cv2.putText`: `org` = capătul stâng al liniei de bază; `size` = mărimea fontului în pixeli."""
+        if not text:
+            return frame
+        if not self.available:
+            cv2.putText(frame, text, org, cv2.FONT_HERSHEY_SIMPLEX, size / 30.0, color, 2 if bold else 1)
+            return frame
+        bmp = self.bitmap(text, size, color, bold)
+        x, y = int(org[0]), int(org[1]) - bmp.baseline
+        H, W = frame.shape[:2]
+        x0, y0, x1, y1 = max(0, x), max(0, y), min(W, x + bmp.width), min(H, y + bmp.height)
+        if x0 >= x1 or y0 >= y1:
+            return frame
+        sy, sx = slice(y0 - y, y1 - y), slice(x0 - x, x1 - x)
+        roi = frame[y0:y1, x0:x1]
+        cv2.add(cv2.multiply(roi, bmp.inv[sy, sx], scale=1.0 / 255), bmp.fg[sy, sx], dst=roi)
+        return frame
+
+    def wrap(self, text: str, size: int, max_width: int, bold: bool = False) -> List[str]:
+        """Rupe textul pe cuvinte ca să încapă în `max_width` px (rezultat memorat per text)."""
+        key = (text, int(size), int(max_width), bold)
+        with self._lock:
+            lines = self._wraps.get(key)
+            if lines is not None:
+                self._wraps.move_to_end(key)
+                return lines
+        lines, line = [], ""
+        for word in text.split():
+            cand = (line + " " + word).strip()
+            if line and self.measure(cand, size, bold)[0] > max_width:
+                lines.append(line)
+                line = word
+            else:
+                line = cand
+        if line:
+            lines.append(line)
+        with self._lock:
+            self._wraps[key] = lines
+            while len(self._wraps) > self.max_entries:
+                self._wraps.popitem(last=False)
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._wraps.clear()
+
+    def stats(self) -> str:
+        with self._lock:
+            n = len(self._cache)
+        total = self.hits + self.misses
+        return (f"Text cache: {n}/{self.max_entries} strings, "
+                f"{100.0 * self.hits / total if total else 0.0:.1f}% hits")
+
+
+_default: Optional[TextRenderer] = None
+_default_lock = threading.Lock()
+
+
+def renderer() -> TextRenderer:
+    """Instanța comună (fonturile se caută o singură dată)."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = TextRenderer()
+    return _default
+
+
+def put_text(frame, text: str, org: Tuple[int, int], size: int, color, bold: bool = False):
+    return renderer().put_text(frame, text, org, size, color, bold)
+
+
+def measure(text: str, size: int, bold: bool = False) -> Tuple[int, int, int]:
+    return renderer().measure(text, size, bold)
+
+
+def wrap_text(text: str, size: int, max_width: int, bold: bool = False) -> List[str]:
+    return renderer().wrap(text, size, max_width, bold)
+
+
+def emoji(symbol: str, fallback: str) -> str:
+    """`symbol` dacă există un font de emoji, altfel varianta ASCII (ex. ":)")."""
+    r = renderer()
+    return symbol if r.available and r.emoji_font_path else fallback
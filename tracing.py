@@ -0,0 +1,168 @@
+"""
+Tracing pe etape pentru comenzile vocale (de la sfârșitul frazei până la acțiune).
+
+Fiecare frază primește un `Trace` cu ID; etapele sunt span-uri (start, durată,
+thread) adăugate de oricine o are „activă” pe thread-ul curent:
+
+    trace = tracer.begin("utterance")
+    with activate(trace):
+        with span("parse_and_run"):
+            ...
+
+Codul din aval (CommandCenter) folosește doar `span("...")` — fără trace activ
+nu face nimic. Pentru acțiuni pe alte thread-uri: `t = current()` înainte,
+apoi `with span("...", trace=t)` în thread. Ultimele N trace-uri stau într-un
+buffer mărginit; `stats()` dă percentile per etapă (fără trace-urile încheiate
+cu `ok=False`, ex. recunoaștere eșuată), `export_chrome(path)` scrie formatul
+Chrome trace (chrome://tracing / Perfetto) cu toate trace-urile.
+"""
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+
+_local = threading.local()
+
+
+class Trace:
+    def __init__(self, trace_id: int, name: str, t0: Optional[float] = None):
+        self.id = trace_id
+        self.name = name
+        self.t0 = time.time() if t0 is None else t0
+        self.t_end: Optional[float] = None
+        self.spans: List[tuple] = []  # (stage, start, end, thread_name)
+        self.args: Dict[str, object] = {}
+        self.ok = True  # False = fraza n-a produs text (nu intră în statistici)
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, start: float, end: float, thread: Optional[str] = None):
+        with self._lock:
+            self.spans.append((stage, start, end, thread or threading.current_thread().name))
+
+    @contextmanager
+    def span(self, stage: str):
+        start = time.time()
+        try:
+            yield self
+        finally:
+            self.add(stage, start, time.time())
+
+    def total(self) -> float:
+        """Durata totală: de la început până la ultimul span încheiat (inclusiv acțiuni async)."""
+        with self._lock:
+            ends = [e for _, _, e, _ in self.spans]
+        return max(ends + [self.t_end or self.t0]) - self.t0
+
+
+class Tracer:
+    def __init__(self, max_traces: int = 500):
+        self.traces: deque = deque(maxlen=max_traces)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def begin(self, name: str = "utterance", t0: Optional[float] = None, **args) -> Trace:
+        trace = Trace(next(self._ids), name, t0)
+        trace.args.update(args)
+        with self._lock:
+            self.traces.append(trace)
+        return trace
+
+    @staticmethod
+    def finish(trace: Trace, ok: bool = True, **args):
+        trace.args.update(args)
+        trace.ok = ok
+        trace.t_end = time.time()
+
+    def _snapshot(self) -> List[Trace]:
+        with self._lock:
+            return list(self.traces)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per etapă (+ 'total'): count, p50, p90, p99, max — în milisecunde (doar trace-urile reușite)."""
+        durations: Dict[str, List[float]] = {}
+        for t in self._snapshot():
+            if not t.ok:
+                continue
+            with t._lock:
+                spans = list(t.spans)
+            for stage, start, end, _ in spans:
+                durations.setdefault(stage, []).append((end - start) * 1000.0)
+            if t.t_end is not None:
+                durations.setdefault("total", []).append(t.total() * 1000.0)
+        out = {}
+        for stage, vals in durations.items():
+            a = np.asarray(vals)
+            p50, p90, p99 = np.percentile(a, (50, 90, 99))
+            out[stage] = {"count": len(a), "p50": float(p50), "p90": float(p90),
+                          "p99": float(p99), "max": float(a.max())}
+        return out
+
+    def summary(self) -> str:
+        st = self.stats()
+        failed = sum(1 for t in self._snapshot() if not t.ok)
+        if not st:
+            return "Voice latency: no traces yet." + (f" ({failed} unrecognized)" if failed else "")
+        order = sorted(st, key=lambda k: (k == "total", -st[k]["p50"]))
+        return "Voice latency (p50/p90 ms): " + ", ".join(
+            f"{k} {st[k]['p50']:.0f}/{st[k]['p90']:.0f}" for k in order) + (
+            f"; {failed} unrecognized excluded" if failed else "")
+
+    def export_chrome(self, path: str) -> str:
+        """Chrome trace (JSON): un rând (tid) per thread, un eveniment 'X' per span."""
+        events = []
+        tids: Dict[str, int] = {}
+        pid = os.getpid()
+        for t in self._snapshot():
+            with t._lock:
+                spans = list(t.spans)
+            args = {"utterance": t.id, "ok": t.ok, **{k: str(v) for k, v in t.args.items()}}
+            if t.t_end is not None:
+                events.append({"name": f"{t.name} #{t.id}", "cat": "utterance", "ph": "X", "pid": pid,
+                               "tid": 0, "ts": t.t0 * 1e6, "dur": t.total() * 1e6, "args": args})
+            for stage, start, end, thread in spans:
+                tid = tids.setdefault(thread, len(tids) + 1)
+                events.append({"name": stage, "cat": "stage", "ph": "X", "pid": pid, "tid": tid,
+                               "ts": start * 1e6, "dur": (end - start) * 1e6,
+                               "args": {"utterance": t.id}})
+        meta = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                for name, tid in tids.items()]
+        meta.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "utterances"}})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": meta + events, "displayTimeUnit": "ms",
+                       "stats": self.stats()}, f)
+        return path
+
+
+def current() -> Optional[Trace]:
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def activate(trace: Optional[Trace]):
+    """Face `trace` activ pe thread-ul curent (pentru `span()` din cod aval)."""
+    prev = current()
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = prev
+
+
+@contextmanager
+def span(stage: str, trace: Optional[Trace] = None):
+    """Span pe trace-ul dat sau pe cel activ; no-op dacă nu există niciunul."""
+    trace = trace or current()
+    if trace is None:
+        yield None
+        return
+    start = time.time()
+    try:
+        yield trace
+    finally:
+        trace.add(stage, start, time.time())
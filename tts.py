@@ -1,65 +1,303 @@
+"""
+TTS offline (pyttsx3) într-un proces separat.
+
+Motorul (`runAndWait`, driverul SAPI5 / NSSS / eSpeak) rulează într-un proces
+copil (`python tts.py --engine`), deci GUI-ul și bucla video nu așteaptă
+niciodată după sinteză, iar `stop()` se termină garantat (așteptare scurtă,
+apoi terminate). Protocolul IPC: câte un tablou JSON per linie pe stdin/stdout.
+
+    părinte -> copil:  ["speak", uid, text] | ["cancel"] | ["voice", id] | ["rate", wpm] | ["quit"]
+    copil -> părinte:  ["ready", [[voice_id, name], ...], external_loop]
+                       ["start", uid, t] | ["word", uid, location, length, t] | ["end", uid, completed, t]
+                       ["error", message]
+
+Evenimentele "word" (limitele de cuvânt raportate de driver) dau progresul
+real al rostirii: `on_progress(uid, location, length, fraction)` și
+`on_word()` pentru sincronizarea gurii avatarului.
+"""
+import itertools
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 
-import threading, queue, time
 try:
     import pyttsx3
 except Exception:
     pyttsx3 = None
 
+
+def _engine_main(rate: int, voice: Optional[str]):
+    """Procesul copil: bucla externă a lui pyttsx3 (iterate) + comenzile de pe stdin între iterații."""
+    out_lock = threading.Lock()
+
+    def emit(*ev):
+        with out_lock:
+            sys.stdout.write(json.dumps(ev) + "\n")
+            sys.stdout.flush()
+
+    commands: queue.Queue = queue.Queue()
+
+    def read_stdin():
+        for line in sys.stdin:
+            try:
+                commands.put(json.loads(line))
+            except ValueError:
+                continue
+        commands.put(["quit"])  # părintele a închis pipe-ul
+
+    threading.Thread(target=read_stdin, daemon=True).start()
+    try:
+        engine = pyttsx3.init()
+        engine.setProperty('rate', rate)
+        if voice:
+            engine.setProperty('voice', voice)
+    except Exception as e:
+        emit("error", f"init: {e}")
+        return
+    engine.connect('started-utterance', lambda name: emit("start", name, time.time()))
+    engine.connect('started-word', lambda name, location, length: emit("word", name, location, length, time.time()))
+    engine.connect('finished-utterance', lambda name, completed: emit("end", name, bool(completed), time.time()))
+    try:
+        voices = [(v.id, v.name) for v in engine.getProperty('voices')]
+    except Exception:
+        voices = []
+    try:
+        engine.startLoop(False)  # bucla externă: putem anula în timpul unei fraze
+        external = True
+    except Exception:
+        external = False  # driver fără buclă externă: runAndWait per frază, anularea doar între fraze
+    emit("ready", voices, external)
+
+    while True:
+        cmds = []
+        try:
+            cmds.append(commands.get(timeout=0.01 if external else 0.5))
+            while True:
+                cmds.append(commands.get_nowait())
+        except queue.Empty:
+            pass
+        for cmd in cmds:
+            op = cmd[0]
+            try:
+                if op == "quit":
+                    if external:
+                        engine.endLoop()
+                    return
+                if op == "speak":
+                    engine.say(cmd[2], cmd[1])
+                    if not external:
+                        engine.runAndWait()
+                elif op == "cancel":
+                    engine.stop()
+                elif op == "voice":
+                    engine.setProperty('voice', cmd[1])
+                elif op == "rate":
+                    engine.setProperty('rate', cmd[1])
+            except Exception as e:
+                emit("error", f"{op}: {e}")
+        if external:
+            try:
+                engine.iterate()
+            except Exception as e:
+                emit("error", f"iterate: {e}")
+                time.sleep(0.05)
+
+
 class TTS:
-    def __init__(self, enabled=True, rate=175):
+    def __init__(self, enabled=True, rate=175, voice: Optional[str] = None, max_restarts: int = 3):
         self.enabled = enabled
         self.rate = rate
-        self._queue = queue.Queue()
-        self._stop = False
-        self._thread = threading.Thread(target=self._loop, daemon=True)
-        self._engine = pyttsx3.init() if pyttsx3 else None
-        if self._engine:
-            try:
-                self._engine.setProperty('rate', self.rate)
-            except Exception:
-                pass
+        self.voice = voice
         self.speaking = False
-        self.on_state = None  # callback: on_state(bool)
-        self._thread.start()
+        self.on_state = None     # callback: on_state(bool)
+        self.on_progress = None  # callback: on_progress(uid, location, length, fraction)
+        self.on_word = None      # callback: on_word() la fiecare limită de cuvânt
+        self.voices: List[Tuple[str, str]] = []
+        self.external_loop = False
+        self.current_text = ""
+        self.progress = 0.0      # 0..1 din fraza curentă (după limitele de cuvânt)
+        self.last_error = ""
+        self.restarts = 0
+        self.max_restarts = max_restarts
+        self._texts: Dict[str, str] = {}
+        self._pending = 0
+        self._ids = itertools.count(1)
+        self._proc: Optional[subprocess.Popen] = None
+        self._outbox: Optional[queue.Queue] = None
+        self._closing = False
+        self._lock = threading.Lock()
+        if pyttsx3 is not None:
+            self._start()
+
+    # ---------- proces ----------
+    def _start(self):
+        self._proc = proc = subprocess.Popen(
+            [sys.executable, "-u", os.path.abspath(__file__), "--engine", str(self.rate), self.voice or ""],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, encoding="utf-8", bufsize=1,
+        )
+        # scrierea pe pipe într-un thread: apelantul (GUI / bucla video) nu blochează niciodată
+        self._outbox = outbox = queue.Queue()
+        threading.Thread(target=self._write_commands, args=(proc, outbox), name="tts-commands",
+                         daemon=True).start()
+        threading.Thread(target=self._read_events, args=(proc,), name="tts-events", daemon=True).start()
+
+    def _alive(self) -> bool:
+        # sub lock: speak() vine din thread-ul Tk, din cel de voce și din dispatcher —
+        # un singur thread poate reporni procesul
+        with self._lock:
+            if self._proc is None or self._closing:
+                return False
+            if self._proc.poll() is None:
+                return True
+            # procesul motorului a căzut: frazele lui nu mai termină niciodată
+            self._texts.clear()
+            self._pending = 0
+            restart = self.restarts < self.max_restarts
+            if restart:
+                self.restarts += 1
+                self._start()
+        self._set_speaking(False)
+        return restart
 
+    def _send(self, *cmd) -> bool:
+        if not self._alive():
+            return False
+        with self._lock:
+            self._outbox.put(cmd)
+        return True
+
+    @staticmethod
+    def _write_commands(proc: subprocess.Popen, outbox: queue.Queue):
+        while True:
+            cmd = outbox.get()
+            try:
+                proc.stdin.write(json.dumps(cmd) + "\n")
+                proc.stdin.flush()
+            except (OSError, ValueError):
+                return
+            if cmd[0] == "quit":
+                return
+
+    # ---------- API ----------
     def set_enabled(self, flag: bool):
         self.enabled = bool(flag)
+        if not self.enabled:
+            self.cancel()
+
+    def speak(self, text: str) -> Optional[str]:
+        """Nu blochează; întoarce ID-ul frazei (pentru on_progress) sau None."""
+        if not text or not self.enabled:
+            return None
+        if not self._alive():
+            return None
+        uid = str(next(self._ids))
+        with self._lock:
+            # în aceeași secțiune cu outbox-ul: o repornire nu poate separa fraza de contor
+            self._texts[uid] = str(text)
+            self._pending += 1
+            self._outbox.put(("speak", uid, str(text)))
+        return uid
+
+    def cancel(self):
+        """Oprește fraza curentă și golește coada."""
+        if self._send("cancel"):
+            with self._lock:
+                self._texts.clear()
+                self._pending = 0
+            self._set_speaking(False)
+
+    def set_voice(self, voice_id: str):
+        self.voice = voice_id
+        self._send("voice", voice_id)
 
-    def speak(self, text: str):
-        if text:
-            self._queue.put(str(text))
+    def set_rate(self, rate: int):
+        self.rate = int(rate)
+        self._send("rate", self.rate)
 
     def stop(self):
-        self._stop = True
-        try:
-            self._queue.put_nowait("")
-        except Exception:
-            pass
-        if self._thread:
-            self._thread.join(timeout=1.5)
-        try:
-            if self._engine:
-                self._engine.stop()
-        except Exception:
-            pass
+        proc = self._proc
+        self._closing = True
+        if proc is None:
+            return
+        if proc.poll() is None:
+            self._outbox.put(("quit",))
+            try:
+                proc.wait(timeout=1.0)
+            except subprocess.TimeoutExpired:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=0.5)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+        self._set_speaking(False)
 
-    def _loop(self):
-        while not self._stop:
+    # ---------- evenimente din procesul copil ----------
+    def _set_speaking(self, flag: bool):
+        if flag == self.speaking:
+            return
+        self.speaking = flag
+        if self.on_state:
             try:
-                text = self._queue.get(timeout=0.5)
+                self.on_state(flag)
             except Exception:
-                continue
-            if not text:
-                continue
-            if self._engine and self.enabled:
-                try:
-                    self.speaking = True
-                    if self.on_state: self.on_state(True)
-                    self._engine.say(text)
-                    self._engine.runAndWait()
-                except Exception:
-                    pass
-                finally:
-                    self.speaking = False
-                    if self.on_state: self.on_state(False)
-    
\ No newline at end of file
+                pass
+
+    def _read_events(self, proc: subprocess.Popen):
+        for line in proc.stdout:
+            try:
+                ev = json.loads(line)
+            except ValueError:
+                continue  # mesaje tipărite de driver, nu de protocol
+            if isinstance(ev, list) and ev:
+                self._handle(ev)
+        # EOF: procesul s-a oprit (quit sau cădere) — frazele trimise lui nu mai primesc "end"
+        with self._lock:
+            current = proc is self._proc
+            if current:
+                self._texts.clear()
+                self._pending = 0
+        if current:
+            self._set_speaking(False)
+
+    def _handle(self, ev):
+        kind = ev[0]
+        if kind == "ready":
+            self.voices, self.external_loop = ev[1], ev[2]
+        elif kind == "start":
+            with self._lock:
+                self.current_text = self._texts.get(ev[1], "")
+            self.progress = 0.0
+            self._set_speaking(True)
+        elif kind == "word":
+            _, uid, location, length, _t = ev
+            with self._lock:
+                n = len(self._texts.get(uid, "")) or 1
+            self.progress = min(1.0, (location + length) / n)
+            for cb, args in ((self.on_word, ()), (self.on_progress, (uid, location, length, self.progress))):
+                if cb:
+                    try:
+                        cb(*args)
+                    except Exception:
+                        pass
+        elif kind == "end":
+            with self._lock:
+                self._texts.pop(ev[1], None)
+                self._pending = max(0, self._pending - 1)
+                idle = self._pending == 0
+            if ev[2]:
+                self.progress = 1.0
+            if idle:
+                self._set_speaking(False)
+        elif kind == "error":
+            self.last_error = ev[1]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "--engine" and pyttsx3 is not None:
+        _engine_main(int(sys.argv[2]) if len(sys.argv) > 2 else 175, sys.argv[3] if len(sys.argv) > 3 else None)
@@ -0,0 +1,203 @@
+"""
+Detecție de activitate vocală (VAD) + endpointing pe cadre audio, doar NumPy.
+
+Înlocuiește pragul fix de energie + `pause_threshold` (0.75 s) din
+SpeechRecognition: fiecare cadru de 20 ms primește energia (dB) și rata de
+treceri prin zero; podeaua de zgomot se actualizează continuu (coboară repede,
+urcă încet — și în timpul vorbirii, foarte încet, ca o schimbare de zgomot din
+cameră să nu țină fraza „deschisă” la nesfârșit). Un cadru e vorbire dacă e
+peste podea cu `speech_db` (cu histerezis) și nu arată ca un fâșâit (ZCR mare
+la energie mică). Fraza se închide după `hangover_ms` de liniște.
+
+    vad = VAD(VADConfig(hangover_ms=300))
+    for utt in vad.feed(pcm_int16):      # bucăți de orice lungime
+        recognize(utt.pcm, utt.start, utt.end)
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+import numpy as np
+
+
+@dataclass
+class VADConfig:
+    sample_rate: int = 16000
+    frame_ms: int = 20
+    speech_db: float = 9.0       # peste podeaua de zgomot -> vorbire
+    hysteresis_db: float = 3.0   # în vorbire, pragul coboară cu atât
+    zcr_max: float = 0.35        # ZCR peste asta = zgomot/fricative slabe ...
+    zcr_override_db: float = 18.0  # ... dacă nu e și foarte tare
+    start_ms: int = 60           # vorbire continuă pentru a deschide o frază
+    hangover_ms: int = 300       # liniște după care fraza se închide
+    preroll_ms: int = 200        # audio păstrat dinaintea începutului detectat
+    tail_ms: int = 60            # audio păstrat după ultimul cadru de vorbire
+    min_speech_ms: int = 150     # mai puțină vorbire = click / zgomot, ignorat
+    max_utterance_s: float = 10.0
+    noise_init_ms: int = 200     # podeaua inițială = mediana primelor cadre
+    noise_down: float = 0.2      # adaptarea podelei când energia scade
+    noise_up: float = 0.02       # ... când crește, în liniște
+    noise_up_speech: float = 0.005  # ... când crește, în timpul vorbirii
+    min_noise_db: float = -75.0
+
+    @property
+    def frame_len(self) -> int:
+        return self.sample_rate * self.frame_ms // 1000
+
+    def frames(self, ms: float) -> int:
+        return max(1, int(round(ms / self.frame_ms)))
+
+
+@dataclass
+class Utterance:
+    start: float       # secunde, pe ceasul fluxului audio (eșantioane / rată)
+    end: float         # sfârșitul vorbirii (ultimul cadru de vorbire)
+    detected: float    # momentul (pe același ceas) în care fraza a fost închisă
+    pcm: np.ndarray    # int16, cu preroll + tail
+    forced: bool = False  # închisă de max_utterance_s, nu de liniște
+
+    @property
+    def delay(self) -> float:
+        """Întârzierea de endpointing: sfârșitul vorbirii -> fraza închisă."""
+        return self.detected - self.end
+
+
+def frame_features(x: np.ndarray, frame_len: int):
+    """(energie dB, ZCR) pentru toate cadrele complete din `x` (int16 sau float), vectorizat."""
+    n = len(x) // frame_len
+    f = x[:n * frame_len].reshape(n, frame_len).astype(np.float32)
+    if x.dtype == np.int16:
+        f *= 1.0 / 32768.0
+    energy = 10.0 * np.log10(np.mean(f * f, axis=1) + 1e-10)
+    signs = np.signbit(f)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+    return energy, zcr
+
+
+class VAD:
+    def __init__(self, config: Optional[VADConfig] = None):
+        self.config = config or VADConfig()
+        self.reset()
+
+    def reset(self):
+        c = self.config
+        self.noise_db: Optional[float] = None
+        self._init: List[float] = []
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._frame_idx = 0               # cadre procesate de la început
+        self._preroll: deque = deque(maxlen=c.frames(c.preroll_ms))
+        self._run = 0                     # cadre de vorbire consecutive (înainte de start)
+        self._frames: List[np.ndarray] = []  # cadrele frazei curente
+        self.in_speech = False
+        self._start_idx = 0
+        self._last_speech_idx = 0
+        self._voiced = 0
+        self.discarded = 0                # fraze prea scurte (click-uri)
+
+    # ---------- ceas ----------
+    def _t(self, frame_idx: int) -> float:
+        return frame_idx * self.config.frame_ms / 1000.0
+
+    @property
+    def time(self) -> float:
+        """Timpul fluxului procesat până acum (secunde)."""
+        return self._t(self._frame_idx)
+
+    # ---------- podeaua de zgomot ----------
+    def _update_noise(self, e: float, speech: bool):
+        c = self.config
+        if e < self.noise_db:
+            self.noise_db += (e - self.noise_db) * c.noise_down
+        else:
+            self.noise_db += (e - self.noise_db) * (c.noise_up_speech if speech else c.noise_up)
+        self.noise_db = max(self.noise_db, c.min_noise_db)
+
+    def _is_speech(self, e: float, z: float) -> bool:
+        c = self.config
+        margin = e - self.noise_db
+        need = c.speech_db - (c.hysteresis_db if self.in_speech else 0.0)
+        if margin < need:
+            return False
+        return z <= c.zcr_max or margin >= c.zcr_override_db
+
+    # ---------- flux ----------
+    def feed(self, pcm: Union[bytes, np.ndarray]) -> List[Utterance]:
+        """Adaugă audio (int16 mono); întoarce frazele închise în bucata asta."""
+        x = np.frombuffer(pcm, dtype=np.int16) if isinstance(pcm, (bytes, bytearray)) else pcm
+        if len(self._pending):
+            x = np.concatenate([self._pending, x])
+        fl = self.config.frame_len
+        n = len(x) // fl
+        self._pending = x[n * fl:].copy()
+        if not n:
+            return []
+        energy, zcr = frame_features(x[:n * fl], fl)
+        frames = x[:n * fl].reshape(n, fl)
+        out: List[Utterance] = []
+        for i in range(n):
+            u = self._step(float(energy[i]), float(zcr[i]), frames[i])
+            if u is not None:
+                out.append(u)
+        return out
+
+    def flush(self) -> List[Utterance]:
+        """Sfârșitul fluxului: închide fraza deschisă (dacă există)."""
+        if self.in_speech:
+            u = self._close(forced=False)
+            return [u] if u is not None else []
+        return []
+
+    def _step(self, e: float, z: float, frame: np.ndarray) -> Optional[Utterance]:
+        c = self.config
+        idx = self._frame_idx
+        self._frame_idx += 1
+        if self.noise_db is None:
+            # calibrare: podeaua inițială din primele cadre (fără vorbire detectată)
+            self._init.append(e)
+            self._preroll.append(frame)
+            if len(self._init) >= c.frames(c.noise_init_ms):
+                self.noise_db = max(float(np.median(self._init)), c.min_noise_db)
+            return None
+
+        speech = self._is_speech(e, z)
+        self._update_noise(e, speech)
+
+        if not self.in_speech:
+            self._run = self._run + 1 if speech else 0
+            self._preroll.append(frame)
+            if self._run >= c.frames(c.start_ms):
+                self.in_speech = True
+                self._frames = list(self._preroll)
+                self._start_idx = idx + 1 - len(self._frames)
+                self._last_speech_idx = idx
+                self._voiced = self._run
+                self._preroll.clear()
+            return None
+
+        self._frames.append(frame)
+        if speech:
+            self._last_speech_idx = idx
+            self._voiced += 1
+        if idx - self._last_speech_idx >= c.frames(c.hangover_ms):
+            return self._close(forced=False)
+        if self._t(idx + 1 - self._start_idx) >= c.max_utterance_s:
+            return self._close(forced=True)
+        return None
+
+    def _close(self, forced: bool) -> Optional[Utterance]:
+        c = self.config
+        self.in_speech = False
+        self._run = 0
+        end_idx = self._last_speech_idx + 1
+        keep = min(len(self._frames), end_idx - self._start_idx + c.frames(c.tail_ms))
+        frames, self._frames = self._frames[:keep], []
+        if self._voiced * c.frame_ms < c.min_speech_ms:
+            self.discarded += 1
+            return None
+        return Utterance(
+            start=self._t(self._start_idx),
+            end=self._t(end_idx),
+            detected=self.time,
+            pcm=np.concatenate(frames),
+            forced=forced,
+        )